@@ -0,0 +1,155 @@
+"""
+Reproducible benchmark corpora, one per grammar shape
+
+Every generator takes a seeded random.Random, so the same seed and size
+always produce the same expressions.
+"""
+
+import random
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+DIGITS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+TEENS = ['ten', 'eleven', 'twelve', 'thirteen', 'fourteen',
+         'fifteen', 'sixteen', 'seventeen', 'eighteen', 'nineteen']
+TENS = ['twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+
+GARBAGE_WORDS = DIGITS + TEENS + TENS + OPERATIONS + [
+    'zero', 'hundred', 'thousand', 'and', 'plus', 'minus', 'times', 'the', '42', 'fourty',
+]
+
+
+def basic(rng):
+    """A basic number (0-99): digit, teen, tens or compound"""
+    kind = rng.randrange(4)
+    if kind == 0:
+        return rng.choice(DIGITS + ['zero'])
+    if kind == 1:
+        return rng.choice(TEENS)
+    if kind == 2:
+        return rng.choice(TENS)
+    return f"{rng.choice(TENS)} {rng.choice(DIGITS)}"
+
+
+def compound(rng):
+    """A tens + digit compound (21-99)"""
+    return f"{rng.choice(TENS)} {rng.choice(DIGITS)}"
+
+
+def hundreds(rng, internal_and=False):
+    """'X hundred [and] Y'"""
+    joiner = ' and ' if internal_and else ' '
+    return f"{rng.choice(DIGITS)} hundred{joiner}{basic(rng)}"
+
+
+def thousands(rng, internal_and=False):
+    """'X thousand [Y hundred] [and] Z' (only forms the parser accepts)"""
+    phrase = f"{rng.choice(DIGITS)} thousand"
+    if rng.random() < 0.5:
+        phrase += f" {rng.choice(DIGITS)} hundred"
+    if internal_and:
+        return f"{phrase} and {basic(rng)}"
+    return f"{phrase} {rng.choice(DIGITS)}" if rng.random() < 0.5 else f"{phrase} {compound(rng)}"
+
+
+def expression(rng, first, second):
+    return f"{rng.choice(OPERATIONS)} {first} and {second}"
+
+
+def shape_basic(rng):
+    return expression(rng, basic(rng), basic(rng))
+
+
+def shape_compound(rng):
+    return expression(rng, compound(rng), compound(rng))
+
+
+def shape_hundreds(rng):
+    return expression(rng, hundreds(rng), hundreds(rng))
+
+
+def shape_thousands(rng):
+    return expression(rng, thousands(rng), thousands(rng))
+
+
+def shape_internal_and(rng):
+    """Internal 'and' in the first operand, the second, or both"""
+    where = rng.randrange(3)
+    make = thousands if rng.random() < 0.5 else hundreds
+    first = make(rng, internal_and=where != 1)
+    second = make(rng, internal_and=where != 0)
+    return expression(rng, first, second)
+
+
+def shape_operands(rng):
+    """Three to five operands ("add one and two and three")"""
+    numbers = [rng.choice((basic, hundreds, thousands))(rng) for _ in range(rng.randint(3, 5))]
+    return f"{rng.choice(OPERATIONS)} {' and '.join(numbers)}"
+
+
+def shape_chain(rng):
+    """One to three "then" steps after the first, each with one or two operands"""
+    phrase = expression(rng, basic(rng), basic(rng))
+    for _ in range(rng.randint(1, 3)):
+        operation = rng.choice(OPERATIONS)
+        by = ' by' if operation in ('multiply', 'divide') else ''
+        operands = ' and '.join(basic(rng) for _ in range(rng.randint(1, 2)))
+        phrase += f" then {operation}{by} {operands}"
+    return phrase
+
+
+def shape_errors(rng):
+    """Short inputs that fail in each stage"""
+    kind = rng.randrange(7)
+    if kind == 0:
+        return f"plus {basic(rng)} and {basic(rng)}"           # invalid operation
+    if kind == 1:
+        return f"{rng.choice(OPERATIONS)} {basic(rng)}"         # missing second operand
+    if kind == 2:
+        return f"{rng.choice(OPERATIONS)} {basic(rng)} {basic(rng)}"  # missing 'and'
+    if kind == 3:
+        return f"add zero hundred and {basic(rng)}"             # invalid multiplier
+    if kind == 4:
+        return f"add {rng.choice(TEENS)} thousand and one"      # invalid multiplier
+    if kind == 5:
+        return f"divide {basic(rng)} and zero"                  # division by zero
+    return "   "                                                # empty input
+
+
+def shape_garbage(rng):
+    """Long random token soup (hundreds of tokens)"""
+    length = rng.randint(200, 1000)
+    words = [rng.choice(GARBAGE_WORDS) for _ in range(length)]
+    if rng.random() < 0.5:
+        words[0] = rng.choice(OPERATIONS)
+    return ' '.join(words)
+
+
+SHAPES = {
+    'basic': shape_basic,
+    'compound': shape_compound,
+    'hundreds': shape_hundreds,
+    'thousands': shape_thousands,
+    'internal_and': shape_internal_and,
+    'operands': shape_operands,
+    'chain': shape_chain,
+    'errors': shape_errors,
+    'garbage': shape_garbage,
+}
+
+
+def generate(shape, size, seed=0):
+    """
+    Build a corpus for one grammar shape
+    
+    Args:
+        shape (str): One of SHAPES
+        size (int): Number of expressions
+        seed (int): Random seed; the same seed always gives the same corpus
+    
+    Returns:
+        list[str]: The expressions
+    """
+    rng = random.Random(f"{shape}:{seed}")
+    make = SHAPES[shape]
+    return [make(rng) for _ in range(size)]
@@ -0,0 +1,48 @@
+"""
+Throughput benchmark: WordCalc.evaluate_many vs a loop of evaluate() calls
+
+Usage:
+    python benchmarks/evaluate_many.py [--count N] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import best_of
+from classes.WordCalc import WordCalc
+
+EXPRESSIONS = [
+    "add four and five",
+    "subtract ten and three",
+    "multiply thirty two and seventeen",
+    "divide ninety and ninety",
+    "add one hundred and thirty and twenty",
+    "multiply two thousand five hundred and three",
+    "add fifty and one hundred and five",
+    "plus three and five",
+    "divide ten and zero",
+]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--count', type=int, default=200000, help="expressions per run")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="runs per variant (best is kept)")
+    args = arg_parser.parse_args()
+    
+    calc = WordCalc()
+    corpus = (EXPRESSIONS * (args.count // len(EXPRESSIONS) + 1))[:args.count]
+    
+    loop_time = best_of(args.repeat, lambda: [calc.evaluate(e) for e in corpus])
+    many_time = best_of(args.repeat, lambda: calc.evaluate_list(corpus))
+    
+    print(f"evaluate() loop : {args.count / loop_time:12,.0f} expr/s")
+    print(f"evaluate_many() : {args.count / many_time:12,.0f} expr/s")
+    print(f"speedup         : {loop_time / many_time:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+WordCalc benchmark suite
+
+Times Lexer, Parser and Interpreter separately, plus end-to-end evaluation,
+on a generated corpus per grammar shape (see benchmarks/corpus.py). Writes
+machine-readable JSON and can compare against an earlier run to catch
+regressions.
+
+Usage:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare results.json --threshold 0.10
+    python benchmarks/run.py --engine phrase --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import corpus
+from benchmarks.common import best_of, git_revision
+from classes.Interpreter import Interpreter
+from classes.Lexer import Lexer
+from classes.Parser import Parser
+from classes.WordCalc import WordCalc
+from classes.WordCalcError import WordCalcError
+
+STAGES = ('lexer', 'parser', 'interpreter', 'end_to_end')
+
+
+def prepare(expressions):
+    """Pre-compute each stage's inputs so stages can be timed in isolation"""
+    lexer = Lexer('')
+    parser = Parser([])
+    token_lists = []
+    parsed = []
+    for expression in expressions:
+        try:
+            lexer.reset(expression)
+            tokens = lexer.tokenize()
+        except WordCalcError:
+            continue
+        token_lists.append(list(tokens))
+        try:
+            parser.reset(tokens)
+            parsed.append((parser.parse(), parser.chain))
+        except WordCalcError:
+            pass
+    return token_lists, parsed
+
+
+def time_lexer(expressions):
+    lexer = Lexer('')
+    for expression in expressions:
+        try:
+            lexer.reset(expression)
+            lexer.tokenize()
+        except WordCalcError:
+            pass
+
+
+def time_parser(token_lists, parser_class=Parser):
+    parser = parser_class([])
+    for tokens in token_lists:
+        try:
+            parser.reset(tokens)
+            parser.parse()
+        except WordCalcError:
+            pass
+
+
+def time_interpreter(parsed):
+    interpreter = Interpreter(None, None, None)
+    for operands, chain in parsed:
+        try:
+            interpreter.reset(*operands, chain=chain)
+            interpreter.interpret()
+        except WordCalcError:
+            pass
+
+
+def bench_shape(shape, size, seed, repeat, engine=None):
+    """Benchmark every stage on one shape's corpus (parser and end_to_end with the given engine)"""
+    expressions = corpus.generate(shape, size, seed)
+    token_lists, parsed = prepare(expressions)
+    calc = WordCalc(engine=engine)
+    
+    runs = {
+        'lexer': (len(expressions), lambda: time_lexer(expressions)),
+        'parser': (len(token_lists), lambda: time_parser(token_lists, calc.parser_class)),
+        'interpreter': (len(parsed), lambda: time_interpreter(parsed)),
+        'end_to_end': (len(expressions), lambda: calc.evaluate_list(expressions)),
+    }
+    
+    results = {}
+    for stage in STAGES:
+        count, func = runs[stage]
+        seconds = best_of(repeat, func) if count else 0.0
+        results[stage] = {
+            'count': count,
+            'seconds': seconds,
+            'ns_per_expr': seconds / count * 1e9 if count else None,
+        }
+    return results
+
+
+def compare(old, new, threshold):
+    """
+    Print per-stage changes against an earlier run
+    
+    Returns:
+        list[str]: Descriptions of slowdowns above the threshold
+    """
+    regressions = []
+    for shape, stages in new['results'].items():
+        for stage, result in stages.items():
+            before = old.get('results', {}).get(shape, {}).get(stage, {}).get('ns_per_expr')
+            after = result['ns_per_expr']
+            if not before or not after:
+                continue
+            change = after / before - 1
+            flag = '  REGRESSION' if change > threshold else ''
+            print(f"{shape:>13} {stage:>12}: {before:10.0f} -> {after:10.0f} ns ({change:+.1%}){flag}")
+            if flag:
+                regressions.append(f"{shape}/{stage} {change:+.1%}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="WordCalc benchmark suite")
+    arg_parser.add_argument('--shapes', nargs='+', default=list(corpus.SHAPES), choices=list(corpus.SHAPES))
+    arg_parser.add_argument('--size', type=int, default=20000, help="expressions per shape")
+    arg_parser.add_argument('--seed', type=int, default=0, help="corpus seed")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="runs per measurement (best is kept)")
+    arg_parser.add_argument('--engine', default=WordCalc.DEFAULT_ENGINE, choices=list(WordCalc.ENGINES),
+                            help="parser engine for the parser and end_to_end stages")
+    arg_parser.add_argument('--output', metavar='FILE', help="write results as JSON")
+    arg_parser.add_argument('--compare', metavar='FILE', help="compare against an earlier JSON result")
+    arg_parser.add_argument('--threshold', type=float, default=0.10,
+                            help="relative slowdown reported as a regression (default: 0.10)")
+    args = arg_parser.parse_args()
+    
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'size': args.size,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'engine': args.engine,
+        },
+        'results': {},
+    }
+    
+    for shape in args.shapes:
+        report['results'][shape] = bench_shape(shape, args.size, args.seed, args.repeat, args.engine)
+        timings = '  '.join(
+            f"{stage}={result['ns_per_expr']:.0f}ns" if result['ns_per_expr'] else f"{stage}=n/a"
+            for stage, result in report['results'][shape].items())
+        print(f"{shape:>13}: {timings}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as outfile:
+            json.dump(report, outfile, indent=2)
+    
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as infile:
+            old = json.load(infile)
+        print()
+        regressions = compare(old, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
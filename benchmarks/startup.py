@@ -0,0 +1,157 @@
+"""
+Startup benchmark: wall-clock time of short-lived WordCalc processes
+
+Every case starts a fresh interpreter, as a shell script calling main.py
+would. Each is run several times after one warm-up run (which also writes
+the bytecode caches); the best and median times are kept. An empty
+interpreter is measured too, and each case is also reported as its time
+over that floor, which is the part WordCalc controls.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--output FILE] [--compare FILE] [--threshold T]
+    python benchmarks/startup.py --imports [--top N]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.common import git_revision
+
+MAIN = os.path.join(ROOT, 'main.py')
+
+EXPRESSION = "multiply thirty two and seventeen"
+
+# Case name -> (interpreter arguments, stdin)
+CASES = {
+    'python': (['-c', 'pass'], None),
+    'import': (['-c', 'import classes.WordCalc'], None),
+    'one_shot': ([MAIN, '-c', EXPRESSION], None),
+    'one_shot_zh': ([MAIN, '--language', 'zh', '-c', "cheng san shi er he shi qi"], None),
+    'filter': ([MAIN, '--quiet'], f"{EXPRESSION}\n"),
+}
+
+
+def run_once(arguments, stdin):
+    """Seconds taken by one process, start to exit"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + arguments, input=stdin, text=True, cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def bench_case(arguments, stdin, runs):
+    """Best and median milliseconds over several runs"""
+    run_once(arguments, stdin)
+    times = [run_once(arguments, stdin) for _ in range(runs)]
+    return {
+        'best_ms': min(times) * 1e3,
+        'median_ms': statistics.median(times) * 1e3,
+    }
+
+
+def import_times(top):
+    """
+    Print the slowest imports of a one-shot run (python -X importtime)
+    
+    Args:
+        top (int): Modules to list, by time spent in the module itself
+    """
+    arguments, _ = CASES['one_shot']
+    stderr = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=ROOT, check=True,
+                            capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(own), int(cumulative), name.rstrip()))
+    total = sum(own for own, _, _ in rows)
+    print(f"{len(rows)} modules imported in {total / 1e3:.1f} ms")
+    print(f"{'self ms':>8} {'cumul. ms':>9}  module")
+    for own, cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"{own / 1e3:8.2f} {cumulative / 1e3:9.2f} {name}")
+
+
+def compare(old, new, threshold):
+    """
+    Print per-case changes in time over the bare interpreter against an earlier run
+    
+    Returns:
+        list[str]: Descriptions of slowdowns above the threshold
+    """
+    regressions = []
+    for case, result in new['results'].items():
+        before = old.get('results', {}).get(case, {}).get('over_python_ms')
+        after = result.get('over_python_ms')
+        if not before or after is None:
+            continue
+        change = after / before - 1
+        flag = '  REGRESSION' if change > threshold else ''
+        print(f"{case:>12}: {before:7.1f} -> {after:7.1f} ms over python ({change:+.1%}){flag}")
+        if flag:
+            regressions.append(f"{case} {change:+.1%}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES))
+    arg_parser.add_argument('--runs', type=int, default=20, help="processes per case")
+    arg_parser.add_argument('--output', metavar='FILE', help="write results as JSON")
+    arg_parser.add_argument('--compare', metavar='FILE', help="compare against an earlier JSON result")
+    arg_parser.add_argument('--threshold', type=float, default=0.20,
+                            help="relative slowdown reported as a regression (default: 0.20)")
+    arg_parser.add_argument('--imports', action='store_true',
+                            help="list the slowest imports of a one-shot run instead")
+    arg_parser.add_argument('--top', type=int, default=15, help="modules listed by --imports")
+    args = arg_parser.parse_args()
+    
+    if args.imports:
+        import_times(args.top)
+        return
+    
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'runs': args.runs,
+        },
+        'results': {},
+    }
+    
+    floor = bench_case(*CASES['python'], args.runs)['best_ms']
+    for case in args.cases:
+        result = bench_case(*CASES[case], args.runs)
+        result['over_python_ms'] = max(result['best_ms'] - floor, 0.0)
+        report['results'][case] = result
+        print(f"{case:>12}: best {result['best_ms']:6.1f} ms  median {result['median_ms']:6.1f} ms  "
+              f"({result['over_python_ms']:.1f} ms over python)")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as outfile:
+            json.dump(report, outfile, indent=2)
+    
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as infile:
+            old = json.load(infile)
+        print()
+        regressions = compare(old, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Thread scaling benchmark: WordCalc.evaluate_parallel at several thread counts
+
+Only a free-threaded (no GIL) Python build can run evaluation on several
+cores at once; with the GIL the numbers show the threading overhead.
+
+Usage:
+    python benchmarks/threads.py [--count N] [--threads 1,2,4,8] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import corpus
+from benchmarks.common import best_of
+from classes.WordCalc import WordCalc
+
+SHAPES = ('basic', 'hundreds', 'thousands', 'internal_and', 'errors')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--count', type=int, default=200000, help="expressions per run")
+    arg_parser.add_argument('--threads', default='1,2,4,8', help="comma-separated thread counts")
+    arg_parser.add_argument('--chunk-size', type=int, default=1000, help="expressions per task")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="runs per variant (best is kept)")
+    args = arg_parser.parse_args()
+    
+    expressions = []
+    for shape in SHAPES:
+        expressions.extend(corpus.generate(shape, args.count // len(SHAPES)))
+    
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+          f"{os.cpu_count()} CPUs, {len(expressions)} expressions")
+    
+    calc = WordCalc()
+    serial = best_of(args.repeat, lambda: calc.evaluate_list(expressions))
+    print(f"{'evaluate_list()':<16}: {len(expressions) / serial:12,.0f} expr/s")
+    
+    for threads in (int(n) for n in args.threads.split(',')):
+        elapsed = best_of(args.repeat, lambda: list(
+            calc.evaluate_parallel(expressions, threads=threads, chunk_size=args.chunk_size)))
+        label = f"{threads} thread(s)"
+        print(f"{label:<16}: {len(expressions) / elapsed:12,.0f} expr/s"
+              f"  ({serial / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
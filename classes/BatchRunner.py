@@ -0,0 +1,262 @@
+"""
+BatchRunner Module - Evaluate large streams of expressions across processes
+Reads input lazily in chunks and yields results in input order
+"""
+
+import os
+from collections import deque
+from itertools import islice
+
+from classes.WordCalc import WordCalc
+from classes.MappedLexer import MappedLexer
+
+
+# Per-process calculator, created once by the pool initializer
+_worker_calc = None
+
+
+def _init_worker(cache_size, correction_distance=None, cache_path=None, language=None, engine=None):
+    """Pool initializer: build one WordCalc per worker process"""
+    global _worker_calc
+    _worker_calc = WordCalc(cache_size=cache_size, correction_distance=correction_distance,
+                            cache_path=cache_path, language=language, engine=engine)
+    if cache_path:
+        from multiprocessing.util import Finalize
+        
+        # Runs when the pool is closed and the worker exits normally
+        Finalize(_worker_calc, _worker_calc.close, exitpriority=10)
+
+
+def _evaluate_chunk(expressions):
+    """Pool task: evaluate one chunk of expressions in the worker process"""
+    return _worker_calc.evaluate_list(expressions)
+
+
+def _evaluate_range(path, start, end):
+    """Pool task: tokenize and evaluate one byte range of a mapped file"""
+    token_lists = MappedLexer(path, _worker_calc.language.vocabulary).token_lists(start, end)
+    return [str(result) for result in _worker_calc.evaluate_tokens(token_lists)]
+
+
+def _encode_chunk(expressions, writer_class, words):
+    """Pool task: evaluate a chunk and encode it as one ResultWriter block"""
+    results = list(_worker_calc.evaluate_results(expressions, words=words))
+    return writer_class(words=words).encode_block(results), len(results)
+
+
+def _encode_range(path, start, end, writer_class, words):
+    """Pool task: evaluate a byte range of a mapped file and encode it as one block"""
+    token_lists = MappedLexer(path, _worker_calc.language.vocabulary).token_lists(start, end)
+    results = list(_worker_calc.evaluate_tokens(token_lists, words=words))
+    return writer_class(words=words).encode_block(results), len(results)
+
+
+class BatchRunner:
+    """
+    Batch evaluator - Spreads chunks of expressions over a process pool
+    
+    Only a bounded number of chunks is ever in flight, so memory use stays
+    flat no matter how long the input is.
+    """
+    
+    def __init__(self, workers=None, chunk_size=1000, max_pending=None, cache_size=None,
+                 correction_distance=None, cache_path=None, language=None, engine=None):
+        """
+        Args:
+            workers (int, optional): Worker processes; defaults to the CPU count.
+                With 1 worker everything runs in the current process.
+            chunk_size (int): Expressions sent to a worker per task
+            max_pending (int, optional): Chunks allowed in flight at once;
+                defaults to twice the number of workers
+            cache_size (int, optional): Per-worker result cache size (see WordCalc)
+            correction_distance (int, optional): Spelling correction distance (see WordCalc)
+            cache_path (str, optional): Persistent cache file shared by all
+                workers (see WordCalc); cache_size is then each worker's
+                in-memory layer
+            language (str, optional): Language code of the input (see WordCalc)
+            engine (str, optional): Parser engine (see WordCalc)
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or 2 * self.workers
+        self.cache_size = cache_size
+        self.correction_distance = correction_distance
+        self.cache_path = cache_path
+        self.language = language
+        self.engine = engine
+        # Checked here, as an error in the pool initializer only restarts the workers
+        WordCalc.engine_class(engine or WordCalc.DEFAULT_ENGINE)
+    
+    def _calc(self):
+        """Calculator for a single-process run"""
+        return WordCalc(cache_size=self.cache_size, correction_distance=self.correction_distance,
+                        cache_path=self.cache_path, language=self.language, engine=self.engine)
+    
+    def _in_order(self, task, argument_lists):
+        """
+        Run task in a worker pool once per argument tuple, yielding returns in order
+        
+        At most max_pending tasks are in flight. Once all are done the pool
+        is closed rather than terminated, so workers exit normally and
+        write out their persistent caches.
+        """
+        # Imported here so single-process runs don't pay for it
+        from multiprocessing import Pool
+        
+        initargs = (self.cache_size, self.correction_distance, self.cache_path, self.language, self.engine)
+        with Pool(self.workers, initializer=_init_worker, initargs=initargs) as pool:
+            pending = deque()
+            for arguments in argument_lists:
+                pending.append(pool.apply_async(task, arguments))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+            pool.close()
+            pool.join()
+    
+    def _chunks(self, expressions):
+        """Yield lists of up to chunk_size expressions, reading lazily"""
+        iterator = iter(expressions)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+    
+    def run(self, expressions):
+        """
+        Evaluate expressions and yield results in input order
+        
+        Args:
+            expressions: Any iterable of expression strings (e.g. a file object)
+        
+        Yields:
+            str: One result per input expression
+        """
+        if self.workers == 1:
+            calc = self._calc()
+            try:
+                for chunk in self._chunks(expressions):
+                    yield from calc.evaluate_many(chunk)
+            finally:
+                calc.close()
+            return
+        
+        chunks = ((chunk,) for chunk in self._chunks(expressions))
+        for results in self._in_order(_evaluate_chunk, chunks):
+            yield from results
+    
+    def run_mapped(self, path, range_size=1 << 20):
+        """
+        Evaluate every line of a file through MappedLexer, yielding results in order
+        
+        The file is memory-mapped instead of read line by line. Workers map
+        it themselves and are sent only byte offsets, so the input is never
+        copied between processes.
+        
+        Args:
+            path (str): File with one expression per line
+            range_size (int): Bytes of input per worker task
+        
+        Yields:
+            str: One result per line, the same as run() on the opened file
+        """
+        if self.workers == 1:
+            calc = self._calc()
+            try:
+                for result in calc.evaluate_tokens(MappedLexer(path, calc.language.vocabulary)):
+                    yield str(result)
+            finally:
+                calc.close()
+            return
+        
+        ranges = ((path, start, end) for start, end in MappedLexer(path).ranges(range_size))
+        for results in self._in_order(_evaluate_range, ranges):
+            yield from results
+    
+    def write(self, expressions, writer):
+        """
+        Evaluate expressions and write the results in input order through a ResultWriter
+        
+        Workers encode whole chunks in the writer's format, so only the
+        encoded bytes come back to this process, and words are generated
+        only if the writer has a words column.
+        
+        Args:
+            expressions: Any iterable of expression strings (e.g. a file object)
+            writer (ResultWriter): Destination; flushed but not closed
+        
+        Returns:
+            int: Number of expressions processed
+        """
+        if self.workers == 1:
+            calc = self._calc()
+            try:
+                count = writer.write_all(calc.evaluate_results(expressions, words=writer.words))
+            finally:
+                calc.close()
+            writer.flush()
+            return count
+        
+        count = 0
+        chunks = ((chunk, type(writer), writer.words) for chunk in self._chunks(expressions))
+        for data, size in self._in_order(_encode_chunk, chunks):
+            writer.write_block(data, size)
+            count += size
+        writer.flush()
+        return count
+    
+    def write_mapped(self, path, writer, range_size=1 << 20):
+        """
+        Evaluate every line of a file through MappedLexer and write the results
+        
+        The mapped counterpart of write(), the same way run_mapped is of run().
+        
+        Args:
+            path (str): File with one expression per line
+            writer (ResultWriter): Destination; flushed but not closed
+            range_size (int): Bytes of input per worker task
+        
+        Returns:
+            int: Number of lines processed
+        """
+        if self.workers == 1:
+            calc = self._calc()
+            try:
+                lexer = MappedLexer(path, calc.language.vocabulary)
+                count = writer.write_all(calc.evaluate_tokens(lexer, words=writer.words))
+            finally:
+                calc.close()
+            writer.flush()
+            return count
+        
+        count = 0
+        ranges = ((path, start, end, type(writer), writer.words)
+                  for start, end in MappedLexer(path).ranges(range_size))
+        for data, size in self._in_order(_encode_range, ranges):
+            writer.write_block(data, size)
+            count += size
+        writer.flush()
+        return count
+    
+    def run_file(self, infile, outfile):
+        """
+        Evaluate every line of infile and write one result per line to outfile
+        
+        Args:
+            infile: Text file object with one expression per line
+            outfile: Text file object receiving the results
+        
+        Returns:
+            int: Number of expressions processed
+        """
+        count = 0
+        expressions = (line.rstrip('\n') for line in infile)
+        for result in self.run(expressions):
+            outfile.write(result)
+            outfile.write('\n')
+            count += 1
+        return count
\ No newline at end of file
@@ -0,0 +1,311 @@
+"""
+CompiledExpression Module - Expression templates lexed once, evaluated over many bindings
+Created by WordCalc.compile("add {x} and five")
+"""
+
+from string import Formatter
+
+from classes.ResultCache import ResultCache
+from classes.Result import Result
+from classes.ErrorCode import ErrorCode
+
+
+class CompiledExpression:
+    """
+    An expression template with {name} placeholders for operands
+    
+    Calling it with bindings gives exactly what WordCalc.evaluate returns
+    for the template with each placeholder replaced by its binding: a
+    string binding is inserted as is, an int binding as its words
+    (5 -> "five"), anything else as str(value).
+    
+    - The template is split and lexed once. Where its shape allows, its
+      fixed pieces are parsed once too: for "add {x} and five" the
+      operation and the literal operand are kept, and a call only runs
+      each binding's own tokens through the number automaton before
+      going to the Interpreter (see _parse_fixed).
+    - Any other call - another template shape, a binding that isn't a
+      plain number phrase, an error - splices the binding tokens between
+      the pre-lexed pieces and goes to the Parser.
+    - Results are memoized per binding tuple (the outcome depends on
+      nothing else), so a column with repeated values parses each
+      distinct value once. Every call gets its own Result.
+    - Like WordCalc, it can be called from several threads at once: each
+      call takes its own pipeline objects from the calculator.
+    - A template where a placeholder touches a word ("{x}teen") can't be
+      pre-lexed; it is formatted as text and lexed per call instead.
+    """
+    
+    # Language code -> int binding -> its words' phrase_value; ints in
+    # range name the same phrase in every template, so this is shared
+    _int_phrases = {}
+    
+    def __init__(self, calc, template, memo_size=10000):
+        """
+        Args:
+            calc (WordCalc): Calculator the template belongs to
+            template (str): Expression with {name} placeholders
+            memo_size (int, optional): Results memoized per binding tuple;
+                None or 0 disables memoization
+        
+        Raises:
+            ValueError: If a placeholder is positional ("{}", "{0}"), uses
+                attribute/index access, or has a conversion or format spec
+        """
+        self.calc = calc
+        self.template = template
+        self.memo = ResultCache(memo_size) if memo_size else None
+        
+        # Alternating literal text and placeholder names: [text, name, text, ..., text]
+        pieces = ['']
+        for literal, name, spec, conversion in Formatter().parse(template):
+            pieces[-1] += literal
+            if name is None:
+                continue
+            if not name or name.isdigit() or '.' in name or '[' in name:
+                raise ValueError(f"Placeholders must be plain names, got {{{name}}} in {template!r}")
+            if spec or conversion:
+                raise ValueError(f"Placeholder {{{name}}} can't have a conversion or format spec")
+            pieces.extend([name, ''])
+        
+        self._literals = pieces[0::2]
+        self._slots = pieces[1::2]
+        # Placeholder names in order of first appearance (positional binding order)
+        self.names = tuple(dict.fromkeys(self._slots))
+        self._slot_index = tuple(self.names.index(name) for name in self._slots)
+        
+        # Pre-lexing is exact only if no binding can merge with a neighbouring word
+        self._prelexed = all(
+            literal[-1:].isspace() or index == 0 and not literal
+            for index, literal in enumerate(self._literals[:-1])
+        ) and all(
+            literal[:1].isspace() or index == len(self._literals) - 1 and not literal
+            for index, literal in enumerate(self._literals) if index > 0
+        )
+        self._literal_tokens = [literal.lower().split() for literal in self._literals]
+        # (operation, operands) parsed from the fixed pieces, or None
+        self._fixed = self._parse_fixed() if self._prelexed else None
+    
+    def __call__(self, *values, **bindings):
+        """
+        Evaluate the template with the given bindings
+        
+        Values are bound positionally (in order of first appearance in the
+        template) and/or by name: add_x(5) or add_x(x=5).
+        
+        Returns:
+            str: Exactly what WordCalc.evaluate returns for the filled-in expression
+        """
+        return str(self._result(self._bind(values, bindings)))
+    
+    def result(self, *values, **bindings):
+        """
+        Evaluate the template into a structured Result
+        
+        Returns:
+            Result: The caller's own; changing it doesn't affect the memo
+        """
+        return self._result(self._bind(values, bindings))
+    
+    def evaluate_many(self, rows):
+        """
+        Evaluate the template for many bindings, yielding results in order
+        
+        Args:
+            rows: Iterable of binding rows. Each row is a dict (by name), a
+                tuple/list (positional), or, for a template with a single
+                placeholder, the bare value itself.
+        
+        Yields:
+            str: One result per row
+        """
+        single = len(self.names) == 1
+        for row in rows:
+            if isinstance(row, dict):
+                bound = self._bind((), row)
+            elif single and not isinstance(row, (tuple, list)):
+                bound = (row,)
+            else:
+                bound = self._bind(row, {})
+            yield str(self._result(bound))
+    
+    def evaluate_list(self, rows):
+        """
+        Evaluate the template for many bindings and return all results as a list
+        
+        Args:
+            rows: Binding rows, as for evaluate_many
+        
+        Returns:
+            list[str]: Results in the same order as the rows
+        """
+        return list(self.evaluate_many(rows))
+    
+    def memo_info(self):
+        """
+        Return memo statistics (hits, misses, evictions, maxsize, currsize)
+        
+        Returns:
+            CacheInfo, or None if memoization is disabled
+        """
+        if self.memo is None:
+            return None
+        return self.memo.info()
+    
+    def _bind(self, values, bindings):
+        """Order the bindings as self.names, raising TypeError like a function call would"""
+        if len(values) > len(self.names):
+            raise TypeError(f"Template takes {len(self.names)} bindings but {len(values)} were given")
+        bound = list(values)
+        for name in self.names[len(values):]:
+            if name not in bindings:
+                raise TypeError(f"Missing binding for placeholder {{{name}}}")
+            bound.append(bindings[name])
+        unknown = set(bindings) - set(self.names)
+        if unknown or set(bindings) & set(self.names[:len(values)]):
+            raise TypeError(f"Unexpected or repeated bindings: {sorted(bindings)}")
+        return tuple(bound)
+    
+    def _parse_fixed(self):
+        """
+        Parse the template's fixed pieces, if its shape allows
+        
+        The shape is <operation> <operand> "and" <operand> {"and" <operand>},
+        with a literal operation and each operand either a literal number
+        or a placeholder on its own. Cut at its "and" tokens like that, the
+        template parses the same as the Parser would only if the "and"
+        after an operand can't be taken into it: "one hundred" and "five"
+        could be 105 unless it is the first of only two operands (the
+        Parser keeps the one "and" as the separator). A literal operand
+        like that rules the shape out, a binding like that is sent to the
+        Parser (see _evaluate).
+        
+        Returns:
+            (operation, operands), operands holding the value of each
+            literal operand and None for each placeholder; or None if the
+            template doesn't have this shape
+        """
+        language = self.calc.language
+        vocabulary = language.vocabulary
+        # Template tokens as IDs, with each placeholder as None
+        ids = [vocabulary.ids[token] for token in self._literal_tokens[0]]
+        for literal_tokens in self._literal_tokens[1:]:
+            ids.append(None)
+            ids.extend(vocabulary.ids[token] for token in literal_tokens)
+        if not ids or ids[0] is None or not vocabulary.is_operation[ids[0]]:
+            return None
+        if vocabulary.UNKNOWN in ids or vocabulary.then_id in ids:
+            return None
+        
+        pieces = [[]]
+        for token_id in ids[1:]:
+            if token_id == vocabulary.and_id:
+                pieces.append([])
+            else:
+                pieces[-1].append(token_id)
+        if len(pieces) < 2:
+            return None
+        operands = []
+        for number, piece in enumerate(pieces):
+            if piece == [None]:
+                operands.append(None)
+                continue
+            if None in piece:
+                return None
+            value, continues = language.automaton.phrase_value(bytes(piece))
+            if value is None or continues and not self._stands_alone(number, len(pieces)):
+                return None
+            operands.append(value)
+        return vocabulary.operation[ids[0]], operands
+    
+    def _result(self, bound):
+        """Evaluate one ordered binding tuple, through the memo when possible"""
+        if self.calc.instrumentation is not None:
+            # Keep per-stage timings meaningful: take the normal instrumented path
+            return self.calc.evaluate_result(self._text(bound))
+        
+        # Only str and int bindings are memoized: for other types equal keys
+        # (5 == 5.0) can fill in different text
+        memo = self.memo
+        if memo is None or not all(type(value) in (int, str) for value in bound):
+            return self._evaluate(bound)
+        result = memo.get(bound)
+        if result is None:
+            result = self._evaluate(bound)
+            memo.put(bound, result)
+        return result.copy()
+    
+    def _evaluate(self, bound):
+        """Evaluate the bindings: fixed parse where possible, else through the Parser"""
+        if not self._prelexed:
+            return self.calc.evaluate_result(self._text(bound))
+        
+        try:
+            if self._fixed is not None:
+                operands = self._bound_operands(bound)
+                if operands is not None:
+                    return self.calc.result_for_operands(self._fixed[0], operands)
+            
+            tokens = list(self._literal_tokens[0])
+            for index, literal_tokens in zip(self._slot_index, self._literal_tokens[1:]):
+                tokens.extend(self._binding_text(bound[index]).lower().split())
+                tokens.extend(literal_tokens)
+        except Exception as e:
+            return Result(None, (), None, None, ErrorCode.UNEXPECTED, e)
+        return self.calc.result_for_tokens(tokens)
+    
+    def _bound_operands(self, bound):
+        """
+        The fixed parse's operands with the bindings' values filled in
+        
+        Returns:
+            tuple, or None if a binding isn't a number phrase that stands
+            as an operand by itself there
+        """
+        language = self.calc.language
+        automaton = language.automaton
+        ints = self._int_phrases.setdefault(language.code, {})
+        operands = self._fixed[1]
+        count = len(operands)
+        slots = iter(self._slot_index)
+        values = []
+        for number, operand in enumerate(operands):
+            if operand is not None:
+                values.append(operand)
+                continue
+            binding = bound[next(slots)]
+            if type(binding) is int and 0 <= binding <= automaton.MAX_VALUE:
+                phrase = ints.get(binding)
+                if phrase is None:
+                    phrase = ints[binding] = self._phrase_value(self._binding_text(binding))
+            else:
+                phrase = self._phrase_value(self._binding_text(binding))
+            value, continues = phrase
+            if value is None or continues and not self._stands_alone(number, count):
+                return None
+            values.append(value)
+        return tuple(values)
+    
+    def _phrase_value(self, text):
+        """NumberAutomaton.phrase_value of a binding's text"""
+        ids = self.calc.language.vocabulary.ids
+        return self.calc.language.automaton.phrase_value(bytes(map(ids.__getitem__, text.lower().split())))
+    
+    @staticmethod
+    def _stands_alone(number, count):
+        """Does operand number (of count) end where the template says, even if an "and" could continue it?"""
+        return number == count - 1 or count == 2
+    
+    def _text(self, bound):
+        """The template with every placeholder replaced by its binding"""
+        parts = [self._literals[0]]
+        for index, literal in zip(self._slot_index, self._literals[1:]):
+            parts.append(self._binding_text(bound[index]))
+            parts.append(literal)
+        return ''.join(parts)
+    
+    def _binding_text(self, value):
+        """Text inserted for one binding: ints as words, everything else via str()"""
+        if isinstance(value, int):
+            return self.calc.language.number_words.to_words(value)
+        return str(value)
@@ -0,0 +1,227 @@
+"""
+EngineVerifier Module - Differential check of a parser engine against the reference
+Every number phrase with every operation, plus sampled invalid input, through both engines across processes
+"""
+
+import os
+import random
+
+from classes.LanguagePack import LanguagePack
+from classes.WordCalc import WordCalc
+
+
+# Per-process (reference, candidate) calculators, created once by the pool initializer
+_worker_calcs = None
+
+
+def _init_worker(engine, reference, language):
+    """Pool initializer: build both calculators once per worker process"""
+    global _worker_calcs
+    _worker_calcs = (WordCalc(language=language, engine=reference), WordCalc(language=language, engine=engine))
+
+
+def _compare_chunk(expressions):
+    """Pool task: evaluate a chunk with both engines and return where they differ"""
+    return EngineVerifier.compare(*_worker_calcs, expressions)
+
+
+class EngineVerifier:
+    """
+    Runs a generated corpus through two engines and collects every difference
+    
+    The corpus is built from the language's number automaton, so it covers
+    the whole number grammar rather than a sample of it:
+    
+    - every path through the automaton: each number 0-9999 in every
+      internal "and" form, plus the near misses that stop short of a
+      number ("one hundred and", "one thousand twelve")
+    - each of those with every operation keyword, as the first and as the
+      second operand, next to partners chosen to bring the "and" guards
+      into play ("one hundred", "two thousand and twelve", ...)
+    - each once more as one of three operands, and in a "then" chain
+    - sampled invalid input: random word sequences (including unknown
+      words) and valid expressions with a token dropped, repeated or swapped
+    
+    Results are compared as Result.to_dict(), so words, error codes, error
+    details, chains and operands must all match. The corpus is seeded, so a
+    run can be repeated exactly.
+    """
+    
+    # Partners per phrase and operation (see expressions)
+    PARTNERS = 12
+    
+    def __init__(self, engine, reference=None, language=None, workers=None, chunk_size=2000,
+                 samples=100000, seed=0):
+        """
+        Args:
+            engine (str): Engine to check (a WordCalc.ENGINES key)
+            reference (str, optional): Engine it must match; defaults to
+                WordCalc.DEFAULT_ENGINE
+            language (str, optional): Language code (see WordCalc)
+            workers (int, optional): Worker processes; defaults to the CPU count.
+                With 1 worker everything runs in the current process.
+            chunk_size (int): Expressions sent to a worker per task
+            samples (int): Invalid expressions sampled at random
+            seed (int): Seed for partners and samples
+        
+        Raises:
+            ValueError: If an engine or the language is unknown, or chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        self.engine = engine
+        self.reference = reference or WordCalc.DEFAULT_ENGINE
+        for name in (self.engine, self.reference):
+            WordCalc.engine_class(name)
+        self.language = LanguagePack.get(language)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.samples = samples
+        self.seed = seed
+    
+    @staticmethod
+    def compare(reference, candidate, expressions):
+        """
+        Evaluate expressions with two calculators
+        
+        Returns:
+            (count, divergences): divergences lists (expression,
+            reference result, candidate result) as to_dict() dicts
+        """
+        divergences = []
+        for expression in expressions:
+            expected = reference.evaluate_result(expression).to_dict()
+            actual = candidate.evaluate_result(expression).to_dict()
+            if expected != actual:
+                divergences.append((expression, expected, actual))
+        return len(expressions), divergences
+    
+    def phrases(self):
+        """
+        Every path through the number automaton, as words
+        
+        Returns:
+            list: (phrase, value, guarded) per path, as NumberAutomaton.paths
+            gives them; value is None for a phrase that stops short of a number
+        """
+        words = self.language.vocabulary.words
+        return [(' '.join(words[token_id] for token_id in ids), value, guarded)
+                for ids, value, _, guarded in self.language.automaton.paths()]
+    
+    def expressions(self):
+        """
+        Generate the whole corpus (see the class docstring), in a fixed order
+        
+        Yields:
+            str: Expressions
+        """
+        rng = random.Random(self.seed)
+        pack = self.language
+        paths = self.phrases()
+        valid = [phrase for phrase, value, _ in paths if value is not None]
+        operations = sorted(pack.operations)
+        and_word = pack.and_word
+        then_word = pack.then_word
+        by_word = f" {pack.by_word}" if pack.by_word else ''
+        
+        # Partners: a third that an "and" could continue ("one hundred"), a
+        # third with an internal "and", the rest any number; the guards only
+        # come into play next to the first two kinds
+        third = self.PARTNERS // 3
+        extendable = [phrase for phrase, value, guarded in paths if guarded and value is not None]
+        joined = [phrase for phrase in valid if f" {and_word} " in phrase]
+        partners = rng.sample(extendable, min(third, len(extendable)))
+        partners += rng.sample(joined, min(third, len(joined)))
+        partners += rng.sample(valid, self.PARTNERS - len(partners))
+        
+        for index, (phrase, _, _) in enumerate(paths):
+            for number, operation in enumerate(operations):
+                partner = partners[(index + number) % len(partners)]
+                yield f"{operation} {phrase} {and_word} {partner}"
+                yield f"{operation} {partner} {and_word} {phrase}"
+            operation = operations[index % len(operations)]
+            first, second = rng.choice(partners), rng.choice(partners)
+            yield f"{operation} {first} {and_word} {phrase} {and_word} {second}"
+            yield (f"{operation} {first} {and_word} {second} {then_word} "
+                   f"{operations[(index + 1) % len(operations)]}{by_word} {phrase}")
+        
+        # Invalid samples: random words, then damaged valid expressions
+        words = list(pack.vocabulary.words[1:]) + ['plus', 'fourty', 'hundreds']
+        for _ in range(self.samples // 2):
+            tokens = [rng.choice(words) for _ in range(rng.randint(1, 10))]
+            if rng.random() < 0.7:
+                tokens[0] = rng.choice(operations)
+            yield ' '.join(tokens)
+        for _ in range(self.samples - self.samples // 2):
+            tokens = f"{rng.choice(operations)} {rng.choice(valid)} {and_word} {rng.choice(valid)}".split()
+            position = rng.randrange(len(tokens))
+            damage = rng.randrange(3)
+            if damage == 0:
+                del tokens[position]
+            elif damage == 1:
+                tokens.insert(position, tokens[position])
+            elif position + 1 < len(tokens):
+                tokens[position], tokens[position + 1] = tokens[position + 1], tokens[position]
+            else:
+                tokens.append(rng.choice((and_word, then_word)))
+            yield ' '.join(tokens)
+    
+    def _chunks(self):
+        """Lists of up to chunk_size expressions from the corpus"""
+        chunk = []
+        for expression in self.expressions():
+            chunk.append(expression)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def run(self, max_examples=20):
+        """
+        Compare the engines on the whole corpus
+        
+        Args:
+            max_examples (int): Divergences kept in the report (all are counted)
+        
+        Returns:
+            dict: 'engine', 'reference', 'language', 'expressions' (count
+            compared), 'phrases' and 'values' (valid number phrases and the
+            distinct values they cover), 'divergences' (count) and
+            'examples' (the first divergences as (expression, reference
+            result, engine result))
+        """
+        values = [value for _, value, _ in self.phrases() if value is not None]
+        report = {
+            'engine': self.engine,
+            'reference': self.reference,
+            'language': self.language.code,
+            'expressions': 0,
+            'phrases': len(values),
+            'values': len(set(values)),
+            'divergences': 0,
+            'examples': [],
+        }
+        
+        if self.workers == 1:
+            calcs = (WordCalc(language=self.language, engine=self.reference),
+                     WordCalc(language=self.language, engine=self.engine))
+            results = (self.compare(*calcs, chunk) for chunk in self._chunks())
+            self._collect(report, results, max_examples)
+            return report
+        
+        # Imported here so single-process runs don't pay for it
+        from multiprocessing import Pool
+        
+        initargs = (self.engine, self.reference, self.language.code)
+        with Pool(self.workers, initializer=_init_worker, initargs=initargs) as pool:
+            self._collect(report, pool.imap(_compare_chunk, self._chunks()), max_examples)
+        return report
+    
+    @staticmethod
+    def _collect(report, results, max_examples):
+        """Add each chunk's (count, divergences) to the report"""
+        for count, divergences in results:
+            report['expressions'] += count
+            report['divergences'] += len(divergences)
+            report['examples'].extend(divergences[:max_examples - len(report['examples'])])
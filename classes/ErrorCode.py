@@ -0,0 +1,65 @@
+"""
+ErrorCode Module - Numeric codes for every WordCalc error
+Lets the hot path report failures without raising; messages are built only on demand
+"""
+
+
+class ErrorCode:
+    """
+    Error codes and their message templates ('{0}' is the error detail)
+    """
+    
+    OK = 0
+    EMPTY_INPUT = 1
+    INVALID_OPERATION = 2
+    EXPECTED_NUMBER = 3
+    ZERO_HUNDRED = 4
+    ZERO_THOUSAND = 5
+    INVALID_HUNDREDS = 6
+    INVALID_THOUSANDS = 7
+    EXPECTED_AND = 8
+    UNEXPECTED_TOKENS = 9
+    DIVISION_BY_ZERO = 10
+    UNKNOWN_OPERATION = 11
+    UNEXPECTED = 12
+    
+    NAMES = {
+        OK: 'OK',
+        EMPTY_INPUT: 'EMPTY_INPUT',
+        INVALID_OPERATION: 'INVALID_OPERATION',
+        EXPECTED_NUMBER: 'EXPECTED_NUMBER',
+        ZERO_HUNDRED: 'ZERO_HUNDRED',
+        ZERO_THOUSAND: 'ZERO_THOUSAND',
+        INVALID_HUNDREDS: 'INVALID_HUNDREDS',
+        INVALID_THOUSANDS: 'INVALID_THOUSANDS',
+        EXPECTED_AND: 'EXPECTED_AND',
+        UNEXPECTED_TOKENS: 'UNEXPECTED_TOKENS',
+        DIVISION_BY_ZERO: 'DIVISION_BY_ZERO',
+        UNKNOWN_OPERATION: 'UNKNOWN_OPERATION',
+        UNEXPECTED: 'UNEXPECTED',
+    }
+    
+    MESSAGES = {
+        EMPTY_INPUT: "Empty input",
+        INVALID_OPERATION: "Invalid operation: '{0}'. Expected: add, subtract, multiply, or divide",
+        EXPECTED_NUMBER: "Expected a number but got '{0}'",
+        ZERO_HUNDRED: "Cannot have 'zero hundred'",
+        ZERO_THOUSAND: "Cannot have 'zero thousand'",
+        INVALID_HUNDREDS: "Invalid hundreds value: '{0}'. Must be 1-9",
+        INVALID_THOUSANDS: "Invalid thousands value: '{0}'. Must be 1-9",
+        EXPECTED_AND: "Expected 'and' between numbers but got '{0}'",
+        UNEXPECTED_TOKENS: "Unexpected tokens at end: '{0}'",
+        DIVISION_BY_ZERO: "Cannot divide by zero",
+        UNKNOWN_OPERATION: "Unknown operation: {0}",
+        UNEXPECTED: "{0}",
+    }
+    
+    @classmethod
+    def name(cls, code):
+        """Symbolic name of a code (e.g. 'EXPECTED_AND')"""
+        return cls.NAMES[code]
+    
+    @classmethod
+    def message(cls, code, detail=None):
+        """Human-readable message for a code and its detail"""
+        return cls.MESSAGES[code].format(detail)
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+IncrementalSession Module - As-you-type evaluation that re-lexes only what changed
+Created by WordCalc.session(); the main.py REPL uses it for multi-line input
+"""
+
+import re
+from bisect import bisect_left
+
+from classes.Parser import Parser
+from classes.Interpreter import Interpreter
+from classes.Result import Result
+from classes.ErrorCode import ErrorCode
+
+
+class SessionState:
+    """
+    Outcome of one IncrementalSession.update()
+    
+    Attributes:
+        status (str): EMPTY, INCOMPLETE (no error yet, the input just
+            stops early or ends in a word still being typed), COMPLETE
+            (evaluated successfully) or ERROR
+        result (Result): Exactly what WordCalc.evaluate_result returns for
+            the current text
+        reparsed (int): Tokens parsed for this update (the whole input)
+    """
+    
+    __slots__ = ('status', 'result', 'reparsed')
+    
+    def __init__(self, status, result, reparsed=0):
+        self.status = status
+        self.result = result
+        self.reparsed = reparsed
+    
+    def __repr__(self):
+        return f"SessionState({self.status!r}, {self.result!r}, reparsed={self.reparsed})"
+
+
+class IncrementalSession:
+    """
+    Evaluates a text that changes a little at a time (one keystroke, one line)
+    
+    Only the tokens from the first edited one onward are lexed (and
+    spelling-corrected) again. The tokens are then parsed whole by the
+    Parser itself, so the session accepts exactly what evaluate_result()
+    does. An update costs about one parse of the input.
+    
+    Whether an expression is unfinished also comes from the Parser: a
+    parse that fails at the end of the input (Parser.error_position) is
+    INCOMPLETE, as is one that fails on a last word still being typed
+    (a prefix of a vocabulary word, with no space after it yet).
+    """
+    
+    EMPTY = 'empty'
+    INCOMPLETE = 'incomplete'
+    COMPLETE = 'complete'
+    ERROR = 'error'
+    
+    # A token, as str.split() sees it
+    _WORD = re.compile(r'\S+')
+    # Language code -> beginnings of its vocabulary words, for spotting a word still being typed
+    _PREFIXES = {}
+    
+    def __init__(self, calc):
+        """
+        Args:
+            calc (WordCalc): Calculator whose options (e.g. spelling
+                correction) the session follows
+        """
+        self.calc = calc
+        self.text = ''
+        # Parser input: lowercase tokens (after any spelling correction) and their IDs
+        self.tokens = []
+        self.ids = bytearray()
+        # Tokens as typed, and the offset in text just past each one
+        self._raw_tokens = []
+        self._ends = []
+        # (token index, (original, corrected)) for each corrected token
+        self._corrections = []
+        language = calc.language
+        self._parser = Parser([], language)
+        self._interpreter = Interpreter(None, None, None, language=language)
+        self._prefixes = self._PREFIXES.get(language.code)
+        if self._prefixes is None:
+            self._prefixes = self._PREFIXES[language.code] = frozenset(
+                word[:end] for word in language.vocabulary.words for end in range(1, len(word)))
+        self.state = SessionState(self.EMPTY, Result(None, (), None, None, ErrorCode.EMPTY_INPUT))
+    
+    def update(self, text):
+        """
+        Replace the session's text and evaluate it
+        
+        Only the tokens from the first edited one onward are lexed again;
+        the Parser then parses the whole input.
+        
+        Args:
+            text (str): The whole current input
+        
+        Returns:
+            SessionState: Also kept as self.state
+        """
+        self._relex(text)
+        if not self.tokens:
+            self.state = SessionState(self.EMPTY, Result(None, (), None, None, ErrorCode.EMPTY_INPUT))
+            return self.state
+        
+        try:
+            state = self._evaluate()
+        except Exception as e:
+            state = SessionState(self.ERROR, Result(None, (), None, None, ErrorCode.UNEXPECTED, e))
+        if self._corrections:
+            state.result.corrections = tuple(pair for _, pair in self._corrections)
+        self.state = state
+        return state
+    
+    def append(self, text):
+        """Add text to the end of the input (e.g. a keystroke) and evaluate"""
+        return self.update(self.text + text)
+    
+    def backspace(self, count=1):
+        """Remove count characters from the end of the input and evaluate"""
+        return self.update(self.text[:max(len(self.text) - count, 0)])
+    
+    def clear(self):
+        """Empty the input"""
+        return self.update('')
+    
+    def _relex(self, text):
+        """
+        Re-tokenize text from the first token the edit can have touched
+        
+        Gives the same tokens as Lexer (lowercased, split on whitespace):
+        lowercasing never adds or removes whitespace, so lowering each word
+        on its own is the same as lowering the whole text first.
+        
+        Returns:
+            int: Index of the first token that differs from before
+        """
+        old = self.text
+        self.text = text
+        if text.startswith(old):
+            prefix = len(old)
+        elif old.startswith(text):
+            prefix = len(text)
+        else:
+            # Longest common prefix, by bisection on slice comparisons
+            low, high = 0, min(len(old), len(text))
+            while low < high:
+                middle = (low + high + 1) // 2
+                if old[:middle] == text[:middle]:
+                    low = middle
+                else:
+                    high = middle - 1
+            prefix = low
+        
+        # A token ending before the edit is followed by unchanged whitespace
+        first = bisect_left(self._ends, prefix)
+        start = self._ends[first - 1] if first else 0
+        raw = []
+        ends = []
+        for match in self._WORD.finditer(text, start):
+            raw.append(match.group().lower())
+            ends.append(match.end())
+        
+        old_raw = self._raw_tokens
+        changed = first
+        while changed < len(old_raw) and changed - first < len(raw) and old_raw[changed] == raw[changed - first]:
+            changed += 1
+        old_raw[first:] = raw
+        self._ends[first:] = ends
+        
+        tokens = old_raw[changed:]
+        corrections = self._corrections
+        while corrections and corrections[-1][0] >= changed:
+            corrections.pop()
+        if self.calc.corrector is not None:
+            corrected, _ = self.calc.corrector.correct_tokens(tokens)
+            for offset, token in enumerate(tokens):
+                if corrected[offset] != token:
+                    corrections.append((changed + offset, (token, corrected[offset])))
+            tokens = corrected
+        
+        self.tokens[changed:] = tokens
+        self.ids[changed:] = map(self._parser.VOCABULARY.ids.__getitem__, tokens)
+        return changed
+    
+    def _evaluate(self):
+        """Parse the tokens with the Parser and build the SessionState"""
+        parser = self._parser
+        parser.reset(self.tokens, self.ids)
+        parsed = parser.try_parse()
+        if parsed is None:
+            code, detail = parser.error
+            result = Result(parser.operation, (), None, None, code, detail)
+            status = self.INCOMPLETE if self._incomplete(parser.error_position) else self.ERROR
+        else:
+            result = self.calc._interpret(self._interpreter, parsed[0], parsed[1:], parser.chain)
+            status = self.COMPLETE if result.error_code == ErrorCode.OK else self.ERROR
+        return SessionState(status, result, len(self.ids))
+    
+    def _incomplete(self, position):
+        """
+        Is a parse error at position just the input stopping early?
+        
+        True if the parser ran out of tokens, or failed on the last word
+        while it can still be typed into a longer vocabulary word.
+        """
+        tokens = self.tokens
+        if position >= len(tokens):
+            return True
+        if position < len(tokens) - 1 or not self.text or self.text[-1].isspace():
+            return False
+        return tokens[position] in self._prefixes
@@ -0,0 +1,143 @@
+"""
+Instrumentation Module - Optional per-stage timings, error counts and parser counters
+Attach an Instrumentation to WordCalc to see where evaluation time goes
+"""
+
+import json
+import threading
+import time
+from collections import Counter, deque
+
+
+# Parser decision counters reported for every evaluation
+PARSER_COUNTERS = (
+    'and_checks',   # times _is_and_within_number ran
+    'and_within',   # ...and decided the "and" belonged to the number
+    'give_backs',   # number ended before "thousand" (the old hundreds backtrack case)
+)
+
+
+class Instrumentation:
+    """
+    Aggregates per-evaluation measurements and forwards each one to an exporter
+    
+    Totals kept:
+    - stage_ns: nanoseconds spent in tokenize, parse and interpret
+    - errors: error counts keyed by ErrorCode name (e.g. "EXPECTED_AND")
+    - counters: parser decision counters (see PARSER_COUNTERS) and cache hits/misses
+    
+    Totals are updated under a lock, so one Instrumentation can be shared by
+    threads (see WordCalc.evaluate_parallel). Exporters are called under
+    the same lock.
+    """
+    
+    STAGES = ('tokenize', 'parse', 'interpret')
+    
+    def __init__(self, exporter=None):
+        """
+        Args:
+            exporter (optional): Object with an export(event) method that
+                receives one dict per evaluation (e.g. InMemoryExporter,
+                JsonLinesExporter). Totals are kept either way.
+        """
+        self.exporter = exporter
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Clear all totals"""
+        with self._lock:
+            self.evaluations = 0
+            self.stage_ns = dict.fromkeys(self.STAGES, 0)
+            self.errors = Counter()
+            self.counters = Counter()
+    
+    def new_parser_stats(self):
+        """Fresh per-evaluation parser counter dict"""
+        return dict.fromkeys(PARSER_COUNTERS, 0)
+    
+    def record(self, timings, parser_stats, error=None, cache=None):
+        """
+        Add one evaluation to the totals and export it
+        
+        Args:
+            timings (dict): Nanoseconds per stage that ran
+            parser_stats (dict): Parser counters for this evaluation
+            error (str, optional): ErrorCode name if it failed
+            cache (str, optional): 'hit' or 'miss' when caching is enabled
+        """
+        event = None
+        if self.exporter is not None:
+            event = {'time': time.time()}
+            for stage in self.STAGES:
+                event[f'{stage}_ns'] = timings.get(stage, 0)
+            event.update(parser_stats)
+            event['error'] = error
+            event['cache'] = cache
+        
+        with self._lock:
+            self.evaluations += 1
+            for stage, elapsed in timings.items():
+                self.stage_ns[stage] += elapsed
+            self.counters.update(parser_stats)
+            if error is not None:
+                self.errors[error] += 1
+            if cache is not None:
+                self.counters[f'cache_{cache}'] += 1
+            if event is not None:
+                self.exporter.export(event)
+    
+    def snapshot(self):
+        """
+        Return the current totals as a plain dict (JSON serializable)
+        """
+        with self._lock:
+            return {
+                'evaluations': self.evaluations,
+                'stage_ns': dict(self.stage_ns),
+                'errors': dict(self.errors),
+                'counters': dict(self.counters),
+            }
+
+
+class InMemoryExporter:
+    """
+    Keeps exported events in memory (the most recent maxlen, if given)
+    """
+    
+    def __init__(self, maxlen=None):
+        self.events = deque(maxlen=maxlen)
+    
+    def export(self, event):
+        self.events.append(event)
+    
+    def close(self):
+        pass
+
+
+class JsonLinesExporter:
+    """
+    Writes each event as one JSON object per line
+    """
+    
+    def __init__(self, target):
+        """
+        Args:
+            target: File path or an open text file object
+        """
+        if isinstance(target, str):
+            self._file = open(target, 'a', encoding='utf-8')
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+    
+    def export(self, event):
+        self._file.write(json.dumps(event, separators=(',', ':')))
+        self._file.write('\n')
+    
+    def close(self):
+        """Flush, and close the file if this exporter opened it"""
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
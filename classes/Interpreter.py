@@ -1,119 +1,117 @@
 """
 Interpreter Module - Enhanced with Hundreds and Thousands Support
-Executes operations and converts results to words (0-9999)
+Executes operations and converts results to words (any integer)
+Operands and chained steps are folded left to right on integers; only the final value becomes words
 """
 
 from classes.WordCalcError import WordCalcError
+from classes.ErrorCode import ErrorCode
+from classes.LanguagePack import LanguagePack
 
 
 class Interpreter:
     """
     Interpreter - Executes the parsed expression and returns result
-    Now supports number-to-word conversion for 0-9,999
+    Number-to-word conversion covers any integer (via NumberWords)
     """
     
-    # Number to word mappings (for output)
-    NUM_TO_WORD = {
-        0: 'zero', 1: 'one', 2: 'two', 3: 'three', 4: 'four',
-        5: 'five', 6: 'six', 7: 'seven', 8: 'eight', 9: 'nine',
-        10: 'ten', 11: 'eleven', 12: 'twelve', 13: 'thirteen', 14: 'fourteen',
-        15: 'fifteen', 16: 'sixteen', 17: 'seventeen', 18: 'eighteen', 19: 'nineteen',
-        20: 'twenty', 30: 'thirty', 40: 'forty', 50: 'fifty',
-        60: 'sixty', 70: 'seventy', 80: 'eighty', 90: 'ninety'
-    }
+    # The default language (see LanguagePack)
+    LANGUAGE = LanguagePack.get()
     
-    def __init__(self, operation, num1, num2):
+    # Shared integer-to-words codec (group tables are built once)
+    NUMBER_WORDS = LANGUAGE.number_words
+    
+    def __init__(self, operation, num1, num2, *operands, chain=(), language=None):
+        """
+        Args:
+            operation, num1, num2, *operands, chain: As for reset()
+            language (LanguagePack, optional): Language to write results in,
+                other than the default
+        """
+        if language is not None:
+            self.LANGUAGE = language
+            self.NUMBER_WORDS = language.number_words
+        self.reset(operation, num1, num2, *operands, chain=chain)
+    
+    def reset(self, operation, num1, num2, *operands, chain=()):
+        """
+        Load a new parsed expression so the same interpreter can be reused
+        
+        Args:
+            operation: Operation of the first step
+            num1, num2, *operands: Its operands (what Parser.try_parse returns)
+            chain: (operation, operands) of each "then" step (Parser.chain)
+        """
         self.operation = operation
         self.num1 = num1
         self.num2 = num2
+        # Operands after the second
+        self.operands = operands
+        self.chain = chain
+        # (ErrorCode, detail) of the last failed execution, or None
+        self.error = None
     
     def execute(self):
         """Execute the operation and return numeric result"""
-        if self.operation == 'add':
-            return self.num1 + self.num2
-        elif self.operation == 'subtract':
-            return self.num1 - self.num2
-        elif self.operation == 'multiply':
-            return self.num1 * self.num2
-        elif self.operation == 'divide':
-            if self.num2 == 0:
-                raise WordCalcError("Cannot divide by zero")
-            # Integer division
-            return self.num1 // self.num2
-        else:
-            raise WordCalcError(f"Unknown operation: {self.operation}")
+        result = self.try_execute()
+        if result is None:
+            raise WordCalcError.from_code(*self.error)
+        return result
     
-    def number_to_words(self, num):
+    def try_execute(self):
         """
-        Convert a number (0-9999) to its word representation
-        
-        Algorithm:
-        - Handle negative numbers
-        - Break down into: thousands, hundreds, tens, ones
-        - Convert each component and combine
-        """
-        # Handle negative numbers
-        if num < 0:
-            return f"negative {self.number_to_words(abs(num))}"
-        
-        # Handle zero
-        if num == 0:
-            return 'zero'
+        Execute the operation without raising
         
-        # For numbers beyond our range, return as digits
-        if num > 9999:
-            return str(num)
+        Operands are combined left to right ("subtract ten and two and
+        three" is (10 - 2) - 3), then each chained step continues from the
+        value so far. Intermediate values stay integers.
         
-        # Build the word representation
-        parts = []
-        
-        # THOUSANDS place (1000-9000)
-        if num >= 1000:
-            thousands_digit = num // 1000
-            parts.append(self.NUM_TO_WORD[thousands_digit])
-            parts.append('thousand')
-            num = num % 1000  # Remove thousands
-        
-        # HUNDREDS place (100-900)
-        if num >= 100:
-            hundreds_digit = num // 100
-            parts.append(self.NUM_TO_WORD[hundreds_digit])
-            parts.append('hundred')
-            num = num % 100  # Remove hundreds
-        
-        # TENS and ONES place (0-99)
-        if num > 0:
-            parts.append(self._convert_below_hundred(num))
-        
-        return ' '.join(parts)
+        Returns:
+            The numeric result, or None with self.error set to an
+            (ErrorCode, detail) pair
+        """
+        value = self._apply(self.operation, self.num1, self.num2)
+        if value is None or not (self.operands or self.chain):
+            return value
+        for operand in self.operands:
+            value = self._apply(self.operation, value, operand)
+            if value is None:
+                return None
+        for operation, operands in self.chain:
+            for operand in operands:
+                value = self._apply(operation, value, operand)
+                if value is None:
+                    return None
+        return value
     
-    def _convert_below_hundred(self, num):
+    def _apply(self, operation, left, right):
+        """One binary operation, or None with self.error set"""
+        if operation == 'add':
+            return left + right
+        elif operation == 'subtract':
+            return left - right
+        elif operation == 'multiply':
+            return left * right
+        elif operation == 'divide':
+            if right == 0:
+                self.error = (ErrorCode.DIVISION_BY_ZERO, None)
+                return None
+            # Integer division
+            return left // right
+        else:
+            self.error = (ErrorCode.UNKNOWN_OPERATION, operation)
+            return None
+    
+    def number_to_words(self, num):
         """
-        Convert numbers 1-99 to words
-        Helper method for number_to_words
-        
-        Args:
-            num: Integer between 1 and 99
+        Convert an integer of any size to its word representation
         
-        Returns:
-            String representation of the number
+        Delegates to the language's shared NumberWords codec, which looks
+        up each 3-digit group in a precomputed table and adds its scale
+        word (thousand, million, ... decillion). Negative numbers get a
+        "negative" prefix.
         """
-        # Direct lookup for 0-20 and multiples of 10
-        if num in self.NUM_TO_WORD:
-            return self.NUM_TO_WORD[num]
-        
-        # Compound numbers (21-99)
-        if 20 < num < 100:
-            tens_place = (num // 10) * 10
-            ones_place = num % 10
-            
-            tens_word = self.NUM_TO_WORD[tens_place]
-            ones_word = self.NUM_TO_WORD[ones_place]
-            
-            return f"{tens_word} {ones_word}"
-        
-        # Shouldn't reach here if num is 1-99
-        return str(num)
+        return self.NUMBER_WORDS.to_words(num)
     
     def interpret(self):
         """Execute and return result as words"""
@@ -0,0 +1,166 @@
+"""
+LanguagePack Module - Per-language words, number grammar and number-to-words generator
+Packs are registered by code and imported and compiled the first time they are used
+"""
+
+import importlib
+import threading
+
+from classes.NumberAutomaton import NumberAutomaton
+from classes.NumberWords import NumberWords
+from classes.Vocabulary import Vocabulary
+
+
+class LanguagePack:
+    """
+    Everything about one input/output language, compiled into lookup tables
+    
+    A pack starts as plain word tables. compile() turns them into the three
+    structures the hot paths read, once per process:
+    
+    - vocabulary: token IDs and per-ID attributes (Vocabulary)
+    - automaton: the number grammar as transition tables (NumberAutomaton)
+    - number_words: the integer-to-words generator (NumberWords)
+    
+    The Parser, IncrementalSession and Interpreter read these through the
+    same attributes whatever the language, so every language runs the same
+    table lookups. The base class builds English-style grammars ("<digit>
+    hundred [and] <number>", "<tens> <digit>"); a language whose numbers
+    are put together differently overrides build_automaton and/or
+    build_number_words (see classes/languages/zh.py).
+    
+    Operation keywords map to the canonical names 'add', 'subtract',
+    'multiply' and 'divide', so results, writers and caches see the same
+    operations in every language. Words must be lowercase ASCII (the
+    mapped-file lexer matches raw bytes); error messages stay in English.
+    
+    Packs are looked up by code with get(). Built-in packs are listed in
+    REGISTRY as module paths, and a module is only imported (and its pack
+    compiled) the first time its code is asked for.
+    """
+    
+    # Language code -> module defining PACK; imported on first get()
+    REGISTRY = {
+        'en': 'classes.languages.en',
+        'zh': 'classes.languages.zh',
+    }
+    DEFAULT = 'en'
+    
+    # Compiled packs by code, filled by get()
+    _loaded = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, code, name, word_to_num, multipliers, operations, and_word, then_word,
+                 by_word=None, scales=('',), negative_word='negative'):
+        """
+        Args:
+            code (str): Language code packs are looked up by (e.g. 'en')
+            name (str): Human-readable language name
+            word_to_num (dict): Basic number words and their values (0-99)
+            multipliers (dict): Multiplier words and their values (hundred, thousand)
+            operations (dict): Operation keyword -> 'add', 'subtract', 'multiply' or 'divide'
+            and_word (str): Connector between operands (and inside numbers, if
+                the grammar allows it)
+            then_word (str): Word that chains a further step
+            by_word (str, optional): Optional word after a chained step's
+                operation ("then multiply by two"); None if there is none
+            scales (tuple): Output scale words, one per 3-digit group
+                ('', 'thousand', 'million', ...)
+            negative_word (str): Output prefix for negative numbers
+        """
+        self.code = code
+        self.name = name
+        self.word_to_num = word_to_num
+        self.multipliers = multipliers
+        self.operations = operations
+        self.and_word = and_word
+        self.then_word = then_word
+        self.by_word = by_word
+        self.scales = scales
+        self.negative_word = negative_word
+        self.vocabulary = None
+        self.automaton = None
+        self.number_words = None
+    
+    @classmethod
+    def get(cls, code=None):
+        """
+        Return the compiled pack for a language code, loading it on first use
+        
+        Args:
+            code (str, optional): Language code; DEFAULT if omitted. A
+                LanguagePack is returned as it is.
+        
+        Returns:
+            LanguagePack
+        
+        Raises:
+            ValueError: If no pack is registered for the code
+        """
+        if isinstance(code, LanguagePack):
+            return code
+        code = code or cls.DEFAULT
+        pack = cls._loaded.get(code)
+        if pack is not None:
+            return pack
+        with cls._lock:
+            pack = cls._loaded.get(code)
+            if pack is None:
+                try:
+                    module = cls.REGISTRY[code]
+                except KeyError:
+                    raise ValueError(f"Unknown language '{code}'. Expected one of: {', '.join(cls.REGISTRY)}")
+                pack = importlib.import_module(module).PACK
+                pack.compile()
+                cls._loaded[code] = pack
+        return pack
+    
+    @classmethod
+    def register(cls, code, module):
+        """
+        Make a pack available under a code without loading it
+        
+        Args:
+            code (str): Language code
+            module (str): Import path of a module defining PACK
+        """
+        with cls._lock:
+            cls.REGISTRY[code] = module
+            cls._loaded.pop(code, None)
+    
+    @classmethod
+    def available(cls):
+        """Registered language codes (nothing is imported)"""
+        return tuple(cls.REGISTRY)
+    
+    @classmethod
+    def loaded(cls):
+        """Codes of the packs loaded so far"""
+        return tuple(cls._loaded)
+    
+    def compile(self):
+        """Build the vocabulary, number automaton and words generator (once)"""
+        if self.vocabulary is None:
+            vocabulary = Vocabulary(self.word_to_num, self.multipliers, self.operations,
+                                    self.and_word, self.then_word, self.by_word)
+            self.automaton = self.build_automaton(vocabulary)
+            self.number_words = self.build_number_words()
+            self.vocabulary = vocabulary
+        return self
+    
+    def build_automaton(self, vocabulary):
+        """Number grammar: "<digit> hundred [and] <number>", "<digit> thousand ..." (0-9999)"""
+        multipliers = {value: word for word, value in self.multipliers.items()}
+        return NumberAutomaton(self.word_to_num, vocabulary, self.and_word, multipliers[100], multipliers[1000])
+    
+    def build_number_words(self):
+        """Words generator: 3-digit groups, each with its scale word"""
+        num_to_word = {value: word for word, value in self.word_to_num.items()}
+        hundred = {value: word for word, value in self.multipliers.items()}[100]
+        return NumberWords(
+            ones=('',) + tuple(num_to_word[value] for value in range(1, 20)),
+            tens=('', '') + tuple(num_to_word[value] for value in range(20, 100, 10)),
+            scales=self.scales, hundred=hundred, negative=self.negative_word, zero=num_to_word[0])
+    
+    def __repr__(self):
+        return f"LanguagePack({self.code!r}, {self.name!r})"
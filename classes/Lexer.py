@@ -1,18 +1,42 @@
 from classes.WordCalcError import WordCalcError
+from classes.ErrorCode import ErrorCode
 class Lexer:
     """
     Lexer/Tokenizer - Breaks down input string into tokens
     """
     
     def __init__(self, text):
+        self.reset(text)
+    
+    def reset(self, text):
+        """Load a new input string so the same lexer can be reused"""
         self.text = text.lower().strip()
         self.tokens = []
     
     def tokenize(self):
         """Split input into individual tokens"""
+        tokens = self.try_tokenize()
+        if tokens is None:
+            raise WordCalcError.from_code(ErrorCode.EMPTY_INPUT)
+        return tokens
+    
+    def try_tokenize(self):
+        """Split input into tokens, returning None for empty input instead of raising"""
         if not self.text:
-            raise WordCalcError("Empty input")
+            return None
         
         # Split by whitespace
         self.tokens = self.text.split()
-        return self.tokens
\ No newline at end of file
+        return self.tokens
+    
+    def try_encode(self, vocabulary):
+        """
+        Split input into a TokenStream of vocabulary IDs (see Vocabulary)
+        
+        Returns:
+            TokenStream, or None for empty input
+        """
+        tokens = self.try_tokenize()
+        if tokens is None:
+            return None
+        return vocabulary.encode(tokens)
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+MappedLexer Module - Bulk tokenizer over a memory-mapped expression file
+Scans token boundaries in the file's bytes and maps words straight to vocabulary IDs
+"""
+
+import copy
+import mmap
+import re
+
+from classes.Lexer import Lexer
+from classes.Parser import Parser
+from classes.Vocabulary import Vocabulary, TokenStream
+
+
+class MappedLexer:
+    """
+    Tokenizes a file with one expression per line, without reading it into str
+    
+    - The file is memory-mapped and scanned in blocks of whole lines.
+      Lowercasing and line and token splitting run on the bytes.
+    - Each line becomes a TokenStream: byte words map straight to
+      Vocabulary IDs, so no str is built per token. Unknown words are
+      decoded so error messages can quote them.
+    - Pages already scanned are released back to the OS, so resident
+      memory stays flat however large the file is.
+    
+    Streams encode exactly what Lexer.tokenize() gives for each line read
+    in text mode: universal newlines, and any line with non-ASCII bytes (or
+    the separators that only str.split() knows) goes through Lexer itself.
+    """
+    
+    # Bytes scanned per block (whole lines only; a longer line gets its own block)
+    BLOCK_SIZE = 1 << 20
+    # Scanned bytes kept mapped before they are released
+    RELEASE_SIZE = 16 << 20
+    
+    # Whitespace to str.split() but not to bytes.split()
+    _STR_ONLY_SEPARATORS = (b'\x1c', b'\x1d', b'\x1e', b'\x1f')
+    # Bytes where bytes.lower()/split() and str.lower()/split() can disagree
+    _NEEDS_LEXER = re.compile(rb'[\x1c-\x1f\x80-\xff]')
+    # Stand-in word for a newline while a block is encoded in one pass
+    _LINE_END_WORD = b'\x00'
+    _LINE_END_ID = bytes([Vocabulary.MAX_ID + 1])
+    
+    def __init__(self, path, vocabulary=None):
+        """
+        Args:
+            path (str): File with one expression per line
+            vocabulary (Vocabulary, optional): Defaults to Parser.VOCABULARY
+        """
+        self.path = path
+        self.vocabulary = vocabulary or Parser.VOCABULARY
+        self._byte_ids = copy.copy(self.vocabulary.byte_ids)
+        self._byte_ids[self._LINE_END_WORD] = Vocabulary.MAX_ID + 1
+        self._lexer = Lexer('')
+    
+    def __iter__(self):
+        return self.token_lists()
+    
+    def token_lists(self, start=0, end=None):
+        """
+        Yield one TokenStream per line of the file (or of a byte range of it)
+        
+        Args:
+            start (int): Offset of the first line (0 or a range from ranges())
+            end (int, optional): Offset just past the last line; defaults to
+                the end of the file
+        
+        Yields:
+            TokenStream: Tokens of the line (empty for a blank line)
+        """
+        with open(self.path, 'rb') as infile:
+            try:
+                mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                return
+            with mapped:
+                can_release = hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_DONTNEED')
+                if can_release:
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                
+                end = len(mapped) if end is None else min(end, len(mapped))
+                position = start
+                released = start - start % mmap.PAGESIZE
+                while position < end:
+                    # Cut the block after its last newline so no line is split
+                    block_end = mapped.rfind(b'\n', position, min(position + self.BLOCK_SIZE, end)) + 1
+                    if block_end <= position:
+                        block_end = mapped.find(b'\n', position, end) + 1 or end
+                    yield from self._block_tokens(mapped[position:block_end])
+                    position = block_end
+                    
+                    if can_release and position - released >= self.RELEASE_SIZE:
+                        boundary = position - position % mmap.PAGESIZE
+                        mapped.madvise(mmap.MADV_DONTNEED, released, boundary - released)
+                        released = boundary
+    
+    def ranges(self, size):
+        """
+        Split the file into byte ranges of whole lines, each about size bytes
+        
+        Lets several processes tokenize one file from their own mappings:
+        only the (start, end) offsets have to be passed around.
+        
+        Args:
+            size (int): Target bytes per range
+        
+        Returns:
+            list[tuple]: (start, end) offsets covering the file in order
+        """
+        with open(self.path, 'rb') as infile:
+            try:
+                mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return []
+            with mapped:
+                total = len(mapped)
+                ranges = []
+                start = 0
+                while start < total:
+                    # Extend each range to the end of the line it stops in
+                    end = mapped.find(b'\n', min(start + size, total) - 1) + 1 or total
+                    ranges.append((start, end))
+                    start = end
+                return ranges
+    
+    def _block_tokens(self, block):
+        """TokenStreams for every line of one block of whole lines"""
+        if b'\r' in block:
+            # Text mode reads '\r\n' and a lone '\r' as line ends too
+            block = block.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        block = block.lower()
+        
+        if (block.isascii() and self._LINE_END_WORD not in block
+                and not any(separator in block for separator in self._STR_ONLY_SEPARATORS)):
+            return self._encode_block(block)
+        
+        lines = block.split(b'\n')
+        if not lines[-1]:
+            # The block ends with a newline: nothing follows it
+            lines.pop()
+        encode = self.vocabulary.encode_bytes
+        check = self._NEEDS_LEXER.search
+        return [self._lex(line) if check(line) else encode(line.split()) for line in lines]
+    
+    def _encode_block(self, block):
+        """
+        Encode a whole ASCII block in one pass, then cut it into lines
+        
+        Every newline becomes a LINE_END word, so one split() and one bytes()
+        fill cover the block, and the IDs split into lines at the markers.
+        """
+        words = block.replace(b'\n', b' ' + self._LINE_END_WORD + b' ').split()
+        ids = bytes(map(self._byte_ids.__getitem__, words))
+        lines = ids.split(self._LINE_END_ID)
+        if block.endswith(b'\n'):
+            # Nothing follows the last newline
+            lines.pop()
+        
+        vocabulary = self.vocabulary
+        if Vocabulary.UNKNOWN not in ids:
+            return [TokenStream(vocabulary, line) for line in lines]
+        
+        # Keep unknown words by position so errors can still quote them
+        streams = []
+        start = 0
+        for line in lines:
+            unknown = None
+            if Vocabulary.UNKNOWN in line:
+                unknown = {position: words[start + position].decode('ascii')
+                           for position, token_id in enumerate(line) if not token_id}
+            streams.append(TokenStream(vocabulary, line, unknown))
+            start += len(line) + 1
+        return streams
+    
+    def _lex(self, line):
+        """Tokenize one line with the regular Lexer"""
+        self._lexer.reset(line.decode('utf-8'))
+        return self._lexer.try_encode(self.vocabulary) or self.vocabulary.encode([])
@@ -0,0 +1,286 @@
+"""
+NumberAutomaton Module - Prebuilt recognizer for number phrases (0-9999)
+Replaces the hand-written parse_number cascade with a single table-driven walk
+"""
+
+from classes.ErrorCode import ErrorCode
+
+
+class NumberAutomaton:
+    """
+    Deterministic automaton over tokens covering every number phrase the
+    Parser accepts, including the optional internal "and" forms.
+    
+    Each state maps a token ID to an edge (next_state, multiplier, value, guarded):
+    - value edges add to the group being built ("twenty" then "three")
+    - multiplier edges fold the group into the total ("hundred", "thousand")
+    - guarded edges are the optional "and"; they are only taken when the
+      caller's guard says the "and" belongs to the number
+    
+    Tokens that make a phrase invalid (e.g. "zero hundred") are kept in a
+    separate per-state error table of ErrorCodes, so the hot path only does
+    one table lookup and errors are reported without raising. Tables are
+    built keyed by word, then frozen into tuples indexed by Vocabulary ID.
+    
+    This class builds the English grammar from its words; a language pack
+    with a differently shaped grammar subclasses it, adds its own states
+    with _add_state/_add_values and calls _freeze (see languages/zh.py).
+    """
+    
+    # Accept modes for a state the walk stops in
+    REJECT = 0      # not a complete number
+    ACCEPT = 1      # number ends here
+    GIVE_BACK = 2   # number ends *before* the thousands word (see below)
+    
+    START = 0
+    
+    # Largest value a number phrase names
+    MAX_VALUE = 9999
+    
+    def __init__(self, word_to_num, vocabulary, and_word='and', hundred_word='hundred', thousand_word='thousand'):
+        """
+        Build the transition tables from a basic-number vocabulary
+        
+        Args:
+            word_to_num: Mapping of basic number words to values (0-99);
+                values below 10 are digits, 10-19 teens, other multiples of
+                ten are tens words that can start a compound
+            vocabulary (Vocabulary): Token IDs the frozen tables are indexed by
+            and_word: Connector that may appear inside a number
+            hundred_word: Word for the hundreds multiplier
+            thousand_word: Word for the thousands multiplier
+        """
+        self.and_word = and_word
+        self.edges = []
+        self.errors = []
+        self.accept = []
+        
+        digits = {w: v for w, v in word_to_num.items() if 0 < v < 10}
+        zeros = {w: v for w, v in word_to_num.items() if v == 0}
+        teens = {w: v for w, v in word_to_num.items() if 10 <= v < 20}
+        tens = {w: v for w, v in word_to_num.items() if v >= 20}
+        ones = dict(zeros, **digits)
+        
+        hundreds_error = ErrorCode.INVALID_HUNDREDS
+        thousands_error = ErrorCode.INVALID_THOUSANDS
+        
+        start = self._add_state(self.REJECT)
+        
+        # Trailing basic number (after "hundred", or the tens/ones of a thousands number)
+        tail_unit = self._add_state(self.ACCEPT)
+        tail_tens = self._add_state(self.ACCEPT)
+        self._add_values(tail_tens, ones, tail_unit)
+        
+        def add_tail(state):
+            self._add_values(state, dict(ones, **teens), tail_unit)
+            self._add_values(state, tens, tail_tens)
+        
+        # <hundreds> [and] [<basic_number>]
+        hundred = self._add_state(self.ACCEPT)
+        hundred_and = self._add_state(self.REJECT)
+        self.edges[hundred][and_word] = (hundred_and, 0, 0, True)
+        add_tail(hundred)
+        add_tail(hundred_and)
+        
+        # <thousands> [and] [<hundreds>] [and] [<basic_number>]
+        thousand = self._add_state(self.ACCEPT)
+        thousand_and = self._add_state(self.REJECT)
+        self.edges[thousand][and_word] = (thousand_and, 0, 0, True)
+        
+        thousand_hundred = self._add_state(self.ACCEPT)
+        thousand_hundred_and = self._add_state(self.REJECT)
+        self.edges[thousand_hundred][and_word] = (thousand_hundred_and, 0, 0, True)
+        add_tail(thousand_hundred)
+        add_tail(thousand_hundred_and)
+        
+        # Basic number right after the thousands part: it is either the
+        # hundreds digit or the final tens/ones
+        k_digit = self._add_state(self.ACCEPT)
+        self.edges[k_digit][hundred_word] = (thousand_hundred, 100, 0, False)
+        k_zero = self._add_state(self.ACCEPT)
+        self.errors[k_zero][hundred_word] = ErrorCode.ZERO_HUNDRED
+        k_compound = self._add_state(self.ACCEPT)
+        self.errors[k_compound][hundred_word] = hundreds_error
+        
+        # A lone teen or tens word straight after "thousand" is not part of
+        # the number: the original parser's hundreds backtracking rewound
+        # two tokens for it, leaving "one thousand twelve" parsed as 1000
+        # with the next token being "thousand". After an internal "and" the
+        # same word is accepted ("one thousand and twelve" -> 1012).
+        for source, accept in ((thousand, self.GIVE_BACK), (thousand_and, self.ACCEPT)):
+            k_teen = self._add_state(accept)
+            self.errors[k_teen][hundred_word] = hundreds_error
+            k_tens = self._add_state(accept)
+            self.errors[k_tens][hundred_word] = hundreds_error
+            self._add_values(k_tens, ones, k_compound)
+            self._add_values(source, digits, k_digit)
+            self._add_values(source, zeros, k_zero)
+            self._add_values(source, teens, k_teen)
+            self._add_values(source, tens, k_tens)
+        
+        # Leading basic number: a plain number, or the multiplier's digit
+        lead_digit = self._add_state(self.ACCEPT)
+        self.edges[lead_digit][hundred_word] = (hundred, 100, 0, False)
+        self.edges[lead_digit][thousand_word] = (thousand, 1000, 0, False)
+        lead_zero = self._add_state(self.ACCEPT)
+        self.errors[lead_zero][hundred_word] = ErrorCode.ZERO_HUNDRED
+        self.errors[lead_zero][thousand_word] = ErrorCode.ZERO_THOUSAND
+        lead_other = self._add_state(self.ACCEPT)
+        lead_tens = self._add_state(self.ACCEPT)
+        self._add_values(lead_tens, ones, lead_other)
+        for state in (lead_other, lead_tens):
+            self.errors[state][hundred_word] = hundreds_error
+            self.errors[state][thousand_word] = thousands_error
+        
+        self._add_values(start, digits, lead_digit)
+        self._add_values(start, zeros, lead_zero)
+        self._add_values(start, teens, lead_other)
+        self._add_values(start, tens, lead_tens)
+        
+        self._freeze(vocabulary)
+    
+    def _freeze(self, vocabulary):
+        """Freeze tables for the hot path: one tuple per state, indexed by token ID"""
+        words = vocabulary.words
+        self.edges = tuple(tuple(map(edges.get, words)) for edges in self.edges)
+        self.errors = tuple(tuple(map(errors.get, words)) for errors in self.errors)
+        self.accept = tuple(self.accept)
+        # Per state: has a guarded edge, so an "and" could continue the number
+        self.continues = tuple(any(edge is not None and edge[3] for edge in edges) for edges in self.edges)
+    
+    def _add_state(self, accept):
+        """Create a new state and return its index"""
+        self.edges.append({})
+        self.errors.append({})
+        self.accept.append(accept)
+        return len(self.edges) - 1
+    
+    def _add_values(self, state, words, target):
+        """Add a value edge to target for every word in words"""
+        for word, value in words.items():
+            self.edges[state][word] = (target, 0, value, False)
+    
+    def paths(self):
+        """
+        Every token-ID path the automaton can walk from START, shortest first
+        
+        Guarded ("and") edges are followed as if the guard allowed them, so
+        every internal "and" form is included. The tables have no cycles,
+        so there is a finite number of paths (about 39000 for English).
+        
+        Yields:
+            (ids, value, accept, guarded): ids is the path as bytes; value is
+            what match() returns for the path when nothing follows it (None
+            unless accept is ACCEPT); accept is the mode of the state
+            reached; guarded is True if that state has a guarded edge, so an
+            "and" could continue the number
+        """
+        # Non-empty edges of each state, found once
+        outgoing = [[(token, edge) for token, edge in enumerate(edges) if edge is not None]
+                    for edges in self.edges]
+        level = [(b'', self.START, 0, 0)]
+        while level:
+            following = []
+            for ids, state, total, group in level:
+                if ids:
+                    accept = self.accept[state]
+                    value = total + group if accept == self.ACCEPT else None
+                    yield ids, value, accept, self.continues[state]
+                for token, (target, multiplier, value, _) in outgoing[state]:
+                    if multiplier:
+                        following.append((ids + bytes((token,)), target, total + group * multiplier, 0))
+                    else:
+                        following.append((ids + bytes((token,)), target, total, group + value))
+            level = following
+    
+    def phrase_value(self, ids):
+        """
+        Value of token IDs that are exactly one number phrase without an "and"
+        
+        For callers that cut an expression at its "and" tokens themselves
+        (see CompiledExpression). Such a piece is only an operand as it
+        stands if it isn't followed by an "and" the guard could take into
+        the number, so whether it could be continued is returned too.
+        
+        Args:
+            ids: The phrase's Vocabulary IDs
+        
+        Returns:
+            (value, continues): continues is True if the phrase ends where
+            an "and" could extend it ("one hundred"); (None, False) if the
+            IDs are not a whole number phrase on their own
+        """
+        edges = self.edges
+        state = self.START
+        total = 0
+        group = 0
+        for token in ids:
+            edge = edges[state][token]
+            if edge is None or edge[3]:
+                return None, False
+            state, multiplier, value, _ = edge
+            if multiplier:
+                total += group * multiplier
+                group = 0
+            else:
+                group += value
+        if not ids or self.accept[state] != self.ACCEPT:
+            return None, False
+        return total + group, self.continues[state]
+    
+    def match(self, tokens, ids, start, guard=None, stats=None):
+        """
+        Walk the automaton from tokens[start] and return the number found
+        
+        Args:
+            tokens: Token strings (only read for the error detail)
+            ids: The tokens' Vocabulary IDs
+            start: Index of the first token of the number
+            guard: Callable taking the index of an "and" token and returning
+                True if it belongs to the number; None rejects every "and"
+            stats (dict, optional): Counter dict; 'give_backs' is incremented
+                when the match ends before a "thousand" (see GIVE_BACK)
+        
+        Returns:
+            (value, end) where end is the index just past the number, or
+            (None, (code, detail, position)) with an ErrorCode if no number
+            starts at tokens[start] or a multiplier is misused (e.g. "twelve
+            hundred"); position is the index of the token the walk failed
+            on, len(ids) if it ran out of tokens
+        """
+        edges = self.edges
+        state = self.START
+        total = 0
+        group = 0
+        pos = start
+        n = len(ids)
+        
+        while pos < n:
+            token = ids[pos]
+            edge = edges[state][token]
+            if edge is None:
+                code = self.errors[state][token]
+                if code is not None:
+                    return None, (code, group, pos)
+                break
+            
+            if edge[3] and (guard is None or not guard(pos)):
+                # The "and" is the expression separator, not part of the number
+                break
+            
+            state, multiplier, value, _ = edge
+            if multiplier:
+                total += group * multiplier
+                group = 0
+            else:
+                group += value
+            pos += 1
+        
+        accept = self.accept[state]
+        if accept == self.ACCEPT:
+            return total + group, pos
+        if accept == self.GIVE_BACK:
+            if stats is not None:
+                stats['give_backs'] += 1
+            return total, pos - 2
+        return None, (ErrorCode.EXPECTED_NUMBER, tokens[start] if start < n else None, pos)
@@ -0,0 +1,131 @@
+"""
+NumberWords Module - Integer to words codec for any size of integer
+Converts three digits at a time using precomputed words for every 0-999 group
+"""
+
+
+class NumberWords:
+    """
+    Integer-to-words converter built on precomputed group tables
+    
+    Every group from 0 to 999 is spelled out once, so converting a number
+    means splitting it into 3-digit groups, looking each one up and adding
+    its scale word. The cost grows with the number of groups, not the value.
+    Numbers at or above a thousand decillion repeat the largest scale
+    ("one thousand decillion").
+    """
+    
+    ONES = ('', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine',
+            'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen',
+            'seventeen', 'eighteen', 'nineteen')
+    TENS = ('', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety')
+    
+    # Scale word for each 3-digit group, lowest group first
+    SCALES = ('', 'thousand', 'million', 'billion', 'trillion', 'quadrillion', 'quintillion',
+              'sextillion', 'septillion', 'octillion', 'nonillion', 'decillion')
+    
+    NEGATIVE = 'negative'
+    ZERO = 'zero'
+    HUNDRED = 'hundred'
+    
+    def __init__(self, ones=None, tens=None, scales=None, hundred=None, negative=None, zero=None):
+        """
+        Args:
+            ones: Words for 0-19 ('' for 0); defaults to ONES (English)
+            tens: Words for 0, 10, ..., 90 (only 20-90 are used); defaults to TENS
+            scales: Scale word per 3-digit group, lowest first; defaults to SCALES
+            hundred: Hundreds word; defaults to HUNDRED
+            negative: Prefix for negative numbers; defaults to NEGATIVE
+            zero: Word for 0; defaults to ZERO
+        """
+        self.ones = ones or self.ONES
+        self.tens = tens or self.TENS
+        self.scales = scales or self.SCALES
+        self.negative = negative or self.NEGATIVE
+        self.zero = zero or self.ZERO
+        hundred = hundred or self.HUNDRED
+        
+        below_hundred = list(self.ones)
+        for tens in range(2, 10):
+            below_hundred.append(self.tens[tens])
+            below_hundred.extend(f"{self.tens[tens]} {one}" for one in self.ones[1:10])
+        
+        # Words for every group 0-999 ('' for 0, which is never spoken in a group)
+        groups = list(below_hundred)
+        for hundreds in range(1, 10):
+            prefix = f"{self.ones[hundreds]} {hundred}"
+            groups.append(prefix)
+            groups.extend(f"{prefix} {words}" for words in below_hundred[1:])
+        self.groups = tuple(groups)
+        
+        # Group words with their scale already attached, per scale; built by
+        # _build_scaled the first time a number above 999 is converted
+        self._scaled = None
+        self._largest_scale = 1000 ** (len(self.scales) - 1)
+        self._limit = self._largest_scale * 1000
+    
+    def to_words(self, num):
+        """
+        Convert an integer to words
+        
+        Args:
+            num (int): Any integer
+        
+        Returns:
+            str: e.g. "eighty one million", "negative twelve", "zero"
+        """
+        if num < 0:
+            return f"{self.negative} {self.to_words(-num)}"
+        if num < 1000:
+            return self.groups[num] or self.zero
+        if num < 1000000:
+            high, low = divmod(num, 1000)
+            words = (self._scaled or self._build_scaled())[1][high]
+            return f"{words} {self.groups[low]}" if low else words
+        if num >= self._limit:
+            # Beyond the scale table: spell the high part before the largest scale
+            high, low = divmod(num, self._largest_scale)
+            words = f"{self.to_words(high)} {self.scales[-1]}"
+            return f"{words} {self._groups_to_words(low)}" if low else words
+        return self._groups_to_words(num)
+    
+    def to_words_many(self, numbers):
+        """
+        Convert many integers to words
+        
+        Args:
+            numbers: Iterable of integers
+        
+        Returns:
+            list[str]: Words for each number, in order
+        """
+        to_words = self.to_words
+        return [to_words(num) for num in numbers]
+    
+    def _groups_to_words(self, num):
+        """
+        Words for 0 < num < 1000 ** len(scales), highest group first
+        """
+        parts = []
+        scaled = self._scaled or self._build_scaled()
+        scale = 0
+        while num:
+            num, group = divmod(num, 1000)
+            if group:
+                parts.append(scaled[scale][group])
+            scale += 1
+        parts.reverse()
+        return ' '.join(parts)
+    
+    def _build_scaled(self):
+        """
+        Build the per-scale group tables on first use
+        
+        Deferred because most processes never convert a number above 999
+        (and one-shot runs pay for every table at startup). Threads that
+        race here build identical tables, so whichever is kept is correct.
+        """
+        self._scaled = tuple(
+            tuple(f"{words} {scale}" if words and scale else words for words in self.groups)
+            for scale in self.scales)
+        return self._scaled
@@ -1,39 +1,88 @@
 """
 Parser Module - Enhanced with Hundreds and Thousands Support
 Validates syntax according to BNF grammar and converts words to numbers (0-9999)
+Expressions may have more than two operands and chain further steps with "then"
 """
 
 from classes.WordCalcError import WordCalcError
+from classes.ErrorCode import ErrorCode
+from classes.LanguagePack import LanguagePack
+from classes.Vocabulary import Vocabulary, TokenStream
 
 class Parser:
+
+    # The default language; any other pack is passed to __init__ (see LanguagePack)
+    LANGUAGE = LanguagePack.get()
     
     # Word to number mappings for basic numbers (0-99)
-    WORD_TO_NUM = {
-        # Digits (0-9)
-        'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4,
-        'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9,
-        # Teens (10-19)
-        'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
-        'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
-        # Tens (20, 30, 40, ...)
-        'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
-        'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90
-    }
+    WORD_TO_NUM = LANGUAGE.word_to_num
     
-    OPERATIONS = {'add', 'subtract', 'multiply', 'divide'}
+    OPERATIONS = set(LANGUAGE.operations)
     
     # Multiplier keywords
-    MULTIPLIERS = {
-        'hundred': 100,
-        'thousand': 1000
-    }
+    MULTIPLIERS = LANGUAGE.multipliers
+    
+    # Tens words - the only words that can start a compound ("twenty three")
+    TENS_WORDS = frozenset(word for word, value in WORD_TO_NUM.items() if value >= 20 and value % 10 == 0)
+    
+    # Token IDs for every word above, with per-ID attributes the parser branches on
+    VOCABULARY = LANGUAGE.vocabulary
     
-    def __init__(self, tokens):
+    # Prebuilt recognizer for every number phrase (0-9999), built once from WORD_TO_NUM
+    NUMBER_AUTOMATON = LANGUAGE.automaton
+    
+    def __init__(self, tokens, language=None):
+        """
+        Args:
+            tokens: List of tokens produced by the Lexer, or a TokenStream
+            language (LanguagePack, optional): Language other than the
+                default; its tables shadow the class tables on this instance
+        """
+        if language is not None:
+            self.LANGUAGE = language
+            self.VOCABULARY = language.vocabulary
+            self.NUMBER_AUTOMATON = language.automaton
+        # Optional counter dict for instrumentation (see Instrumentation.PARSER_COUNTERS)
+        self.stats = None
+        self.reset(tokens)
+    
+    def reset(self, tokens, ids=None):
+        """
+        Load a new token list and clear all per-parse state
+        
+        Lets one Parser instance be reused across many expressions
+        instead of allocating a new one for each. All per-parse state is
+        on the instance and the class tables are read-only, so an instance
+        is the context of one parse at a time: threads each use their own
+        (WordCalc hands them out from a pool).
+        
+        Args:
+            tokens: List of tokens produced by the Lexer, or a TokenStream
+            ids (optional): The tokens' VOCABULARY IDs, if the caller keeps
+                them already (see IncrementalSession)
+        """
         self.tokens = tokens
+        # Token IDs (bytes-like, one per token) the parser branches on; token
+        # strings are only read for error details
+        if ids is not None:
+            self.ids = ids
+        elif isinstance(tokens, TokenStream):
+            self.ids = tokens.ids
+        else:
+            self.ids = bytes(map(self.VOCABULARY.ids.__getitem__, tokens))
         self.position = 0
+        # (ErrorCode, detail) of the last failed parse step, or None
+        self.error = None
+        # Index of the token that step failed on (len(ids) if the tokens ran out)
+        self.error_position = None
+        # Position of the first step's last 'and', found lazily on first use
+        self._last_and = None
         self.operation = None
         self.num1 = None
         self.num2 = None
+        # All operands of the first step, and (operation, operands) per "then" step
+        self.operands = ()
+        self.chain = ()
     
     def current_token(self):
         """Get current token without consuming it"""
@@ -54,45 +103,36 @@ class Parser:
             return self.tokens[pos]
         return None
     
-    def count_remaining_ands(self):
-        """Count how many 'and' tokens remain from current position"""
-        count = 0
-        for i in range(self.position, len(self.tokens)):
-            if self.tokens[i] == 'and':
-                count += 1
-        return count
+    def _and_follows(self, position):
+        """
+        Is there another 'and' after position, before any "then"?
+        
+        The first number may only keep an internal 'and' if one is left to
+        separate it from the second operand. The first step's last 'and' is
+        found once per parse, so each check is a comparison and parsing
+        stays linear however many operands there are.
+        """
+        if self._last_and is None:
+            ids = self.ids
+            end = ids.find(self.VOCABULARY.then_id, position)
+            self._last_and = ids.rfind(self.VOCABULARY.and_id, position, len(ids) if end < 0 else end)
+        return position < self._last_and
     
     def parse_operation(self):
         """Parse the operation token"""
-        token = self.consume_token()
-        if token not in self.OPERATIONS:
-            raise WordCalcError(f"Invalid operation: '{token}'. Expected: add, subtract, multiply, or divide")
-        self.operation = token
+        if not self._parse_operation():
+            raise WordCalcError.from_code(*self.error)
     
-    def parse_basic_number(self):
-        """
-        Parse a basic number (0-99)
-        Handles: digit, teen, tens, compound
-        """
-        token = self.current_token()
-        
-        if token is None or token not in self.WORD_TO_NUM:
-            return None
-        
-        # Consume the token
-        self.consume_token()
-        base_value = self.WORD_TO_NUM[token]
-        
-        # Check for compound number (e.g., "twenty three")
-        # Only tens can form compounds
-        if token in ['twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']:
-            next_token = self.current_token()
-            if next_token and next_token in self.WORD_TO_NUM and self.WORD_TO_NUM[next_token] < 10:
-                # It's a compound number
-                self.consume_token()
-                return base_value + self.WORD_TO_NUM[next_token]
-        
-        return base_value
+    def _parse_operation(self):
+        """Parse the operation token, recording an error instead of raising"""
+        position = self.position
+        self.position += 1
+        if position >= len(self.ids) or not self.VOCABULARY.is_operation[self.ids[position]]:
+            self.error = (ErrorCode.INVALID_OPERATION, self.tokens[position] if position < len(self.ids) else None)
+            self.error_position = position
+            return False
+        self.operation = self.VOCABULARY.operation[self.ids[position]]
+        return True
     
     def parse_number(self, is_first_number=True):
         """
@@ -108,85 +148,60 @@ class Parser:
         Note: Handles optional "and" within numbers
         Uses 'and' counting: if 2+ 'and's remain, one can be used within number
         
+        The whole phrase is recognized in one walk over NUMBER_AUTOMATON;
+        _is_and_within_number is only consulted when the walk reaches an "and".
+        
         Args:
             is_first_number: True if parsing first operand, False if second
         """
-        total = 0
-        
-        # Try to parse basic number first (might be part of thousands/hundreds)
-        base = self.parse_basic_number()
-        
-        if base is None:
-            raise WordCalcError(f"Expected a number but got '{self.current_token()}'")
-        
-        # Check if next token is a multiplier (thousand or hundred)
-        next_token = self.current_token()
-        
-        # Handle THOUSANDS
-        if next_token == 'thousand':
-            if base == 0:
-                raise WordCalcError("Cannot have 'zero thousand'")
-            if base > 9:
-                raise WordCalcError(f"Invalid thousands value: '{base}'. Must be 1-9")
-            
-            self.consume_token()  # consume 'thousand'
-            total = base * 1000
-            
-            # Check for optional "and" - use helper to determine if it's within number
-            if self.current_token() == 'and' and self._is_and_within_number(is_first_number):
-                self.consume_token()
-            
-            # Try to parse hundreds part
-            hundreds_part = self.parse_hundreds_part()
-            total += hundreds_part
-            
-            # Check for optional "and" again before tens/ones
-            if self.current_token() == 'and' and self._is_and_within_number(is_first_number):
-                self.consume_token()
-            
-            # Try to parse basic number (tens/ones)
-            basic_part = self.parse_basic_number()
-            if basic_part is not None:
-                total += basic_part
-        
-        # Handle HUNDREDS (without thousands)
-        elif next_token == 'hundred':
-            if base == 0:
-                raise WordCalcError("Cannot have 'zero hundred'")
-            if base > 9:
-                raise WordCalcError(f"Invalid hundreds value: '{base}'. Must be 1-9")
-            
-            self.consume_token()  # consume 'hundred'
-            total = base * 100
-            
-            # Check for optional "and" - use helper to determine if it's within number
-            if self.current_token() == 'and' and self._is_and_within_number(is_first_number):
-                self.consume_token()
-            
-            # Try to parse basic number (tens/ones)
-            basic_part = self.parse_basic_number()
-            if basic_part is not None:
-                total += basic_part
-        
-        # Just a basic number (0-99)
-        else:
-            total = base
-        
-        # Validate range
-        if total > 9999:
-            raise WordCalcError(f"Number too large: {total}. Maximum is 9999")
+        total = self._parse_number(is_first_number)
+        if total is None:
+            raise WordCalcError.from_code(*self.error)
+        return total
+    
+    def _parse_number(self, is_first_number=True):
+        """Parse a complete number, returning None and recording an error on failure"""
+        guard = self._and_guard_first if is_first_number else self._and_guard_second
+        total, end = self.NUMBER_AUTOMATON.match(self.tokens, self.ids, self.position, guard, self.stats)
+        
+        if total is None:
+            code, detail, self.error_position = end
+            self.error = (code, detail)
+            return None
         
+        self.position = end
         return total
     
+    def _and_guard_first(self, position):
+        """Automaton guard: is the "and" at position inside the first number?"""
+        self.position = position
+        if self.stats is not None:
+            return self._count_and_check(self._is_and_within_number(is_first_number=True))
+        return self._is_and_within_number(is_first_number=True)
+    
+    def _and_guard_second(self, position):
+        """Automaton guard: is the "and" at position inside the second number?"""
+        self.position = position
+        if self.stats is not None:
+            return self._count_and_check(self._is_and_within_number(is_first_number=False))
+        return self._is_and_within_number(is_first_number=False)
+    
+    def _count_and_check(self, within):
+        """Record one 'and' decision in the instrumentation counters"""
+        self.stats['and_checks'] += 1
+        if within:
+            self.stats['and_within'] += 1
+        return within
+    
     def _is_and_within_number(self, is_first_number=True):
         """
         Helper: Determine if current "and" is within a number or is expression separator
         
-        KEY LOGIC: Count remaining 'and' tokens
+        KEY LOGIC: Is another 'and' left in this step?
         - If parsing FIRST number:
           - Need at least 2 'and's (one for number, one for separator)
-          - If only 1 'and' remains: must be expression separator
-        - If parsing SECOND number:
+          - If no 'and' follows this one: must be expression separator
+        - If parsing any later number (SECOND, further operands, "then" steps):
           - Any 'and' can be within the number (no separator needed after)
         
         Returns True if "and" should be consumed as part of current number
@@ -195,57 +210,55 @@ class Parser:
         Args:
             is_first_number: True if parsing first operand, False if second
         """
-        # Count how many 'and' tokens remain from current position
-        remaining_ands = self.count_remaining_ands()
+        vocabulary = self.VOCABULARY
+        ids = self.ids
+        n = len(ids)
+        position = self.position
+        # IDs of the next two tokens (UNKNOWN past the end, which has no attribute set)
+        next_id = ids[position + 1] if position + 1 < n else Vocabulary.UNKNOWN
+        following_id = ids[position + 2] if position + 2 < n else Vocabulary.UNKNOWN
         
         # If parsing SECOND number, we don't need to reserve an 'and' for separator
         # So any 'and' we encounter can be consumed as part of the number
         if not is_first_number:
             # Still check if it looks like a valid internal 'and'
-            next_token = self.peek_token(1)
-            if next_token is None or next_token not in self.WORD_TO_NUM:
+            if not vocabulary.is_number[next_id]:
                 return False
             
             # Check if pattern indicates new number (shouldn't happen in second number)
-            following_token = self.peek_token(2)
-            if following_token in ['hundred', 'thousand']:
+            if vocabulary.is_multiplier[following_id]:
                 return False
             
             # Otherwise, consume it as part of the number
             return True
         
-        # If parsing FIRST number and only 1 'and' remains,
+        # If parsing FIRST number and no other 'and' follows,
         # it MUST be the expression separator
-        if remaining_ands <= 1:
+        if not self._and_follows(position):
             return False
         
         # If 2+ 'and's remain, check if this one should be within the number
         # Look at what comes after "and"
-        next_token = self.peek_token(1)
-        
-        if next_token is None or next_token not in self.WORD_TO_NUM:
+        if not vocabulary.is_number[next_id]:
             # Nothing valid after "and", so it's not within our number
             return False
         
         # Check if the pattern is "and [number] [hundred|thousand]"
         # This would indicate a NEW number component (even with multiple 'and's)
-        following_token = self.peek_token(2)
-        
-        if following_token in ['hundred', 'thousand']:
+        if vocabulary.is_multiplier[following_id]:
             # Pattern: "and five hundred" or "and two thousand"
             # This "and" starts a new number, NOT part of current number
             return False
         
         # Check for compound numbers: "and twenty three" where "twenty" is at peek(1)
-        if next_token in ['twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']:
+        if vocabulary.is_tens[next_id]:
             # Could be compound, check if followed by single digit
-            if following_token in self.WORD_TO_NUM and self.WORD_TO_NUM.get(following_token, 100) < 10:
+            if vocabulary.is_unit[following_id]:
                 # It's a compound within our number: "and twenty three"
                 return True
             # Just tens: "and twenty" (not followed by digit)
             # Check if there's a third token that could be hundred/thousand
-            third_token = self.peek_token(3)
-            if third_token in ['hundred', 'thousand']:
+            if position + 3 < n and vocabulary.is_multiplier[ids[position + 3]]:
                 # "and twenty hundred" would be invalid, but let's be safe
                 return False
         
@@ -254,40 +267,11 @@ class Parser:
         # Examples: "and five", "and thirty", "and twelve"
         return True
     
-    def parse_hundreds_part(self):
-        """
-        Parse the hundreds component (if present)
-        Returns 0 if no hundreds found
-        """
-        base = self.parse_basic_number()
-        
-        if base is None:
-            return 0
-        
-        if self.current_token() == 'hundred':
-            if base == 0:
-                raise WordCalcError("Cannot have 'zero hundred'")
-            if base > 9:
-                raise WordCalcError(f"Invalid hundreds value: '{base}'. Must be 1-9")
-            
-            self.consume_token()  # consume 'hundred'
-            return base * 100
-        else:
-            # Put the number back - it's not a hundreds component
-            # We need to backtrack
-            # Since we consumed tokens, we decrement position
-            if base < 10:
-                self.position -= 1
-            else:
-                # Compound number (e.g., "twenty three")
-                self.position -= 2
-            return 0
-    
     def parse(self):
         """
         Parse the entire expression according to BNF grammar
         
-        FIXED: Now handles "and" ambiguity by counting remaining 'and' tokens
+        FIXED: Now handles "and" ambiguity by checking for a later 'and'
         
         Examples:
         - "add one hundred and thirty and twenty"
@@ -301,27 +285,121 @@ class Parser:
         - "add fifty and one hundred and five"
           → 2 'and's: first is separator, second within second number
           → Result: 50 + 105
+        
+        - "add one and two and three then multiply by four"
+          → Result: ('add', 1, 2, 3), with self.chain == (('multiply', (4,)),)
+        
+        Returns:
+            (operation, num1, num2, ...): The first step's operation and
+            operands; chained steps are left in self.chain
+        """
+        parsed = self.try_parse()
+        if parsed is None:
+            raise WordCalcError.from_code(*self.error)
+        return parsed
+    
+    def try_parse(self):
+        """
+        Parse the entire expression without raising
+        
+        Returns:
+            (operation, num1, num2, ...) as for parse(), or None with
+            self.error set to an (ErrorCode, detail) pair and
+            self.error_position to the index of the token it failed on
+            (len(ids) when the input ends before the expression does)
         """
-        # <expression> ::= <operation> <number> "and" <number>
+        # <expression> ::= <operation> <number> "and" <number> {"and" <number>} {<step>}
+        # <step> ::= "then" <operation> ["by"] <number> {"and" <number>}
         
         # Parse operation
-        self.parse_operation()
+        if not self._parse_operation():
+            return None
         
         # Parse first number (may consume internal "and" tokens if 2+ exist)
-        self.num1 = self.parse_number(is_first_number=True)
+        self.num1 = self._parse_number(is_first_number=True)
+        if self.num1 is None:
+            return None
         
         # Now expect "and" as the expression separator
         # This is the "and" between the two operands
-        and_token = self.consume_token()
-        if and_token != 'and':
-            raise WordCalcError(f"Expected 'and' between numbers but got '{and_token}'")
+        position = self.position
+        self.position += 1
+        if position >= len(self.ids) or self.ids[position] != self.VOCABULARY.and_id:
+            self.error = (ErrorCode.EXPECTED_AND, self.tokens[position] if position < len(self.ids) else None)
+            self.error_position = position
+            return None
         
         # Parse second number (can consume any "and" tokens within it)
-        self.num2 = self.parse_number(is_first_number=False)
+        self.num2 = self._parse_number(is_first_number=False)
+        if self.num2 is None:
+            return None
+        
+        ids = self.ids
+        if self.position == len(ids):
+            self.operands = (self.num1, self.num2)
+            return self.operation, self.num1, self.num2
+        
+        # Further operands, each after another separating "and"
+        operands = [self.num1, self.num2]
+        if not self._parse_more_operands(operands):
+            return None
+        self.operands = tuple(operands)
+        
+        # Chained steps apply to the value so far
+        chain = []
+        then_id = self.VOCABULARY.then_id
+        while self.position < len(ids) and ids[self.position] == then_id:
+            step = self._parse_step()
+            if step is None:
+                return None
+            chain.append(step)
+        self.chain = tuple(chain)
         
         # Check for extra tokens
-        if self.position < len(self.tokens):
-            extra = ' '.join(self.tokens[self.position:])
-            raise WordCalcError(f"Unexpected tokens at end: '{extra}'")
+        if self.position < len(ids):
+            self.error = (ErrorCode.UNEXPECTED_TOKENS, ' '.join(self.tokens[self.position:]))
+            self.error_position = self.position
+            return None
         
-        return self.operation, self.num1, self.num2
\ No newline at end of file
+        return (self.operation, *self.operands)
+    
+    def _parse_more_operands(self, operands):
+        """Append a number to operands for every separating "and" that follows"""
+        ids = self.ids
+        and_id = self.VOCABULARY.and_id
+        while self.position < len(ids) and ids[self.position] == and_id:
+            self.position += 1
+            number = self._parse_number(is_first_number=False)
+            if number is None:
+                return False
+            operands.append(number)
+        return True
+    
+    def _parse_step(self):
+        """
+        Parse "then" <operation> ["by"] <number> {"and" <number>}
+        
+        Returns:
+            (operation, operands), or None with self.error set
+        """
+        vocabulary = self.VOCABULARY
+        ids = self.ids
+        position = self.position + 1
+        if position >= len(ids) or not vocabulary.is_operation[ids[position]]:
+            self.error = (ErrorCode.INVALID_OPERATION, self.tokens[position] if position < len(ids) else None)
+            self.error_position = position
+            return None
+        operation = vocabulary.operation[ids[position]]
+        position += 1
+        if position < len(ids) and ids[position] == vocabulary.by_id:
+            position += 1
+        self.position = position
+        
+        # The value so far is the first operand, so one number is enough
+        number = self._parse_number(is_first_number=False)
+        if number is None:
+            return None
+        operands = [number]
+        if not self._parse_more_operands(operands):
+            return None
+        return operation, tuple(operands)
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""
+PersistentCache Module - SQLite-backed result cache shared between processes
+Survives restarts: the most used entries are preloaded into an in-memory LRU at startup
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from classes.ErrorCode import ErrorCode
+from classes.Result import Result
+from classes.ResultCache import ResultCache
+
+
+class PersistentCache:
+    """
+    Two-level result cache: a ResultCache in memory over a SQLite file
+    
+    Drop-in for ResultCache in WordCalc (same get/put/info). A memory miss
+    is looked up on disk before the expression is evaluated, and new
+    results are written to disk as well as memory.
+    
+    - Entries are keyed on the normalized tokens joined by spaces, so any
+      process using the file shares them, whichever lexer produced them.
+    - Each entry also belongs to a namespace naming the settings its result
+      depends on (WordCalc uses the language and the spelling correction
+      distance). A cache only reads and preloads its own namespace, so
+      calculators with different settings can share a file safely.
+    - The file records FORMAT_VERSION; a file written with another version
+      is refused rather than read, since its rows may not mean the same.
+    - The file is in WAL mode: readers never block, and concurrent
+      writers wait up to timeout seconds for each other.
+    - Every hit, in memory or on disk, counts towards an entry's use
+      count. When the file holds more than max_entries, the least used
+      (then least recently used) entries are deleted.
+    - On open, the most used entries fill the memory layer, so a fresh
+      process starts warm. Preloaded keys are token tuples, the keys of
+      evaluate() and friends; TokenStream lookups (MappedLexer) find the
+      same entries on disk on first use.
+    - Writes and use counts are buffered and written in one transaction
+      per flush_every new entries, by the first hit flush_interval seconds
+      after the last write, and by flush()/close(). A warm process that
+      mostly hits so still records its use counts as it goes.
+    - Hits are counted without taking the lock. A hit in one thread that
+      races another thread's hit or flush can go uncounted; use counts
+      only rank entries, so that is harmless.
+    """
+    
+    # Version of the file layout and of how rows map to Results; a change
+    # to either (or to what a result can be for the same tokens) bumps it
+    FORMAT_VERSION = 2
+    
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS results ("
+        " namespace TEXT NOT NULL, key TEXT NOT NULL, operation TEXT, operands TEXT, value, words TEXT,"
+        " error_code INTEGER, error_detail, corrections TEXT, chain TEXT,"
+        " hits INTEGER NOT NULL, used REAL NOT NULL, PRIMARY KEY (namespace, key)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS results_by_use ON results (hits, used)",
+    )
+    _COLUMNS = "key, operation, operands, value, words, error_code, error_detail, corrections, chain"
+    _UPSERT = (
+        "INSERT INTO results (namespace, key, operation, operands, value, words, error_code, error_detail,"
+        " corrections, chain, hits, used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT (namespace, key) DO UPDATE SET"
+        " hits = hits + excluded.hits, used = excluded.used, words = coalesce(words, excluded.words)"
+    )
+    # Results whose value SQLite can't store as an integer stay in memory only
+    _MAX_VALUE = (1 << 63) - 1
+    
+    def __init__(self, path, namespace='', memory_size=10000, max_entries=1000000, flush_every=1000,
+                 flush_interval=10.0, timeout=30.0):
+        """
+        Args:
+            path (str): SQLite database file (created if missing)
+            namespace (str): Settings the cached results depend on; only
+                entries stored under the same namespace are used
+            memory_size (int): Entries kept in the in-memory LRU layer
+            max_entries (int): Entries kept in the file
+            flush_every (int): New entries buffered before a write transaction
+            flush_interval (float): Seconds after a write before a hit
+                writes out the use counts buffered since
+            timeout (float): Seconds to wait for another process's write lock
+        
+        Raises:
+            ValueError: If a size is not positive, or the file was written
+                with another FORMAT_VERSION (or isn't a cache file)
+        """
+        if max_entries <= 0:
+            raise ValueError(f"Persistent cache size must be positive, got {max_entries}")
+        if flush_every <= 0:
+            raise ValueError(f"Flush interval must be positive, got {flush_every}")
+        self.path = path
+        self.namespace = namespace
+        self.memory = ResultCache(memory_size)
+        self.maxsize = memory_size
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.disk_hits = 0
+        self.disk_evictions = 0
+        # Explicit transactions only (isolation_level=None); the lock serializes threads
+        self._db = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with self._transaction():
+                self._check_version()
+                for statement in self._SCHEMA:
+                    self._db.execute(statement)
+        except ValueError:
+            self._db.close()
+            raise
+        # Key -> row to write; key -> uses not yet written
+        self._pending = {}
+        self._hits = {}
+        self._flush_due = time.monotonic() + flush_interval
+        self.preload()
+    
+    def get(self, key):
+        """
+        Look up a key in memory, then on disk
+        
+        Args:
+            key: Token tuple or TokenStream
+        
+        Returns:
+            The cached Result, or None if neither level has it
+        """
+        result = self.memory.get(key)
+        if result is None:
+            with self._lock:
+                row = self._db.execute(
+                    f"SELECT {self._COLUMNS} FROM results WHERE namespace = ? AND key = ?",
+                    (self.namespace, ' '.join(key))).fetchone()
+                if row is None:
+                    return None
+                self.disk_hits += 1
+            result = self._result(row)
+            self.memory.put(key, result)
+        # Counted without the lock (see flush)
+        hits = self._hits
+        hits[key] = hits.get(key, 0) + 1
+        if time.monotonic() >= self._flush_due:
+            self.flush()
+        return result
+    
+    def put(self, key, result):
+        """Store a result in memory and queue it for the disk"""
+        self.memory.put(key, result)
+        row = self._row(' '.join(key), result)
+        if row is None:
+            return
+        with self._lock:
+            self._pending[row[0]] = row
+            full = len(self._pending) >= self.flush_every
+        if full:
+            self.flush()
+    
+    def preload(self, limit=None):
+        """
+        Fill the memory layer with the most used entries on disk
+        
+        Args:
+            limit (int, optional): Entries to load; defaults to the memory size
+        
+        Returns:
+            int: Entries loaded
+        """
+        limit = self.maxsize if limit is None else limit
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {self._COLUMNS} FROM results WHERE namespace = ?"
+                " ORDER BY hits DESC, used DESC LIMIT ?", (self.namespace, limit)).fetchall()
+        # Least used first, so the hottest end up most recently used
+        self.memory.load([(tuple(row[0].split(' ')), self._result(row)) for row in reversed(rows)])
+        return len(rows)
+    
+    def flush(self):
+        """Write buffered entries and use counts, then evict past max_entries"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            # A get() still holding the old dict may count a hit in it
+            # after this; that hit is lost
+            counts, self._hits = self._hits, {}
+            self._flush_due = time.monotonic() + self.flush_interval
+            if not pending and not counts:
+                return
+            # Tuples and TokenStreams of the same tokens share a row
+            hits = {}
+            for key, count in counts.items():
+                text = ' '.join(key)
+                hits[text] = hits.get(text, 0) + count
+            now = time.time()
+            with self._transaction():
+                # A new entry's first use is the evaluation that produced it
+                namespace = self.namespace
+                self._db.executemany(self._UPSERT, [
+                    (namespace, *row, hits.pop(row[0], 0) + 1, now) for row in pending.values()])
+                self._db.executemany(
+                    "UPDATE results SET hits = hits + ?, used = ? WHERE namespace = ? AND key = ?",
+                    [(count, now, namespace, key) for key, count in hits.items()])
+                # Only new entries can take the file past max_entries
+                if pending:
+                    self._evict()
+    
+    def close(self):
+        """Flush and close the database file"""
+        self.flush()
+        with self._lock:
+            self._db.close()
+    
+    def clear(self):
+        """Drop every entry of this namespace, in memory and on disk"""
+        with self._lock:
+            self._pending.clear()
+            self._hits = {}
+            with self._transaction():
+                self._db.execute("DELETE FROM results WHERE namespace = ?", (self.namespace,))
+        self.memory.clear()
+    
+    def info(self):
+        """Return the memory layer's CacheInfo (a disk hit counts as a memory miss)"""
+        return self.memory.info()
+    
+    def __len__(self):
+        """Entries of this namespace in the file (not counting any not flushed yet)"""
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM results WHERE namespace = ?",
+                                    (self.namespace,)).fetchone()[0]
+    
+    @contextmanager
+    def _transaction(self):
+        """
+        Write transaction, rolled back if the block raises
+        
+        BEGIN IMMEDIATE takes the write lock up front, so two processes
+        never both read and then fail to upgrade to a write.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+    
+    def _evict(self):
+        """Delete the least used entries past max_entries (inside a transaction)"""
+        excess = self._db.execute("SELECT count(*) FROM results").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE (namespace, key) IN"
+                " (SELECT namespace, key FROM results ORDER BY hits, used LIMIT ?)", (excess,))
+            self.disk_evictions += excess
+    
+    def _check_version(self):
+        """
+        Stamp a new file with FORMAT_VERSION, or check an existing file's
+        
+        Raises:
+            ValueError: If the file has results but no version, or another one
+        """
+        db = self._db
+        tables = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        version = None
+        if 'meta' in tables:
+            row = db.execute("SELECT value FROM meta WHERE name = 'format_version'").fetchone()
+            version = row and int(row[0])
+        elif 'results' not in tables:
+            db.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            db.execute("INSERT INTO meta VALUES ('format_version', ?)", (str(self.FORMAT_VERSION),))
+            return
+        if version != self.FORMAT_VERSION:
+            written = f"format {version}" if version is not None else "an unversioned format"
+            raise ValueError(f"Cache file '{self.path}' was written in {written}, this is format "
+                             f"{self.FORMAT_VERSION}: delete it or use another path")
+    
+    def _row(self, key, result):
+        """Database row for a result (without use columns), or None if it isn't stored"""
+        if result.error_code == ErrorCode.UNEXPECTED:
+            # Exceptions are neither reproducible from the tokens nor storable
+            return None
+        if result.value is not None and abs(result.value) > self._MAX_VALUE:
+            return None
+        corrections = ' '.join(word for pair in result.corrections for word in pair)
+        # "then" steps as "operation operand...", separated by commas
+        chain = ','.join(' '.join((operation, *map(str, operands))) for operation, operands in result.chain)
+        return (key, result.operation, ' '.join(map(str, result.operands)), result.value,
+                result.words, result.error_code, result.error_detail, corrections or None, chain or None)
+    
+    def _result(self, row):
+        """Result from a database row"""
+        _, operation, operands, value, words, error_code, error_detail, corrections, chain = row
+        operands = tuple(map(int, operands.split())) if operands else ()
+        result = Result(operation, operands, value, words, error_code, error_detail)
+        if corrections:
+            words = corrections.split(' ')
+            result.corrections = tuple(zip(words[::2], words[1::2]))
+        if chain:
+            steps = [step.split(' ') for step in chain.split(',')]
+            result.chain = tuple((step[0], tuple(map(int, step[1:]))) for step in steps)
+        return result
+
@@ -0,0 +1,131 @@
+"""
+PhraseParser Module - Parser engine that looks whole number phrases up in a table
+Resolves the common expression shapes with dict lookups and falls back to Parser for the rest
+"""
+
+import threading
+
+from classes.Parser import Parser
+
+
+class PhraseParser(Parser):
+    """
+    Drop-in Parser (WordCalc engine 'phrase') for expressions without "then"
+    
+    Every path through the number automaton is listed once per language
+    (NumberAutomaton.paths), keyed by its token IDs. An expression is then
+    cut at its "and" tokens and each piece looked up whole, instead of
+    walking the automaton one token at a time.
+    
+    The "and" disambiguation stays exactly the Parser's: where the
+    automaton would ask its guard whether an "and" belongs to the number
+    (the piece ends in "hundred" or "thousand"), the same guard method is
+    called. Anything the lookups can't settle - chained steps, an
+    unknown or misplaced word, any error - is parsed again from the start
+    by Parser.try_parse, so results and error details are the same by
+    construction. Instrumented parses (stats set) always take that path,
+    so the decision counters stay the reference parser's.
+    
+    Check any change here with EngineVerifier, which compares the two
+    engines on every number phrase.
+    """
+    
+    # (phrases, continued) per NumberAutomaton, built on first use
+    _tables = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, tokens, language=None):
+        """
+        Args:
+            tokens: List of tokens produced by the Lexer, or a TokenStream
+            language (LanguagePack, optional): As for Parser
+        """
+        super().__init__(tokens, language)
+        self.PHRASES, self.CONTINUED = self.tables(self.NUMBER_AUTOMATON)
+    
+    @classmethod
+    def tables(cls, automaton):
+        """
+        Phrase tables for a number automaton, built the first time they are asked for
+        
+        Returns:
+            (phrases, continued): phrases maps the token IDs (bytes) of every
+            complete number to its value; continued holds the ID strings
+            after which the automaton has an "and" edge
+        """
+        tables = cls._tables.get(automaton)
+        if tables is None:
+            with cls._lock:
+                tables = cls._tables.get(automaton)
+                if tables is None:
+                    phrases = {}
+                    continued = set()
+                    for ids, value, accept, guarded in automaton.paths():
+                        if value is not None:
+                            phrases[ids] = value
+                        if guarded:
+                            continued.add(ids)
+                    tables = cls._tables[automaton] = (phrases, frozenset(continued))
+        return tables
+    
+    def try_parse(self):
+        """
+        Parse the entire expression without raising (see Parser.try_parse)
+        
+        <operation> <number> "and" <number> {"and" <number>} is parsed here
+        by phrase lookups; everything else goes to Parser.try_parse.
+        
+        Returns:
+            (operation, num1, num2, ...), or None with self.error set
+        """
+        ids = self.ids
+        vocabulary = self.VOCABULARY
+        n = len(ids)
+        # Chains, sure errors and a caller's bytearray (see Parser.reset; it
+        # can't be a dict key) go straight to the reference parser
+        if (n < 4 or self.stats is not None or not vocabulary.is_operation[ids[0]]
+                or vocabulary.then_id in ids or vocabulary.and_id not in ids
+                or not isinstance(ids, bytes)):
+            return Parser.try_parse(self)
+        
+        and_id = vocabulary.and_id
+        phrases = self.PHRASES
+        continued = self.CONTINUED
+        operands = []
+        start = 1
+        while True:
+            end = ids.find(and_id, start)
+            if end < 0:
+                end = n
+            piece = ids[start:end]
+            if end < n and piece in continued:
+                # Where the automaton would consult its guard, so do we
+                self.position = end
+                if self._is_and_within_number(is_first_number=not operands):
+                    end = ids.find(and_id, end + 1)
+                    if end < 0:
+                        end = n
+                    piece = ids[start:end]
+                    if end < n and piece in continued:
+                        return self._reparse()
+            value = phrases.get(piece)
+            if value is None:
+                return self._reparse()
+            operands.append(value)
+            if end == n:
+                break
+            start = end + 1
+        if len(operands) < 2:
+            return self._reparse()
+        
+        self.operation = vocabulary.operation[ids[0]]
+        self.num1, self.num2 = operands[0], operands[1]
+        self.operands = tuple(operands)
+        self.position = n
+        return (self.operation, *operands)
+    
+    def _reparse(self):
+        """Hand the expression to Parser.try_parse from the start (guard calls move these)"""
+        self.position = 0
+        self._last_and = None
+        return Parser.try_parse(self)
@@ -0,0 +1,97 @@
+"""
+Result Module - Structured, exception-free evaluation results
+"""
+
+from classes.ErrorCode import ErrorCode
+
+
+class Result:
+    """
+    Outcome of evaluating one expression
+    
+    Attributes:
+        operation (str): Operation keyword, or None if parsing failed first
+        operands (tuple): Parsed operand values
+        value (int): Numeric result, or None on error
+        words (str): Result in word form, or None if not generated
+        error_code (int): ErrorCode value; ErrorCode.OK on success
+        error_detail: Token or value the error message refers to
+        corrections (tuple): (original, corrected) word pairs applied
+            before parsing when spelling correction is on
+        chain (tuple): (operation, operands) of each "then" step, applied
+            in order after operation/operands; empty for a single step
+    """
+    
+    __slots__ = ('operation', 'operands', 'value', 'words', 'error_code', 'error_detail', 'corrections',
+                 'chain')
+    
+    def __init__(self, operation=None, operands=(), value=None, words=None,
+                 error_code=ErrorCode.OK, error_detail=None):
+        self.operation = operation
+        self.operands = operands
+        self.value = value
+        self.words = words
+        self.error_code = error_code
+        self.error_detail = error_detail
+        self.corrections = ()
+        self.chain = ()
+    
+    def copy(self):
+        """
+        A new Result with the same fields
+        
+        Cached results are handed out as copies, so a caller changing its
+        result never changes what the next caller gets.
+        """
+        result = Result(self.operation, self.operands, self.value, self.words,
+                        self.error_code, self.error_detail)
+        result.corrections = self.corrections
+        result.chain = self.chain
+        return result
+    
+    @property
+    def ok(self):
+        """True if the expression evaluated successfully"""
+        return self.error_code == ErrorCode.OK
+    
+    @property
+    def error_name(self):
+        """Symbolic error name (e.g. 'EXPECTED_AND'), or None on success"""
+        if self.error_code == ErrorCode.OK:
+            return None
+        return ErrorCode.name(self.error_code)
+    
+    @property
+    def message(self):
+        """Error message (formatted on demand), or None on success"""
+        if self.error_code == ErrorCode.OK:
+            return None
+        return ErrorCode.message(self.error_code, self.error_detail)
+    
+    def to_dict(self):
+        """Plain dict of all fields, with the error as its name"""
+        return {
+            'operation': self.operation,
+            'operands': list(self.operands),
+            'value': self.value,
+            'words': self.words,
+            'error': self.error_name,
+            'message': self.message,
+            'corrections': [list(pair) for pair in self.corrections],
+            'chain': [[operation, list(operands)] for operation, operands in self.chain],
+        }
+    
+    def __str__(self):
+        """The same string WordCalc.evaluate returns"""
+        if self.error_code == ErrorCode.OK:
+            return self.words if self.words is not None else str(self.value)
+        if self.error_code == ErrorCode.UNEXPECTED:
+            return f"Unexpected error: {self.error_detail}"
+        return f"Error: {self.message}"
+    
+    def __repr__(self):
+        if self.error_code == ErrorCode.OK:
+            chain = f", chain={self.chain!r}" if self.chain else ''
+            return (f"Result({self.operation!r}, {self.operands!r}{chain}, "
+                    f"value={self.value!r}, words={self.words!r})")
+        return f"Result(error={self.error_name}, message={self.message!r})"
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+ResultCache Module - Bounded LRU cache for evaluation results
+Keyed on normalized token tuples so casing and spacing differences share an entry
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class ResultCache:
+    """
+    Least-recently-used cache with hit, miss and eviction counters
+    
+    Safe to share between threads: every operation holds one lock.
+    """
+    
+    def __init__(self, maxsize):
+        """
+        Args:
+            maxsize (int): Maximum number of entries kept (must be positive)
+        """
+        if maxsize <= 0:
+            raise ValueError(f"Cache size must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """
+        Look up a key, marking it as most recently used
+        
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def load(self, items):
+        """
+        Store many (key, value) pairs at once, e.g. to warm up a new cache
+        
+        Later pairs count as more recently used. Only the last maxsize
+        pairs are kept; nothing counts as an eviction.
+        """
+        with self._lock:
+            self._entries.update(items)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def info(self):
+        """Return a CacheInfo snapshot of the counters and current size"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+    
+    def __len__(self):
+        return len(self._entries)
\ No newline at end of file
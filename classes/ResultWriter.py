@@ -0,0 +1,384 @@
+"""
+ResultWriter Module - Bulk output of evaluation results as text, JSON Lines, CSV or binary columns
+Results are encoded a block at a time and written with one call per block
+"""
+
+import struct
+import sys
+from array import array
+
+
+class ResultWriter:
+    """
+    Base class: buffers Results and writes them out in encoded blocks
+    
+    Every structured format has the same columns:
+    
+    - op: operation code (OPERATION_CODES; -1 if parsing failed before
+      an operation was read)
+    - operands: the parsed operand values
+    - chain: the "then" steps, each an operation code and its operands
+      (empty for a single step)
+    - value: numeric result (empty / null / 0 on error)
+    - error: ErrorCode value, 0 on success
+    - words: result in words (only when words=True)
+    
+    For an expression with "then" steps, op and operands describe the
+    first step and chain the rest, in order; value and words are those of
+    the whole chain.
+    
+    Writers work on binary files. Encoding a block does not touch the file,
+    so a block can be encoded in a worker process and written by the parent
+    (see BatchRunner.write).
+    """
+    
+    # Same codes as VectorCalc.OPERATION_CODES
+    OPERATION_CODES = {'add': 0, 'subtract': 1, 'multiply': 2, 'divide': 3}
+    NO_OPERATION = -1
+    
+    def __init__(self, file=None, words=True, block_size=10000):
+        """
+        Args:
+            file: Binary file object to write to (None for an encoder only)
+            words (bool): Include the words column; evaluate with
+                words=False as well to skip generating them
+            block_size (int): Results buffered before a block is written
+        """
+        if block_size <= 0:
+            raise ValueError(f"Block size must be positive, got {block_size}")
+        self.file = file
+        self.words = words
+        self.block_size = block_size
+        self.count = 0
+        self._pending = []
+        self._started = False
+    
+    @staticmethod
+    def for_format(name, file=None, words=True, block_size=10000):
+        """
+        Create the writer for a format name
+        
+        Args:
+            name (str): One of FORMATS ('text', 'jsonl', 'csv', 'binary')
+        
+        Raises:
+            ValueError: If the format is unknown
+        """
+        try:
+            writer_class = FORMATS[name]
+        except KeyError:
+            raise ValueError(f"Unknown output format '{name}'. Expected one of: {', '.join(FORMATS)}")
+        return writer_class(file, words=words, block_size=block_size)
+    
+    def write(self, result):
+        """Buffer one Result, writing a block when block_size are pending"""
+        self._pending.append(result)
+        if len(self._pending) >= self.block_size:
+            self.flush()
+    
+    def write_all(self, results):
+        """
+        Write every Result of an iterable
+        
+        Returns:
+            int: Number of results written
+        """
+        before = self.count + len(self._pending)
+        for result in results:
+            self._pending.append(result)
+            if len(self._pending) >= self.block_size:
+                self.flush()
+        return self.count + len(self._pending) - before
+    
+    def write_block(self, data, count):
+        """
+        Write a block returned by encode_block (e.g. by a worker process)
+        
+        Args:
+            data (bytes): The encoded block
+            count (int): Results it holds
+        """
+        self.flush()
+        self.file.write(data)
+        self.count += count
+    
+    def flush(self):
+        """Encode and write whatever is buffered"""
+        if not self._started:
+            self._started = True
+            self.file.write(self.header())
+        if self._pending:
+            self.file.write(self.encode_block(self._pending))
+            self.count += len(self._pending)
+            self._pending = []
+    
+    def close(self):
+        """Write buffered results and the header if nothing was written yet"""
+        self.flush()
+        self.file.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def header(self):
+        """Bytes written once before the first block"""
+        return b''
+    
+    def encode_block(self, results):
+        """
+        Encode a list of Results
+        
+        Returns:
+            bytes: Data for the file, following header()
+        """
+        raise NotImplementedError
+    
+    def _op_codes(self, operations):
+        """Operation code of each operation name"""
+        codes = self.OPERATION_CODES
+        none = self.NO_OPERATION
+        return [codes.get(operation, none) for operation in operations]
+
+
+class TextResultWriter(ResultWriter):
+    """
+    One line per result, exactly as WordCalc.evaluate returns it
+    
+    Only the words (or the value, when words are off) and error messages
+    are written; this is the format the plain --batch mode has always used.
+    """
+    
+    def encode_block(self, results):
+        lines = [str(result) for result in results]
+        lines.append('')
+        return '\n'.join(lines).encode('utf-8')
+
+
+class JsonLinesResultWriter(ResultWriter):
+    """
+    One JSON object per line:
+    {"op":0,"operands":[4, 5],"chain":[],"value":9,"error":0,"words":"nine"}
+    
+    A chain step is [op, [operands]]: "add one and two then multiply by
+    three" has "chain":[[2, [3]]].
+    
+    Lines are assembled from a template rather than json.dumps: every
+    field is a number, a list of numbers, null, or a words string (which
+    never needs escaping), and json.dumps would cost several times more.
+    """
+    
+    def encode_block(self, results):
+        code = self.OPERATION_CODES.get
+        none = self.NO_OPERATION
+        lines = [f'{{"op":{code(result.operation, none)},"operands":{list(result.operands)},'
+                 f'"chain":{self._chain(result.chain) if result.chain else "[]"},'
+                 f'"value":{"null" if result.value is None else result.value},"error":{result.error_code}'
+                 for result in results]
+        if self.words:
+            lines = [f'{line},"words":"{result.words}"}}' if result.words is not None
+                     else line + ',"words":null}'
+                     for line, result in zip(lines, results)]
+        else:
+            lines = [line + '}' for line in lines]
+        lines.append('')
+        return '\n'.join(lines).encode('utf-8')
+    
+    def _chain(self, chain):
+        """JSON array of "then" steps"""
+        code = self.OPERATION_CODES.get
+        none = self.NO_OPERATION
+        return str([[code(operation, none), list(operands)] for operation, operands in chain])
+
+
+class CsvResultWriter(ResultWriter):
+    """
+    Comma-separated rows under an "op,operands,chain,value,error[,words]" header
+    
+    Operands share one field, separated by spaces; a failed result has
+    empty value and words fields. The chain field holds the "then" steps
+    separated by semicolons, each its operation code and operands
+    separated by spaces ("2 3" for "then multiply by three"). No field
+    ever contains a comma or a quote, so rows are formatted directly
+    instead of through the csv module.
+    """
+    
+    def header(self):
+        return b'op,operands,chain,value,error,words\n' if self.words else b'op,operands,chain,value,error\n'
+    
+    def encode_block(self, results):
+        code = self.OPERATION_CODES.get
+        none = self.NO_OPERATION
+        lines = [f'{code(result.operation, none)},{" ".join(map(str, result.operands))},'
+                 f'{self._chain(result.chain) if result.chain else ""},'
+                 f'{"" if result.value is None else result.value},{result.error_code}'
+                 for result in results]
+        if self.words:
+            lines = [f'{line},{result.words or ""}' for line, result in zip(lines, results)]
+        lines.append('')
+        return '\n'.join(lines).encode('utf-8')
+    
+    def _chain(self, chain):
+        """Chain field: steps separated by semicolons"""
+        code = self.OPERATION_CODES.get
+        none = self.NO_OPERATION
+        return ';'.join(' '.join(map(str, (code(operation, none), *operands))) for operation, operands in chain)
+
+
+class ColumnarResultWriter(ResultWriter):
+    """
+    Compact little-endian binary columns, one block per flush
+    
+    File: MAGIC, then a version byte and a flags byte (1 = has words).
+    Each block: row count, total operand count, total "then" step count
+    and total step operand count (uint32 each), then the columns one
+    after another:
+    
+    - op: int8 per row
+    - error: uint8 per row
+    - operand_count: uint32 per row
+    - flags: uint8 per row (VALUE_TEXT: the value doesn't fit in int64)
+    - value: int64 per row (0 on error and for VALUE_TEXT rows)
+    - operands: int64, all rows' operands back to back
+    - step_count: uint32 per row ("then" steps; 0 for most rows)
+    - step_op: int8 per step, all rows' steps back to back
+    - step_operand_count: uint32 per step
+    - step_operands: int64, all steps' operands back to back
+    - big values: uint32 byte length, then the value of each VALUE_TEXT
+      row in decimal, in row order, joined by newlines
+    - words (if flagged): uint32 byte length, then each row's words in
+      UTF-8 joined by newlines (empty on error)
+    
+    Column data can be loaded straight into arrays (array.frombytes,
+    numpy.frombuffer); read_blocks does that with the array module.
+    Results past int64 are rare (they need several large operands), so
+    they go to a text column instead of widening every value.
+    """
+    
+    MAGIC = b'WCRC'
+    VERSION = 3
+    HAS_WORDS = 1
+    # Row flags
+    VALUE_TEXT = 1
+    
+    _FILE_HEADER = struct.Struct('<4sBB')
+    _BLOCK_HEADER = struct.Struct('<IIII')
+    _LENGTH = struct.Struct('<I')
+    # Column name, array typecode and length (a _BLOCK_HEADER field), in file order
+    _COLUMNS = (('op', 'b', 0), ('error', 'B', 0), ('operand_count', 'I', 0), ('flags', 'B', 0),
+                ('value', 'q', 0), ('operands', 'q', 1), ('step_count', 'I', 0), ('step_op', 'b', 2),
+                ('step_operand_count', 'I', 2), ('step_operands', 'q', 3))
+    _MIN_VALUE = -(1 << 63)
+    _MAX_VALUE = (1 << 63) - 1
+    
+    def header(self):
+        return self._FILE_HEADER.pack(self.MAGIC, self.VERSION, self.HAS_WORDS if self.words else 0)
+    
+    def encode_block(self, results):
+        operands = array('q')
+        for result in results:
+            operands.extend(result.operands)
+        step_counts = array('I', [len(result.chain) for result in results])
+        steps = [step for result in results for step in result.chain] if any(step_counts) else []
+        step_operands = array('q')
+        for _, step in steps:
+            step_operands.extend(step)
+        values = [result.value or 0 for result in results]
+        big = []
+        try:
+            value_column = array('q', values)
+            flags = array('B', bytes(len(values)))
+        except OverflowError:
+            low, high = self._MIN_VALUE, self._MAX_VALUE
+            big = [value for value in values if not low <= value <= high]
+            value_column = array('q', [value if low <= value <= high else 0 for value in values])
+            flags = array('B', [0 if low <= value <= high else self.VALUE_TEXT for value in values])
+        columns = (
+            array('b', self._op_codes([result.operation for result in results])),
+            array('B', [result.error_code for result in results]),
+            array('I', [len(result.operands) for result in results]),
+            flags,
+            value_column,
+            operands,
+            step_counts,
+            array('b', self._op_codes([operation for operation, _ in steps])),
+            array('I', [len(step) for _, step in steps]),
+            step_operands,
+        )
+        parts = [self._BLOCK_HEADER.pack(len(results), len(operands), len(steps), len(step_operands))]
+        for column in columns:
+            if sys.byteorder == 'big':
+                column.byteswap()
+            parts.append(column.tobytes())
+        blob = '\n'.join(map(str, big)).encode('ascii')
+        parts.append(self._LENGTH.pack(len(blob)))
+        parts.append(blob)
+        if self.words:
+            blob = '\n'.join([result.words or '' for result in results]).encode('utf-8')
+            parts.append(self._LENGTH.pack(len(blob)))
+            parts.append(blob)
+        return b''.join(parts)
+    
+    @classmethod
+    def read_blocks(cls, file):
+        """
+        Read a file written by this class back into columns
+        
+        Args:
+            file: Binary file object positioned at the start
+        
+        Yields:
+            dict: Per block, column name -> array ('words' -> list of str,
+            or None if the file has no words; 'big_values' -> list of the
+            int values of the VALUE_TEXT rows, in row order)
+        
+        Raises:
+            ValueError: If the file is not in this format or is truncated
+        """
+        header = file.read(cls._FILE_HEADER.size)
+        if len(header) != cls._FILE_HEADER.size:
+            raise ValueError("Not a WordCalc columnar file: missing header")
+        magic, version, flags = cls._FILE_HEADER.unpack(header)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"Not a WordCalc columnar file (version {cls.VERSION})")
+        
+        while True:
+            header = file.read(cls._BLOCK_HEADER.size)
+            if not header:
+                return
+            if len(header) != cls._BLOCK_HEADER.size:
+                raise ValueError("Truncated WordCalc columnar file")
+            lengths = cls._BLOCK_HEADER.unpack(header)
+            rows = lengths[0]
+            block = {}
+            for name, typecode, length in cls._COLUMNS:
+                column = array(typecode)
+                column.frombytes(cls._read(file, lengths[length] * column.itemsize))
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                block[name] = column
+            length, = cls._LENGTH.unpack(cls._read(file, cls._LENGTH.size))
+            block['big_values'] = [int(value) for value in cls._read(file, length).split(b'\n')] if length else []
+            block['words'] = None
+            if flags & cls.HAS_WORDS:
+                length, = cls._LENGTH.unpack(cls._read(file, cls._LENGTH.size))
+                block['words'] = cls._read(file, length).decode('utf-8').split('\n') if rows else []
+            yield block
+    
+    @staticmethod
+    def _read(file, size):
+        """Read exactly size bytes"""
+        data = file.read(size)
+        if len(data) != size:
+            raise ValueError("Truncated WordCalc columnar file")
+        return data
+
+
+FORMATS = {
+    'text': TextResultWriter,
+    'jsonl': JsonLinesResultWriter,
+    'csv': CsvResultWriter,
+    'binary': ColumnarResultWriter,
+}
@@ -0,0 +1,141 @@
+"""
+SpellCorrector Module - Maps misspelled words to the nearest vocabulary word
+Uses a prebuilt deletion-neighbourhood index, so a lookup never scans the vocabulary
+"""
+
+from classes.ResultCache import ResultCache
+from classes.Vocabulary import TokenStream
+
+
+class SpellCorrector:
+    """
+    Nearest-word lookup within a maximum edit distance
+    
+    Every vocabulary word is indexed under each string left after deleting
+    up to max_distance of its characters ("forty" -> "orty", "frty", ...).
+    Two words within distance d share such a deletion, so a lookup only
+    generates the misspelling's own deletions and checks the few words
+    indexed under them. That is a handful of dict lookups instead of a
+    distance computation per vocabulary word.
+    
+    Distance counts insertions, deletions, substitutions and swaps of
+    adjacent letters ("adn" -> "and" is 1). Ties go to the word listed
+    first in the vocabulary. A correction must keep more than half of the
+    word, so short words like "ad" are left alone rather than guessed.
+    """
+    
+    def __init__(self, words, max_distance=1, memo_size=10000):
+        """
+        Args:
+            words: Vocabulary words, in order of preference for ties
+            max_distance (int): Largest edit distance corrected (1 or 2 is typical)
+            memo_size (int): Lookups remembered, so repeated typos cost one dict hit
+        
+        Raises:
+            ValueError: If max_distance is not positive
+        """
+        if max_distance <= 0:
+            raise ValueError(f"Edit distance must be positive, got {max_distance}")
+        self.max_distance = max_distance
+        self.words = tuple(dict.fromkeys(words))
+        self.known = frozenset(self.words)
+        
+        # Deletion string -> vocabulary words it came from, in vocabulary order
+        self.index = {}
+        for word in self.words:
+            for deletion in self._deletions(word):
+                self.index.setdefault(deletion, []).append(word)
+        self._rank = {word: rank for rank, word in enumerate(self.words)}
+        self._memo = ResultCache(memo_size)
+    
+    def correct(self, word):
+        """
+        Return the nearest vocabulary word
+        
+        Args:
+            word (str): A lowercase token
+        
+        Returns:
+            str: word itself if it is known, its correction, or None if no
+            vocabulary word is within max_distance
+        """
+        if word in self.known:
+            return word
+        correction = self._memo.get(word)
+        if correction is None:
+            correction = self._lookup(word) or ''
+            self._memo.put(word, correction)
+        return correction or None
+    
+    def correct_tokens(self, tokens):
+        """
+        Correct every unknown token of a lexed expression
+        
+        Args:
+            tokens: Token list (or TokenStream) from the Lexer
+        
+        Returns:
+            (tokens, corrections): The tokens with corrections applied (the
+            input itself when all are known) and a tuple of
+            (original, corrected) pairs in token order
+        """
+        if isinstance(tokens, TokenStream):
+            # Streams already know which of their words are outside the vocabulary
+            if not tokens.unknown:
+                return tokens, ()
+        elif self.known.issuperset(tokens):
+            return tokens, ()
+        corrected = list(tokens)
+        corrections = []
+        for position, token in enumerate(corrected):
+            if token not in self.known:
+                correction = self.correct(token)
+                if correction is not None:
+                    corrected[position] = correction
+                    corrections.append((token, correction))
+        return corrected, tuple(corrections)
+    
+    def _lookup(self, word):
+        """Search the index for the nearest word to an unknown word, or None"""
+        limit = min(self.max_distance, (len(word) - 1) // 2)
+        if limit <= 0:
+            return None
+        best = None
+        best_key = None
+        seen = set()
+        for deletion in self._deletions(word, limit):
+            for candidate in self.index.get(deletion, ()):
+                if candidate in seen or abs(len(candidate) - len(word)) > limit:
+                    continue
+                seen.add(candidate)
+                distance = self._distance(word, candidate)
+                if distance > limit:
+                    continue
+                key = (distance, self._rank[candidate])
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+        return best
+    
+    def _deletions(self, word, depth=None):
+        """The word and every string left after deleting up to depth (default max_distance) characters"""
+        found = {word}
+        frontier = {word}
+        for _ in range(self.max_distance if depth is None else depth):
+            frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+            found |= frontier
+        return found
+    
+    def _distance(self, a, b):
+        """Edit distance with adjacent swaps (optimal string alignment)"""
+        previous2 = None
+        previous = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            current = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                cost = a[i - 1] != b[j - 1]
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if (previous2 is not None and i > 1 and j > 1
+                        and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                    current[j] = min(current[j], previous2[j - 2] + 1)
+            previous2, previous = previous, current
+        return previous[len(b)]
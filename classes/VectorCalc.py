@@ -0,0 +1,193 @@
+"""
+VectorCalc Module - NumPy-vectorized bulk evaluation and number-to-words conversion
+For already-parsed (operation, num1, num2) triples in bulk; requires NumPy
+"""
+
+from classes.ErrorCode import ErrorCode
+from classes.LanguagePack import LanguagePack
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only VectorCalc needs it
+    np = None
+
+
+class VectorCalc:
+    """
+    Array-at-a-time counterpart of Interpreter.execute / number_to_words
+    
+    Operations are passed as small integer codes (see OPERATION_CODES) and
+    operands as integer arrays. Words come from a table of every value in
+    -9999..9999, spelled once by the language's NumberWords, so converting
+    an array is a single indexed lookup.
+    
+    Results are exact, as in Interpreter: the few rows whose result
+    doesn't fit in int64 are recomputed with Python integers, and the
+    values are then returned as an object array.
+    """
+    
+    ADD, SUBTRACT, MULTIPLY, DIVIDE = 0, 1, 2, 3
+    OPERATION_CODES = {'add': ADD, 'subtract': SUBTRACT, 'multiply': MULTIPLY, 'divide': DIVIDE}
+    
+    # Largest magnitude covered by the lookup table
+    MAX_WORDS = 9999
+    
+    _INT64_MIN = -(1 << 63)
+    _SAFE_OPERAND = 1 << 31
+    
+    def __init__(self, language=None):
+        """
+        Args:
+            language (str or LanguagePack, optional): Language of the words
+                (see WordCalc); defaults to English
+        
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the language is unknown
+        """
+        if np is None:
+            raise ImportError("VectorCalc requires NumPy (pip install numpy)")
+        self.language = language if isinstance(language, LanguagePack) else LanguagePack.get(language)
+        self._words_table = None
+    
+    def encode_operations(self, operations):
+        """
+        Convert operation names to operation codes
+        
+        Args:
+            operations: Iterable of 'add', 'subtract', 'multiply', 'divide'
+        
+        Returns:
+            numpy int8 array of codes (-1 for unknown names)
+        """
+        codes = self.OPERATION_CODES
+        return np.fromiter((codes.get(op, -1) for op in operations), dtype=np.int8)
+    
+    def execute(self, operations, num1, num2):
+        """
+        Compute all results at once
+        
+        Args:
+            operations: Array of operation codes
+            num1, num2: Integer operand arrays (same length as operations)
+        
+        Returns:
+            (values, error_codes): results and uint8 ErrorCodes; where an
+            error is set (division by zero, unknown operation) the value is 0.
+            values is int64, or an object array of ints if a result is
+            outside int64.
+        """
+        operations = np.asarray(operations)
+        num1 = np.asarray(num1, dtype=np.int64)
+        num2 = np.asarray(num2, dtype=np.int64)
+        
+        is_add = operations == self.ADD
+        is_subtract = operations == self.SUBTRACT
+        is_multiply = operations == self.MULTIPLY
+        is_divide = operations == self.DIVIDE
+        divide_by_zero = is_divide & (num2 == 0)
+        # Swap zero divisors for 1 so the division never faults; masked below
+        safe_divisor = np.where(num2 == 0, 1, num2)
+        
+        # int64 wraps around silently; the rows that may have are redone below
+        with np.errstate(over='ignore'):
+            sums = num1 + num2
+            differences = num1 - num2
+            products = num1 * num2
+            quotients = num1 // safe_divisor
+        values = np.select([is_add, is_subtract, is_multiply, is_divide],
+                           [sums, differences, products, quotients], default=0)
+        wrapped = self._wrapped(num1, num2, sums, differences, is_add, is_subtract, is_multiply, is_divide)
+        
+        errors = np.zeros(len(values), dtype=np.uint8)
+        errors[(operations < self.ADD) | (operations > self.DIVIDE)] = ErrorCode.UNKNOWN_OPERATION
+        errors[divide_by_zero] = ErrorCode.DIVISION_BY_ZERO
+        values[errors != ErrorCode.OK] = 0
+        if wrapped is not None and wrapped.any():
+            values = self._exact(values, operations, num1, num2, np.flatnonzero(wrapped))
+        return values, errors
+    
+    def number_to_words(self, values):
+        """
+        Convert an integer array to words
+        
+        Matches Interpreter.number_to_words: every value is spelled by the
+        language's NumberWords, values in the table once and the rest one
+        by one.
+        
+        Args:
+            values: Integer array (int64, or object as execute returns
+                for results outside int64)
+        
+        Returns:
+            numpy array of str
+        """
+        values = np.asarray(values)
+        if values.dtype != object:
+            values = values.astype(np.int64, copy=False)
+        in_range = ((values >= -self.MAX_WORDS) & (values <= self.MAX_WORDS)).astype(bool)
+        
+        # The table runs from -MAX_WORDS to MAX_WORDS
+        index = np.where(in_range, values, 0).astype(np.int64) + self.MAX_WORDS
+        words = self._words()[index]
+        if in_range.all():
+            return words
+        
+        # Values beyond the table go through the scalar codec
+        outside = np.array(self.language.number_words.to_words_many(values[~in_range].tolist()))
+        words = words.astype(np.result_type(words, outside))
+        words[~in_range] = outside
+        return words
+    
+    def evaluate(self, operations, num1, num2, words=True):
+        """
+        Execute and (optionally) convert to words in one call
+        
+        Returns:
+            (values, error_codes, words) where words is None if not requested;
+            entries with an error have an empty word string
+        """
+        values, errors = self.execute(operations, num1, num2)
+        if not words:
+            return values, errors, None
+        result_words = self.number_to_words(values)
+        result_words[errors != ErrorCode.OK] = ''
+        return values, errors, result_words
+    
+    def _wrapped(self, num1, num2, sums, differences, is_add, is_subtract, is_multiply, is_divide):
+        """Mask of the rows whose int64 result may have wrapped, or None if none can have"""
+        # Operands under 2**31 in magnitude keep every result inside int64,
+        # which is all parsed expressions ever produce
+        bound = self._SAFE_OPERAND
+        if not len(num1) or (-bound < num1.min() and num1.max() < bound
+                             and -bound < num2.min() and num2.max() < bound):
+            return None
+        wrapped = is_add & (((num1 ^ sums) & (num2 ^ sums)) < 0)
+        wrapped |= is_subtract & (((num1 ^ num2) & (num1 ^ differences)) < 0)
+        # The float product is close enough to the exact one to flag every
+        # product past 2**63, along with a few that fit
+        wrapped |= is_multiply & (np.abs(num1.astype(np.float64) * num2) >= 2.0 ** 62)
+        wrapped |= is_divide & (num1 == self._INT64_MIN) & (num2 == -1)
+        return wrapped
+    
+    def _exact(self, values, operations, num1, num2, rows):
+        """values as an object array, with the given rows computed on Python ints"""
+        values = values.astype(object)
+        for row, operation, left, right in zip(rows.tolist(), operations[rows].tolist(),
+                                               num1[rows].tolist(), num2[rows].tolist()):
+            if operation == self.ADD:
+                values[row] = left + right
+            elif operation == self.SUBTRACT:
+                values[row] = left - right
+            elif operation == self.MULTIPLY:
+                values[row] = left * right
+            else:
+                values[row] = left // right
+        return values
+    
+    def _words(self):
+        """Word table for -MAX_WORDS..MAX_WORDS, built on first use"""
+        if self._words_table is None:
+            self._words_table = np.array(self.language.number_words.to_words_many(
+                range(-self.MAX_WORDS, self.MAX_WORDS + 1)))
+        return self._words_table
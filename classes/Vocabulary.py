@@ -0,0 +1,154 @@
+"""
+Vocabulary Module - Small-integer token IDs with precomputed per-ID attributes
+Lets the Parser branch on table lookups instead of hashing token strings
+"""
+
+
+class Vocabulary:
+    """
+    Every word the grammar knows, numbered from 1 (0 is UNKNOWN)
+    
+    IDs fit in one byte, so an encoded expression is a bytes object with
+    one byte per token.
+    
+    Per-ID attribute tuples (indexed by token ID):
+    - value: number value for basic number words and multipliers, else None
+    - is_number: basic number word (a WORD_TO_NUM key)
+    - is_unit: basic number word below ten ("zero" to "nine")
+    - is_tens: tens word that can start a compound ("twenty" to "ninety")
+    - is_multiplier: "hundred" / "thousand"
+    - is_operation: operation keyword
+    - operation: the keyword's operation name ('add', ...), else None
+    """
+    
+    UNKNOWN = 0
+    # Largest token ID (0xFF is left free for callers' markers, see MappedLexer)
+    MAX_ID = 0xFE
+    
+    def __init__(self, word_to_num, multipliers, operations, and_word='and', then_word='then', by_word='by'):
+        """
+        Args:
+            word_to_num: Basic number words and their values (0-99)
+            multipliers: Multiplier words and their values
+            operations: Operation keywords, or a mapping of keyword ->
+                operation name for keywords that aren't the names themselves
+            and_word: The connector word
+            then_word: The word that chains a further step ("... then multiply by two")
+            by_word: The optional word after a chained step's operation, or
+                None if the language has none
+        
+        Raises:
+            ValueError: If there are more than MAX_ID words
+        """
+        if not isinstance(operations, dict):
+            operations = {word: word for word in operations}
+        words = ['']
+        for word in [and_word, *sorted(operations), *word_to_num, *multipliers, then_word, by_word]:
+            if word and word not in words:
+                words.append(word)
+        if len(words) > self.MAX_ID + 1:
+            raise ValueError(f"Vocabulary has {len(words) - 1} words, at most {self.MAX_ID} fit in a token ID")
+        self.words = tuple(words)
+        self.ids = _Ids((word, token_id) for token_id, word in enumerate(words) if token_id)
+        self.byte_ids = _Ids((word.encode('ascii'), token_id) for word, token_id in self.ids.items())
+        self.and_id = self.ids[and_word]
+        self.then_id = self.ids[then_word]
+        # -1 matches no token
+        self.by_id = self.ids[by_word] if by_word else -1
+        
+        values = dict(word_to_num, **multipliers)
+        self.value = tuple(values.get(word) for word in words)
+        self.is_number = tuple(word in word_to_num for word in words)
+        self.is_unit = tuple(word in word_to_num and word_to_num[word] < 10 for word in words)
+        self.is_tens = tuple(word in word_to_num and word_to_num[word] >= 20 and word_to_num[word] % 10 == 0
+                             for word in words)
+        self.is_multiplier = tuple(word in multipliers for word in words)
+        self.operation = tuple(map(operations.get, words))
+        self.is_operation = tuple(operation is not None for operation in self.operation)
+    
+    def __len__(self):
+        return len(self.words)
+    
+    def encode(self, tokens):
+        """
+        Encode a list of token strings
+        
+        Args:
+            tokens: Token strings as produced by Lexer.tokenize()
+        
+        Returns:
+            TokenStream
+        """
+        ids = bytes(map(self.ids.__getitem__, tokens))
+        unknown = None
+        if self.UNKNOWN in ids:
+            unknown = {position: token for position, token in enumerate(tokens) if not ids[position]}
+        return TokenStream(self, ids, unknown)
+    
+    def encode_bytes(self, words):
+        """
+        Encode a list of lowercase ASCII byte strings (see MappedLexer)
+        
+        Returns:
+            TokenStream
+        """
+        ids = bytes(map(self.byte_ids.__getitem__, words))
+        unknown = None
+        if self.UNKNOWN in ids:
+            unknown = {position: word.decode('ascii') for position, word in enumerate(words) if not ids[position]}
+        return TokenStream(self, ids, unknown)
+
+
+class TokenStream:
+    """
+    Compact lexed expression: token IDs as bytes, one byte per token
+    
+    Reads like the list of token strings it was encoded from (len, index,
+    slice, iterate), so it can go anywhere Lexer.tokenize() output can.
+    Words outside the vocabulary are encoded as UNKNOWN and kept by position
+    so error messages can still quote them. Streams compare and hash by
+    content, so they can be used as cache keys.
+    """
+    
+    __slots__ = ('vocabulary', 'ids', 'unknown')
+    
+    def __init__(self, vocabulary, ids, unknown=None):
+        """
+        Args:
+            vocabulary (Vocabulary): Vocabulary the IDs refer to
+            ids (bytes): Token IDs
+            unknown (dict, optional): Position -> original word for UNKNOWN IDs
+        """
+        self.vocabulary = vocabulary
+        self.ids = ids
+        self.unknown = unknown
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __getitem__(self, index):
+        """Token string at index (a list of them for a slice)"""
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self.ids)))]
+        token_id = self.ids[index]
+        if token_id:
+            return self.vocabulary.words[token_id]
+        return self.unknown[index % len(self.ids)]
+    
+    def __eq__(self, other):
+        if not isinstance(other, TokenStream):
+            return NotImplemented
+        return self.ids == other.ids and self.unknown == other.unknown
+    
+    def __hash__(self):
+        return hash((self.ids, tuple(self.unknown.items()) if self.unknown else None))
+    
+    def __repr__(self):
+        return f"TokenStream({self[:]!r})"
+
+
+class _Ids(dict):
+    """Word -> token ID, with UNKNOWN for every other word"""
+    
+    def __missing__(self, word):
+        return Vocabulary.UNKNOWN
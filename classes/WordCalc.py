@@ -1,15 +1,89 @@
 from classes.Parser import Parser
 from classes.Lexer import Lexer
-from classes.WordCalcError import  WordCalcError
 from classes.Interpreter import Interpreter
+from classes.ResultCache import ResultCache
+from classes.Result import Result
+from classes.ErrorCode import ErrorCode
+from classes.Vocabulary import TokenStream
+from classes.LanguagePack import LanguagePack
+from collections import deque
+from itertools import islice
+from time import perf_counter_ns
+import importlib
+import os
 
 class WordCalc:
     """
     Main WordCalc class - Coordinates lexer, parser, and interpreter
+    
+    One WordCalc can be shared by any number of threads. Parse state lives
+    in Lexer/Parser/Interpreter objects that belong to a single call at a
+    time (see _acquire_pipeline); the word tables, number automaton and
+    vocabulary they read are built once and never modified. The result
+    cache and instrumentation lock their own updates.
     """
     
-    def __init__(self):
-        pass
+    # Parser module per engine name; the class has the module's name and is
+    # imported when a calculator first asks for it
+    ENGINES = {
+        'reference': 'classes.Parser',
+        'phrase': 'classes.PhraseParser',
+    }
+    DEFAULT_ENGINE = 'reference'
+    
+    def __init__(self, cache_size=None, instrumentation=None, correction_distance=None, cache_path=None,
+                 language=None, engine=None):
+        """
+        Args:
+            cache_size (int, optional): Enable an LRU result cache holding up
+                to this many entries. Results (including errors) are keyed on
+                the lexer's normalized tokens, so "ADD  five and six" and
+                "add five and six" share an entry. Disabled by default.
+            instrumentation (Instrumentation, optional): Collect per-stage
+                timings, error counts and parser decision counters. When
+                omitted, evaluation takes the uninstrumented path.
+            correction_distance (int, optional): Correct unknown words to the
+                nearest vocabulary word within this edit distance before
+                parsing ("fourty" -> "forty"). Corrections made are listed
+                in Result.corrections. Disabled by default.
+            cache_path (str, optional): SQLite file for a persistent result
+                cache that outlives the process and can be shared by several
+                (see PersistentCache). The in-memory cache is then always on,
+                with cache_size entries (10000 by default), and starts out
+                holding the file's most used entries. Call close() when done
+                so the last results are written. Calculators with other
+                languages or correction distances can share the file;
+                each only sees the results made with its own settings.
+            language (str, optional): Language code of the expressions and
+                result words ('en' by default; see LanguagePack). A pack is
+                loaded the first time any calculator uses it.
+            engine (str, optional): Parser implementation, a key of ENGINES.
+                'reference' (the default) is Parser; 'phrase' is
+                PhraseParser, which gives the same results with table
+                lookups (check with EngineVerifier). Sessions always use
+                the reference parser.
+        
+        Raises:
+            ValueError: If the language or engine is unknown
+        """
+        self.language = LanguagePack.get(language)
+        self.engine = engine or self.DEFAULT_ENGINE
+        self.parser_class = self.engine_class(self.engine)
+        if cache_path:
+            # Imported here so calculators without a persistent cache don't load sqlite3
+            from classes.PersistentCache import PersistentCache
+            # Results depend on the language and on spelling correction
+            namespace = f"{self.language.code} correction={correction_distance or 0}"
+            self.cache = PersistentCache(cache_path, namespace, memory_size=cache_size or 10000)
+        else:
+            self.cache = ResultCache(cache_size) if cache_size else None
+        self.instrumentation = instrumentation
+        self.corrector = None
+        if correction_distance:
+            from classes.SpellCorrector import SpellCorrector
+            self.corrector = SpellCorrector(self.language.vocabulary.words[1:], correction_distance)
+        # Idle (lexer, parser, interpreter) sets, reused by single-expression calls
+        self._idle_pipelines = []
     
     def evaluate(self, expression):
         """
@@ -21,22 +95,442 @@ class WordCalc:
         Returns:
             str: The result in word form (e.g., "eight")
         """
+        pipeline = self._acquire_pipeline()
+        try:
+            return str(self._result_with(*pipeline, expression))
+        finally:
+            self._idle_pipelines.append(pipeline)
+    
+    def evaluate_result(self, expression, words=True):
+        """
+        Evaluate a WordCalc expression into a structured Result
+        
+        Errors are reported through Result.error_code rather than raised,
+        and their messages are only formatted if asked for.
+        
+        Args:
+            expression (str): The expression to evaluate
+            words (bool): Generate Result.words; skip it when only the
+                numeric value is needed
+        
+        Returns:
+            Result: operation, operands, value, words and error code
+        """
+        pipeline = self._acquire_pipeline()
         try:
-            # Step 1: Tokenize
-            lexer = Lexer(expression)
-            tokens = lexer.tokenize()
+            return self._result_with(*pipeline, expression, words)
+        finally:
+            self._idle_pipelines.append(pipeline)
+    
+    def evaluate_many(self, expressions):
+        """
+        Evaluate many expressions, yielding results in input order
+        
+        A single Lexer, Parser and Interpreter are created up front and
+        reset for every expression, so a long stream of expressions does
+        not allocate new pipeline objects per line.
+        
+        Args:
+            expressions: Any iterable of expression strings (consumed lazily)
+        
+        Yields:
+            str: The result for each expression, exactly as evaluate() returns it
+        """
+        for result in self.evaluate_results(expressions):
+            yield str(result)
+    
+    def evaluate_results(self, expressions, words=True):
+        """
+        Evaluate many expressions, yielding a Result for each in input order
+        
+        Args:
+            expressions: Any iterable of expression strings (consumed lazily)
+            words (bool): Generate Result.words for each result
+        
+        Yields:
+            Result: One per input expression
+        """
+        lexer = Lexer('')
+        parser = self.parser_class([], self.language)
+        interpreter = Interpreter(None, None, None, language=self.language)
+        for expression in expressions:
+            yield self._result_with(lexer, parser, interpreter, expression, words)
+    
+    def evaluate_tokens(self, token_lists, words=True):
+        """
+        Evaluate already tokenized expressions, yielding a Result for each
+        
+        For bulk inputs lexed elsewhere (e.g. MappedLexer). Each token list
+        must look like Lexer.tokenize() output: lowercase words with no
+        whitespace, or a TokenStream. An empty one gives the empty-input error.
+        
+        Args:
+            token_lists: Iterable of token lists or TokenStreams (consumed lazily)
+            words (bool): Generate Result.words for each result
+        
+        Yields:
+            Result: One per token list
+        """
+        parser = self.parser_class([], self.language)
+        interpreter = Interpreter(None, None, None, language=self.language)
+        for tokens in token_lists:
+            yield self._result_for_token_list(parser, interpreter, tokens, words)
+    
+    def result_for_tokens(self, tokens, words=True):
+        """
+        Evaluate one already tokenized expression into a Result
+        
+        For front ends that lex expressions themselves (CompiledExpression
+        splices pre-lexed template pieces); the tokens are as for
+        evaluate_tokens, and go through the cache and instrumentation.
+        
+        Args:
+            tokens: Token list or TokenStream
+            words (bool): Generate Result.words
+        
+        Returns:
+            Result: What evaluate_result gives for the same tokens
+        """
+        pipeline = self._acquire_pipeline()
+        try:
+            return self._result_for_token_list(pipeline[1], pipeline[2], tokens, words)
+        finally:
+            self._idle_pipelines.append(pipeline)
+    
+    def result_for_operands(self, operation, operands, words=True):
+        """
+        Interpret an already parsed expression into a Result
+        
+        For front ends that parse (part of) an expression themselves, as
+        CompiledExpression does with a template's fixed operands. The
+        result is not cached or instrumented.
+        
+        Args:
+            operation (str): Operation name ('add', ...)
+            operands: Operand values, as Parser.try_parse returns them
+            words (bool): Generate Result.words
+        
+        Returns:
+            Result: What evaluate_result gives for an expression that parses
+            to (operation, *operands) without "then" steps
+        """
+        pipeline = self._acquire_pipeline()
+        try:
+            return self._interpret(pipeline[2], operation, tuple(operands), (), words)
+        except Exception as e:
+            return Result(None, (), None, None, ErrorCode.UNEXPECTED, e)
+        finally:
+            self._idle_pipelines.append(pipeline)
+    
+    def evaluate_list(self, expressions):
+        """
+        Evaluate many expressions and return all results as a list
+        
+        Args:
+            expressions: Any iterable of expression strings
+        
+        Returns:
+            list[str]: Results in the same order as the input
+        """
+        return list(self.evaluate_many(expressions))
+    
+    def evaluate_parallel(self, expressions, threads=None, chunk_size=1000):
+        """
+        Evaluate many expressions on a thread pool, yielding results in input order
+        
+        Chunks of expressions are evaluated by evaluate_list() on worker
+        threads, each chunk with its own pipeline objects; the cache and
+        instrumentation, if any, are shared. Only a bounded number of
+        chunks is in flight, so memory stays flat for long inputs.
+        
+        Threads only speed evaluation up on a free-threaded (no GIL) Python
+        build; with the GIL, use BatchRunner's processes instead. Compare
+        with benchmarks/threads.py.
+        
+        Args:
+            expressions: Any iterable of expression strings (consumed lazily)
+            threads (int, optional): Worker threads; defaults to the CPU count
+            chunk_size (int): Expressions per task
+        
+        Yields:
+            str: The result for each expression, exactly as evaluate() returns it
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        threads = threads or os.cpu_count() or 1
+        
+        # Imported here so single-threaded use doesn't pay for it
+        from concurrent.futures import ThreadPoolExecutor
+        
+        iterator = iter(expressions)
+        with ThreadPoolExecutor(threads) as pool:
+            pending = deque()
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                pending.append(pool.submit(self.evaluate_list, chunk))
+                if len(pending) >= 2 * threads:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    
+    def compile(self, template, memo_size=10000):
+        """
+        Lex an expression template once for evaluation over many bindings
+        
+        Example:
+            add_five = calc.compile("add {x} and five")
+            add_five(3)                               # 'eight'
+            add_five.evaluate_list([1, "ten", 9000])  # one result per value
+        
+        Args:
+            template (str): Expression with {name} placeholders for operands
+            memo_size (int, optional): Results memoized per binding tuple
+                (None or 0 disables)
+        
+        Returns:
+            CompiledExpression: Callable returning what evaluate() would for
+            the template with the bindings filled in (ints become words)
+        """
+        # Imported here (as are SpellCorrector and IncrementalSession) so that
+        # one-shot evaluation doesn't load modules it never uses
+        from classes.CompiledExpression import CompiledExpression
+        return CompiledExpression(self, template, memo_size)
+    
+    def session(self):
+        """
+        Start an incremental session for input that is edited as it is typed
+        
+        Example:
+            session = calc.session()
+            session.update("add one hund")    # status 'incomplete'
+            session.append("red and five")    # status 'complete', 'one hundred five'
+        
+        Returns:
+            IncrementalSession: Re-lexes only from the first changed token
+            on each update, then parses the input with the Parser
+        """
+        from classes.IncrementalSession import IncrementalSession
+        return IncrementalSession(self)
+    
+    def cache_info(self):
+        """
+        Return cache statistics (hits, misses, evictions, maxsize, currsize)
+        
+        Returns:
+            CacheInfo, or None if caching is disabled
+        """
+        if self.cache is None:
+            return None
+        return self.cache.info()
+    
+    def close(self):
+        """Write out and close the persistent cache, if there is one"""
+        close = getattr(self.cache, 'close', None)
+        if close is not None:
+            close()
+    
+    @classmethod
+    def engine_class(cls, engine):
+        """
+        Parser class of an engine, importing its module on first use
+        
+        Args:
+            engine (str): A key of ENGINES
+        
+        Returns:
+            type: Parser or a subclass of it
+        
+        Raises:
+            ValueError: If no engine has that name
+        """
+        try:
+            module = cls.ENGINES[engine]
+        except KeyError:
+            raise ValueError(f"Unknown engine '{engine}'. Expected one of: {', '.join(cls.ENGINES)}")
+        if module == Parser.__module__:
+            return Parser
+        return getattr(importlib.import_module(module), module.rpartition('.')[2])
+    
+    def _acquire_pipeline(self):
+        """
+        Take an idle (lexer, parser, interpreter) set, or build a new one
+        
+        The set belongs to the caller until it is appended back to
+        _idle_pipelines, so concurrent and reentrant calls never share
+        parse state. list.pop() and append() are atomic, so no lock is needed.
+        """
+        try:
+            return self._idle_pipelines.pop()
+        except IndexError:
+            return (Lexer(''), self.parser_class([], self.language),
+                    Interpreter(None, None, None, language=self.language))
+    
+    def _result_for_token_list(self, parser, interpreter, tokens, words=True):
+        """Evaluate one lexed expression (see evaluate_tokens) on the given pipeline objects"""
+        if not tokens:
+            result = Result(None, (), None, None, ErrorCode.EMPTY_INPUT)
+            if self.instrumentation is not None:
+                self.instrumentation.record({}, self.instrumentation.new_parser_stats(), result.error_name)
+            return result
+        if self.instrumentation is not None:
+            return self._result_instrumented_tokens(
+                parser, interpreter, tokens, words, {}, self.instrumentation.new_parser_stats())
+        return self._result_for_tokens(parser, interpreter, tokens, words)
+    
+    def _result_with(self, lexer, parser, interpreter, expression, words=True):
+        """Run one expression through the given (reusable) pipeline objects"""
+        if self.instrumentation is not None:
+            return self._result_instrumented(lexer, parser, interpreter, expression, words)
+        
+        # Step 1: Tokenize
+        try:
+            lexer.reset(expression)
+        except Exception as e:
+            return Result(None, (), None, None, ErrorCode.UNEXPECTED, e)
+        tokens = lexer.try_tokenize()
+        if tokens is None:
+            return Result(None, (), None, None, ErrorCode.EMPTY_INPUT)
+        return self._result_for_tokens(parser, interpreter, tokens, words)
+    
+    def _result_for_tokens(self, parser, interpreter, tokens, words=True):
+        """Parse and interpret lexed tokens, going through the cache when enabled"""
+        if self.cache is None:
+            return self._result_from_tokens(parser, interpreter, tokens, words)
+        
+        # A cache hit skips the parser and interpreter entirely. TokenStreams
+        # hash by their IDs, so they are keys as they are
+        key = tokens if isinstance(tokens, TokenStream) else tuple(tokens)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._result_from_tokens(parser, interpreter, tokens, words)
+            self.cache.put(key, result)
+        return self._cached_copy(result, interpreter, words)
+    
+    @staticmethod
+    def _cached_copy(result, interpreter, words):
+        """
+        The caller's own copy of a cached Result, with words as asked for
+        
+        Cached Results are shared by every caller and thread, so they are
+        never handed out or changed; words missing from the cached one are
+        generated for the copy only.
+        """
+        result = result.copy()
+        if not words:
+            result.words = None
+        elif result.words is None and result.value is not None:
+            result.words = interpreter.number_to_words(result.value)
+        return result
+    
+    def _result_from_tokens(self, parser, interpreter, tokens, words=True):
+        """Parse and interpret an already tokenized expression"""
+        corrections = ()
+        try:
+            if self.corrector is not None:
+                tokens, corrections = self.corrector.correct_tokens(tokens)
             
             # Step 2: Parse
-            parser = Parser(tokens)
-            operation, num1, num2 = parser.parse()
-            
-            # Step 3: Interpret
-            interpreter = Interpreter(operation, num1, num2)
-            result = interpreter.interpret()
+            parser.reset(tokens)
+            parsed = parser.try_parse()
+            if parsed is None:
+                code, detail = parser.error
+                result = Result(parser.operation, (), None, None, code, detail)
+            else:
+                # Step 3: Interpret
+                result = self._interpret(interpreter, parsed[0], parsed[1:], parser.chain, words)
+        
+        except Exception as e:
+            result = Result(None, (), None, None, ErrorCode.UNEXPECTED, e)
+        
+        if corrections:
+            result.corrections = corrections
+        return result
+    
+    @staticmethod
+    def _interpret(interpreter, operation, operands, chain, words=True):
+        """Interpret a parsed expression into a Result"""
+        interpreter.reset(operation, *operands, chain=chain)
+        value = interpreter.try_execute()
+        if value is None:
+            code, detail = interpreter.error
+            result = Result(operation, operands, None, None, code, detail)
+        else:
+            result = Result(operation, operands, value, interpreter.number_to_words(value) if words else None)
+        if chain:
+            result.chain = chain
+        return result
+    
+    def _result_instrumented(self, lexer, parser, interpreter, expression, words=True):
+        """
+        Same as _result_with, but times each stage and records the outcome
+        
+        Errors are counted by ErrorCode name. Cache hits are recorded as
+        such (no parse/interpret time) and not counted again as errors.
+        """
+        timings = {}
+        stats = self.instrumentation.new_parser_stats()
+        
+        # Step 1: Tokenize
+        start = perf_counter_ns()
+        try:
+            lexer.reset(expression)
+            tokens = lexer.try_tokenize()
+            failed = None if tokens is not None else Result(None, (), None, None, ErrorCode.EMPTY_INPUT)
+        except Exception as e:
+            failed = Result(None, (), None, None, ErrorCode.UNEXPECTED, e)
+        timings['tokenize'] = perf_counter_ns() - start
+        if failed is not None:
+            self.instrumentation.record(timings, stats, failed.error_name)
+            return failed
+        return self._result_instrumented_tokens(parser, interpreter, tokens, words, timings, stats)
+    
+    def _result_instrumented_tokens(self, parser, interpreter, tokens, words, timings, stats):
+        """Instrumented parse and interpret of lexed tokens (see _result_instrumented)"""
+        cache_status = None
+        key = None
+        if self.cache is not None:
+            key = tokens if isinstance(tokens, TokenStream) else tuple(tokens)
+            result = self.cache.get(key)
+            if result is not None:
+                self.instrumentation.record(timings, stats, None, 'hit')
+                return self._cached_copy(result, interpreter, words)
+            cache_status = 'miss'
+        
+        stage = 'parse'
+        start = perf_counter_ns()
+        parser.stats = stats
+        corrections = ()
+        try:
+            # Spelling correction is timed as part of parsing
+            if self.corrector is not None:
+                tokens, corrections = self.corrector.correct_tokens(tokens)
             
-            return result
+            # Step 2: Parse
+            parser.reset(tokens)
+            parsed = parser.try_parse()
+            timings['parse'] = perf_counter_ns() - start
             
-        except WordCalcError as e:
-            return f"Error: {e}"
+            if parsed is None:
+                code, detail = parser.error
+                result = Result(parser.operation, (), None, None, code, detail)
+            else:
+                # Step 3: Interpret
+                stage = 'interpret'
+                start = perf_counter_ns()
+                result = self._interpret(interpreter, parsed[0], parsed[1:], parser.chain, words)
+                timings['interpret'] = perf_counter_ns() - start
         except Exception as e:
-            return f"Unexpected error: {e}"
\ No newline at end of file
+            timings[stage] = perf_counter_ns() - start
+            result = Result(None, (), None, None, ErrorCode.UNEXPECTED, e)
+        finally:
+            parser.stats = None
+        
+        if corrections:
+            result.corrections = corrections
+        self.instrumentation.record(timings, stats, result.error_name, cache_status)
+        if key is not None:
+            self.cache.put(key, result)
+            return self._cached_copy(result, interpreter, words)
+        return result
\ No newline at end of file
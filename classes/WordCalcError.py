@@ -1,3 +1,16 @@
+from classes.ErrorCode import ErrorCode
+
+
 class WordCalcError(Exception):
     """Custom exception for WordCalc errors"""
-    pass
+    
+    def __init__(self, message, code=None, detail=None):
+        super().__init__(message)
+        # ErrorCode value and detail, when raised from a coded error
+        self.code = code
+        self.detail = detail
+    
+    @classmethod
+    def from_code(cls, code, detail=None):
+        """Build the exception for an ErrorCode, formatting its message"""
+        return cls(ErrorCode.message(code, detail), code, detail)
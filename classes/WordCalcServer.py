@@ -0,0 +1,179 @@
+"""
+WordCalcServer Module - Asyncio line-protocol server
+Clients send newline-delimited expressions and receive newline-delimited results
+"""
+
+import asyncio
+
+from classes.WordCalc import WordCalc
+
+
+class WordCalcServer:
+    """
+    TCP server evaluating one expression per line
+    
+    - Requests may be pipelined: a client can send many lines without
+      waiting, and responses come back in the same order.
+    - Expressions from all connections are queued and evaluated together
+      once per event-loop tick, so a burst of lines costs one batch call.
+    - Each connection may have at most max_pending unanswered lines; past
+      that the server stops reading from it until responses are written.
+    - At most max_connections clients are served at once; extra clients
+      receive an error line and are disconnected.
+    - close() disconnects clients that are still connected; their
+      unanswered lines get no response.
+    """
+    
+    def __init__(self, calc=None, host='127.0.0.1', port=8765, max_connections=100,
+                 max_pending=1000, max_batch=10000, max_line_length=65536):
+        """
+        Args:
+            calc (WordCalc, optional): Calculator to use; a new one by default
+            host (str): Interface to bind
+            port (int): TCP port to bind (0 picks a free port)
+            max_connections (int): Concurrent client limit
+            max_pending (int): Unanswered lines allowed per connection
+            max_batch (int): Expressions evaluated per event-loop tick
+            max_line_length (int): Longest accepted request line in bytes
+        """
+        self.calc = calc or WordCalc()
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.max_line_length = max_line_length
+        self.connections = 0
+        self._server = None
+        # Connection handler task -> its client's writer
+        self._handlers = {}
+        self._queue = []
+        self._flush_scheduled = False
+    
+    async def start(self):
+        """Bind the listening socket and start accepting clients"""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=self.max_line_length)
+        # Report the real port when 0 was requested
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+    
+    async def serve_forever(self):
+        """Start the server (if needed) and serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def close(self):
+        """Stop accepting clients, disconnect the connected ones and wait for both"""
+        if self._server is not None:
+            self._server.close()
+        handlers = list(self._handlers)
+        for task, writer in self._handlers.items():
+            writer.close()
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+    
+    def _submit(self, expression):
+        """Queue an expression for the next batch and return its future"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((expression, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return future
+    
+    def _flush(self):
+        """Evaluate everything queued since the last tick in one batch"""
+        batch = self._queue[:self.max_batch]
+        del self._queue[:self.max_batch]
+        
+        results = self.calc.evaluate_list(expression for expression, _ in batch)
+        for (_, future), result in zip(batch, results):
+            if not future.cancelled():
+                future.set_result(result)
+        
+        # Leave the rest for the next tick so one huge burst can't starve I/O
+        if self._queue:
+            asyncio.get_running_loop().call_soon(self._flush)
+        else:
+            self._flush_scheduled = False
+    
+    async def _handle_connection(self, reader, writer):
+        """Serve one client until it disconnects or close() cancels the handler"""
+        task = asyncio.current_task()
+        self._handlers[task] = writer
+        try:
+            if self.connections >= self.max_connections:
+                writer.write(b"Error: Too many connections\n")
+                await self._close_writer(writer)
+                return
+            await self._serve(reader, writer)
+        except asyncio.CancelledError:
+            # Cancelled by close(); ending cancelled would make asyncio log
+            # an error for the handler task
+            pass
+        finally:
+            del self._handlers[task]
+    
+    async def _serve(self, reader, writer):
+        """Read requests, queue them, write responses in order"""
+        self.connections += 1
+        # Bounded queue of response futures: a full queue pauses reading
+        responses = asyncio.Queue(maxsize=self.max_pending)
+        responder = asyncio.create_task(self._write_responses(responses, writer))
+        try:
+            try:
+                while True:
+                    try:
+                        line = await reader.readline()
+                    except ValueError:
+                        # Line longer than max_line_length
+                        await responses.put(f"Error: Line exceeds {self.max_line_length} bytes")
+                        break
+                    if not line:
+                        break
+                    expression = line.decode('utf-8', 'replace').rstrip('\r\n')
+                    await responses.put(self._submit(expression))
+            except ConnectionError:
+                pass
+            await responses.put(None)
+            await responder
+        except asyncio.CancelledError:
+            responder.cancel()
+            await asyncio.gather(responder, return_exceptions=True)
+            raise
+        finally:
+            self.connections -= 1
+    
+    async def _write_responses(self, responses, writer):
+        """Write results in request order as they become available"""
+        broken = False
+        while True:
+            response = await responses.get()
+            if response is None:
+                break
+            if broken:
+                # Keep draining so the reader never blocks on a full queue
+                continue
+            if isinstance(response, asyncio.Future):
+                response = await response
+            try:
+                writer.write(response.encode('utf-8') + b"\n")
+                # Waits only while the client is not reading fast enough
+                await writer.drain()
+            except ConnectionError:
+                broken = True
+        await self._close_writer(writer)
+    
+    async def _close_writer(self, writer):
+        """Close a client connection, ignoring peers that already went away"""
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
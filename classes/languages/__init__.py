@@ -0,0 +1,4 @@
+"""
+Built-in language packs, one module per language code (see LanguagePack.REGISTRY)
+Each module defines PACK and is only imported when its language is first used
+"""
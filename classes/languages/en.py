@@ -0,0 +1,32 @@
+"""
+English language pack - the default vocabulary, number grammar and number words
+"""
+
+from classes.LanguagePack import LanguagePack
+
+
+PACK = LanguagePack(
+    'en', 'English',
+    word_to_num={
+        # Digits (0-9)
+        'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4,
+        'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9,
+        # Teens (10-19)
+        'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+        'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+        # Tens (20, 30, 40, ...)
+        'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+        'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90
+    },
+    multipliers={
+        'hundred': 100,
+        'thousand': 1000
+    },
+    operations={'add': 'add', 'subtract': 'subtract', 'multiply': 'multiply', 'divide': 'divide'},
+    and_word='and',
+    then_word='then',
+    by_word='by',
+    scales=('', 'thousand', 'million', 'billion', 'trillion', 'quadrillion', 'quintillion',
+            'sextillion', 'septillion', 'octillion', 'nonillion', 'decillion'),
+    negative_word='negative',
+)
@@ -0,0 +1,228 @@
+"""
+Mandarin Chinese language pack, in toneless pinyin
+Numbers are built from digits and place words (shi, bai, qian) rather than tens words
+"""
+
+from classes.ErrorCode import ErrorCode
+from classes.LanguagePack import LanguagePack
+from classes.NumberAutomaton import NumberAutomaton
+from classes.NumberWords import NumberWords
+
+
+DIGITS = {'yi': 1, 'er': 2, 'san': 3, 'si': 4, 'wu': 5, 'liu': 6, 'qi': 7, 'ba': 8, 'jiu': 9}
+
+
+class PinyinNumberAutomaton(NumberAutomaton):
+    """
+    Mandarin number grammar (0-9999) in the NumberAutomaton table format
+    
+    A place word is a multiplier on the digit before it: "er shi san" is
+    2 * 10 + 3, "san bai ling wu" is 3 * 100 + 5. "ling" (zero) stands in
+    for skipped places, "shi" alone starts 10-19 ("shi wu"), and "liang"
+    is the 2 used before "bai" and "qian". There is no internal "and", so
+    no edge is guarded.
+    """
+    
+    def __init__(self, vocabulary, zero_word='ling', two_word='liang',
+                 tens_word='shi', hundred_word='bai', thousand_word='qian'):
+        self.and_word = None
+        self.edges = []
+        self.errors = []
+        self.accept = []
+        
+        digits = DIGITS
+        leads = dict(digits, **{two_word: 2})
+        
+        start = self._add_state(self.REJECT)
+        
+        # Last digit of a number, and the optional one after "shi"
+        last = self._add_state(self.ACCEPT)
+        tens = self._add_state(self.ACCEPT)
+        self._add_values(tens, digits, last)
+        tens_digit = self._add_state(self.REJECT)
+        self.edges[tens_digit][tens_word] = (tens, 10, 0, False)
+        
+        # After "bai": nothing, "ling <digit>" or "<digit> shi [<digit>]"
+        hundred = self._add_state(self.ACCEPT)
+        hundred_zero = self._add_state(self.REJECT)
+        self.edges[hundred][zero_word] = (hundred_zero, 0, 0, False)
+        self._add_values(hundred_zero, digits, last)
+        self._add_values(hundred, digits, tens_digit)
+        hundreds_digit = self._add_state(self.REJECT)
+        self.edges[hundreds_digit][hundred_word] = (hundred, 100, 0, False)
+        
+        # After "qian": nothing, "<digit> bai ...", or "ling" then a last
+        # digit or "<digit> shi [<digit>]"
+        thousand = self._add_state(self.ACCEPT)
+        self._add_values(thousand, leads, hundreds_digit)
+        thousand_zero = self._add_state(self.REJECT)
+        self.edges[thousand][zero_word] = (thousand_zero, 0, 0, False)
+        zero_digit = self._add_state(self.ACCEPT)
+        self.edges[zero_digit][tens_word] = (tens, 10, 0, False)
+        self._add_values(thousand_zero, digits, zero_digit)
+        
+        # Leading word: a digit (alone or before a place word), "liang",
+        # "shi" (10-19) or a lone "ling"
+        lead_digit = self._add_state(self.ACCEPT)
+        self.edges[lead_digit][tens_word] = (tens, 10, 0, False)
+        self.edges[lead_digit][hundred_word] = (hundred, 100, 0, False)
+        self.edges[lead_digit][thousand_word] = (thousand, 1000, 0, False)
+        lead_two = self._add_state(self.REJECT)
+        self.edges[lead_two][hundred_word] = (hundred, 100, 0, False)
+        self.edges[lead_two][thousand_word] = (thousand, 1000, 0, False)
+        zero = self._add_state(self.ACCEPT)
+        self.errors[zero][hundred_word] = ErrorCode.ZERO_HUNDRED
+        self.errors[zero][thousand_word] = ErrorCode.ZERO_THOUSAND
+        
+        self._add_values(start, digits, lead_digit)
+        self.edges[start][two_word] = (lead_two, 0, 2, False)
+        self.edges[start][tens_word] = (tens, 0, 10, False)
+        self.edges[start][zero_word] = (zero, 0, 0, False)
+        
+        self._freeze(vocabulary)
+
+
+class PinyinNumberWords(NumberWords):
+    """
+    Mandarin integer-to-words converter: 4-digit groups with wan, yi, ... scales
+    
+    Every group from 0 to 9999 is spelled out once in two forms: leading
+    ("shi wu" for 15) and following a higher group ("ling yi shi wu", as a
+    gap before the group's first digit is read as "ling"); the second form
+    is only built once a number above 9999 is converted. Without tones,
+    the scale word yi (10^8) is written like the digit yi.
+    """
+    
+    DIGITS = ('ling', 'yi', 'er', 'san', 'si', 'wu', 'liu', 'qi', 'ba', 'jiu')
+    # Place word per digit of a group, highest first
+    PLACES = ('qian', 'bai', 'shi', '')
+    SCALES = ('', 'wan', 'yi', 'zhao', 'jing', 'gai', 'zi', 'rang', 'gou')
+    NEGATIVE = 'fu'
+    ZERO = 'ling'
+    
+    def __init__(self, scales=None, negative=None, zero=None):
+        """
+        Args:
+            scales: Scale word per 4-digit group, lowest first; defaults to SCALES
+            negative: Prefix for negative numbers; defaults to NEGATIVE
+            zero: Word for 0; defaults to ZERO
+        """
+        self.scales = scales or self.SCALES
+        self.negative = negative or self.NEGATIVE
+        self.zero = zero or self.ZERO
+        self.groups = tuple(self._group(num, True) for num in range(10000))
+        # Built by _build_following the first time a number above 9999 is converted
+        self.following_groups = None
+        self._first_scale = None
+        self._largest_scale = 10000 ** (len(self.scales) - 1)
+        self._limit = self._largest_scale * 10000
+    
+    def to_words(self, num):
+        """
+        Convert an integer to words
+        
+        Args:
+            num (int): Any integer
+        
+        Returns:
+            str: e.g. "er shi san", "yi wan ling wu", "fu shi er", "ling"
+        """
+        if num < 0:
+            return f"{self.negative} {self.to_words(-num)}"
+        if num < 10000:
+            return self.groups[num] or self.zero
+        if num < 100000000:
+            if self._first_scale is None:
+                self._build_following()
+            high, low = divmod(num, 10000)
+            words = self._first_scale[high]
+            return f"{words} {self.following_groups[low]}" if low else words
+        if num >= self._limit:
+            # Beyond the scale table: spell the high part before the largest scale
+            high, low = divmod(num, self._largest_scale)
+            words = f"{self.to_words(high)} {self.scales[-1]}"
+            return f"{words} {self._groups_to_words(low, len(self.scales) - 1)}" if low else words
+        return self._groups_to_words(num)
+    
+    def _groups_to_words(self, num, width=None):
+        """
+        Words for 0 < num < 10000 ** len(scales), highest group first
+        
+        Args:
+            width (int, optional): When the number follows a higher part,
+                the groups it fills; leading zero groups then read as "ling"
+        """
+        if self.following_groups is None:
+            self._build_following()
+        groups = []
+        while num:
+            num, group = divmod(num, 10000)
+            groups.append(group)
+        following = width is not None
+        if following:
+            groups.extend([0] * (width - len(groups)))
+        
+        parts = []
+        gap = False
+        for scale in range(len(groups) - 1, -1, -1):
+            group = groups[scale]
+            if not group:
+                gap = True
+                continue
+            if parts or following:
+                words = self.following_groups[group]
+                if gap and group >= 1000:
+                    words = f"{self.zero} {words}"
+            else:
+                words = self.groups[group]
+            parts.append(f"{words} {self.scales[scale]}" if scale else words)
+            gap = False
+        return ' '.join(parts)
+    
+    def _build_following(self):
+        """Build the tables only numbers above 9999 need (the larger part of the pack's load time)"""
+        self.following_groups = tuple(self._group(num, False) for num in range(10000))
+        # Leading groups with the first scale word attached, for the common 5-8 digit case
+        self._first_scale = tuple(f"{words} {self.scales[1]}" for words in self.groups)
+    
+    def _group(self, num, leading):
+        """Words for one group 0-9999 ('' for 0)"""
+        words = []
+        zeros = False
+        for place, digit in zip(self.PLACES, (num // 1000, num // 100 % 10, num // 10 % 10, num % 10)):
+            if not digit:
+                # Zeros between digits, or before the first one of a following group
+                zeros = zeros or bool(words) or not leading
+                continue
+            if zeros:
+                words.append(self.zero)
+                zeros = False
+            if place == 'shi' and digit == 1 and leading and not words:
+                words.append(place)
+                continue
+            words.append('liang' if digit == 2 and place == 'qian' else self.DIGITS[digit])
+            if place:
+                words.append(place)
+        return ' '.join(words)
+
+
+class PinyinPack(LanguagePack):
+    """LanguagePack with the Mandarin number grammar and words generator"""
+    
+    def build_automaton(self, vocabulary):
+        return PinyinNumberAutomaton(vocabulary)
+    
+    def build_number_words(self):
+        return PinyinNumberWords(self.scales, self.negative_word, 'ling')
+
+
+PACK = PinyinPack(
+    'zh', 'Mandarin Chinese (pinyin)',
+    word_to_num=dict(DIGITS, ling=0, liang=2),
+    multipliers={'shi': 10, 'bai': 100, 'qian': 1000},
+    operations={'jia': 'add', 'jian': 'subtract', 'cheng': 'multiply', 'chu': 'divide'},
+    and_word='he',
+    then_word='ranhou',
+    scales=PinyinNumberWords.SCALES,
+    negative_word='fu',
+)
@@ -4,21 +4,211 @@ Parses and executes arithmetic expressions in natural language
 Example: "add four and five" -> "nine"
 """
 
-from classes.WordCalc import WordCalc
+import argparse
+import sys
 
-def main():
+# WordCalc (and with it the language tables) is imported by the mode that
+# runs, so --help and argument errors return without loading it
+from classes.LanguagePack import LanguagePack
+
+# Keys of WordCalc.ENGINES, repeated here for the same reason
+ENGINES = ('reference', 'phrase')
+
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(
+        description="WordCalc - Natural Language Calculator",
+        epilog="With no mode option, runs a short demo and then an interactive prompt. At the "
+               "prompt, an expression that stops early (e.g. 'add one hundred') is not reported "
+               "as an error: the prompt changes to '...>' and the next line continues it. Press "
+               "Enter on an empty line to evaluate the expression as it is.")
+    parser.add_argument('-c', '--command', metavar='EXPRESSION',
+                        help="evaluate EXPRESSION, print the result and exit (status 1 on error)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="read expressions from stdin and print only their results, one line "
+                             "each (the default when stdin is not a terminal)")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="evaluate one expression per line of FILE ('-' for stdin) and exit")
+    parser.add_argument('--workers', type=int, default=None, metavar='N',
+                        help="worker processes for --batch and --verify-engine (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=1000, metavar='N',
+                        help="expressions sent to a worker at a time (default: 1000)")
+    parser.add_argument('--mmap', action='store_true',
+                        help="memory-map the --batch FILE and tokenize its bytes in bulk")
+    parser.add_argument('--format', choices=('text', 'jsonl', 'csv', 'binary'), default='text',
+                        help="--batch output: result lines, JSON Lines, CSV or binary columns (default: text)")
+    parser.add_argument('--no-words', action='store_true',
+                        help="--batch output has numeric results only; words are never generated")
+    parser.add_argument('--cache-size', type=int, default=None, metavar='N',
+                        help="LRU result cache size, per worker for --batch (default: off)")
+    parser.add_argument('--cache-file', default=None, metavar='PATH',
+                        help="persistent SQLite result cache, shared by all workers and runs (default: off)")
+    parser.add_argument('--language', choices=LanguagePack.available(), default=LanguagePack.DEFAULT,
+                        help="language of expressions and results (default: en)")
+    parser.add_argument('--engine', choices=ENGINES, default=None, metavar='NAME',
+                        help="parser engine: reference (default) or phrase, which gives the same "
+                             "results with table lookups (see --verify-engine)")
+    parser.add_argument('--verify-engine', choices=ENGINES, metavar='NAME',
+                        help="compare engine NAME with --engine (the reference by default) on every "
+                             "number phrase and sampled invalid input, then exit (status 1 on any difference)")
+    parser.add_argument('--correct', type=int, default=None, metavar='DISTANCE',
+                        help="correct misspelled words within this edit distance (default: off)")
+    parser.add_argument('--serve', action='store_true',
+                        help="run a newline-delimited TCP server instead of the REPL")
+    parser.add_argument('--host', default='127.0.0.1', help="address for --serve (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="port for --serve (default: 8765)")
+    parser.add_argument('--max-connections', type=int, default=100, metavar='N',
+                        help="concurrent clients for --serve (default: 100)")
+    parser.add_argument('--max-pending', type=int, default=1000, metavar='N',
+                        help="unanswered lines per client before reading pauses (default: 1000)")
+    return parser.parse_args(argv)
+
+
+def run_command(args):
+    """
+    Evaluate the -c expression and print its result
+    
+    Returns:
+        int: Exit status, 1 if the expression is an error
+    """
+    from classes.WordCalc import WordCalc
+    
+    calc = WordCalc(correction_distance=args.correct, language=args.language, engine=args.engine)
+    result = calc.evaluate_result(args.command)
+    print(result)
+    return 0 if result.ok else 1
+
+
+def run_filter(args):
+    """
+    Print the result of each stdin line as soon as it is read, nothing else
+    
+    One output line per input line (blank lines give an error), so results
+    line up with their expressions. Output is flushed per line, so another
+    program can drive the calculator through a pipe; for bulk input,
+    --batch is faster.
+    """
+    from classes.WordCalc import WordCalc
+    
+    calc = WordCalc(cache_size=args.cache_size, correction_distance=args.correct,
+                    cache_path=args.cache_file, language=args.language, engine=args.engine)
+    try:
+        for line in sys.stdin:
+            print(calc.evaluate(line.rstrip('\n')), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        calc.close()
+
+
+def run_verify(args):
+    """
+    Compare an engine with the reference engine and print a summary
+    
+    Returns:
+        int: Exit status, 1 if any result differs
+    """
+    from classes.EngineVerifier import EngineVerifier
+    
+    verifier = EngineVerifier(args.verify_engine, reference=args.engine, language=args.language,
+                              workers=args.workers, chunk_size=args.chunk_size)
+    report = verifier.run()
+    print(f"{report['engine']} vs {report['reference']} ({report['language']}): "
+          f"{report['expressions']} expressions, {report['phrases']} number phrases "
+          f"covering {report['values']} values, {report['divergences']} difference(s)")
+    for expression, expected, actual in report['examples']:
+        print(f"  {expression!r}")
+        print(f"    {report['reference']}: {expected}")
+        print(f"    {report['engine']}: {actual}")
+    return 1 if report['divergences'] else 0
+
+
+def run_batch(args):
+    """
+    Evaluate a file (or stdin) line by line, writing results in input order
+    """
+    from classes.BatchRunner import BatchRunner
+    from classes.ResultWriter import ResultWriter
+    
+    runner = BatchRunner(workers=args.workers, chunk_size=args.chunk_size,
+                         cache_size=args.cache_size, correction_distance=args.correct,
+                         cache_path=args.cache_file, language=args.language, engine=args.engine)
+    sys.stdout.flush()
+    writer = ResultWriter.for_format(args.format, sys.stdout.buffer, words=not args.no_words)
+    if args.batch == '-':
+        runner.write((line.rstrip('\n') for line in sys.stdin), writer)
+    elif args.mmap:
+        runner.write_mapped(args.batch, writer)
+    else:
+        with open(args.batch, encoding='utf-8') as infile:
+            runner.write((line.rstrip('\n') for line in infile), writer)
+    writer.close()
+
+
+def run_server(args):
+    """
+    Serve newline-delimited expressions over TCP until interrupted
+    """
+    import asyncio
+    from classes.WordCalc import WordCalc
+    from classes.WordCalcServer import WordCalcServer
+    
+    calc = WordCalc(cache_size=args.cache_size, correction_distance=args.correct,
+                    cache_path=args.cache_file, language=args.language, engine=args.engine)
+    server = WordCalcServer(calc=calc, host=args.host,
+                            port=args.port, max_connections=args.max_connections,
+                            max_pending=args.max_pending)
+    
+    async def serve():
+        await server.start()
+        print(f"WordCalc server listening on {server.host}:{server.port}", file=sys.stderr)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\nGoodbye!", file=sys.stderr)
+    finally:
+        calc.close()
+
+
+def main(argv=None):
     """
     Main function with test examples
+    
+    Returns:
+        int: Exit status
     """
+    args = parse_args(argv)
+    if args.verify_engine:
+        return run_verify(args)
+    if args.command is not None:
+        return run_command(args)
+    if args.batch:
+        run_batch(args)
+        return 0
+    if args.serve:
+        run_server(args)
+        return 0
+    if args.quiet or not sys.stdin.isatty():
+        run_filter(args)
+        return 0
+    
+    from classes.WordCalc import WordCalc
+    
     print("=" * 60)
     print("WordCalc - Natural Language Calculator")
     print("=" * 60)
     print()
     
-    calc = WordCalc()
+    calc = WordCalc(correction_distance=args.correct, language=args.language, engine=args.engine)
     
-    # Test cases
-    test_cases = [
+    # Test cases (in English only)
+    test_cases = [] if args.language != LanguagePack.DEFAULT else [
         "add four and five",
         "subtract ten and three",
         "multiply two and four",
@@ -49,24 +239,43 @@ def main():
     print("=" * 60)
     print()
     
-    # Interactive mode
+    # Interactive mode: an expression that stops early (the parser fails at
+    # the end of the input) continues on the next line
+    session = calc.session()
     while True:
         try:
-            user_input = input("WordCalc> ").strip()
-            if user_input.lower() in ['quit', 'exit', 'q']:
+            user_input = input("     ...> " if session.text else "WordCalc> ").strip()
+            if not session.text and user_input.lower() in ['quit', 'exit', 'q']:
                 print("Goodbye!")
                 break
             if user_input:
-                result = calc.evaluate(user_input)
-                print(f"Result: {result}")
-                print()
+                state = session.append(user_input + ' ')
+                if state.status == session.INCOMPLETE:
+                    continue
+            elif not session.text:
+                continue
+            # A blank line evaluates an unfinished expression as it is
+            print_state(session.state)
+            session.clear()
         except KeyboardInterrupt:
             print("\nGoodbye!")
             break
         except EOFError:
+            if session.text:
+                print()
+                print_state(session.state)
             print("\nGoodbye!")
             break
+    return 0
+
+
+def print_state(state):
+    """Print a session's result in the REPL, with any spelling corrections"""
+    for original, corrected in state.result.corrections:
+        print(f"(corrected '{original}' to '{corrected}')")
+    print(f"Result: {state.result}")
+    print()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
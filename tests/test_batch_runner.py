@@ -0,0 +1,93 @@
+"""
+main.py --batch output, the same with any number of workers and with --mmap
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from classes.BatchRunner import BatchRunner
+from classes.ResultWriter import ColumnarResultWriter
+from classes.WordCalc import WordCalc
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --batch options that must not change the output
+RUNS = [('--workers', '1'), ('--workers', '2'), ('--mmap', '--workers', '1'), ('--mmap', '--workers', '2')]
+
+# Windows and old-Mac line ends, blank and whitespace-only lines, non-ASCII
+# words and separators, and a last line without a newline
+CONTENT = (
+    "add four and five\r\n"
+    "\r\n"
+    "divide ten and zero\n"
+    "   \n"
+    "multiply nine thousand and nine thousand and nine thousand and nine thousand\r"
+    "add fünf and two\n"
+    "add one and two\n"
+    "ADD Three AND Five\r\n"
+    "add one and two\x1cthen multiply by three\n"
+    "subtract ninety and ten then add one hundred and five and two\n"
+    "\n"
+    "plus three and five\r\n"
+) * 7 + "add one and two"
+
+
+def columns(data):
+    """Each column of a binary output, joined across blocks (block sizes follow the workers' chunks)"""
+    joined = {}
+    for block in ColumnarResultWriter.read_blocks(io.BytesIO(data)):
+        for name, column in block.items():
+            joined.setdefault(name, []).extend(column)
+    return joined
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.path = os.path.join(directory.name, 'expressions.txt')
+        with open(cls.path, 'w', encoding='utf-8', newline='') as outfile:
+            outfile.write(CONTENT)
+        # What --batch reads: the file in text mode, one expression per line
+        with open(cls.path, encoding='utf-8') as infile:
+            cls.expressions = [line.rstrip('\n') for line in infile]
+    
+    def batch(self, *options):
+        """stdout of main.py --batch on the test file, in small chunks"""
+        command = [sys.executable, 'main.py', '--batch', self.path, '--chunk-size', '5', *options]
+        return subprocess.run(command, cwd=ROOT, capture_output=True, check=True).stdout
+    
+    def test_text_output_matches_evaluate(self):
+        calc = WordCalc()
+        expected = ''.join(f"{calc.evaluate_result(expression)}\n" for expression in self.expressions)
+        self.assertEqual(len(self.expressions), 85)
+        for options in RUNS:
+            with self.subTest(options=options):
+                self.assertEqual(self.batch(*options).decode('utf-8'), expected)
+    
+    def test_formats_do_not_depend_on_workers(self):
+        for format in ('jsonl', 'csv', 'binary'):
+            with self.subTest(format=format):
+                outputs = [self.batch(*options, '--format', format) for options in RUNS]
+                if format == 'binary':
+                    outputs = list(map(columns, outputs))
+                for output in outputs[1:]:
+                    self.assertEqual(output, outputs[0])
+    
+    def test_mapped_ranges_split_anywhere(self):
+        """Worker byte ranges end at line ends, whatever their size"""
+        expected = list(BatchRunner(workers=1).run(self.expressions))
+        for range_size in (1, 7, 64, 1000):
+            with self.subTest(range_size=range_size):
+                self.assertEqual(list(BatchRunner(workers=2).run_mapped(self.path, range_size)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+CompiledExpression against evaluating the filled-in text
+"""
+
+import random
+import unittest
+
+from classes.WordCalc import WordCalc
+
+
+class TestCompiledExpression(unittest.TestCase):
+
+    TEMPLATES = [
+        "add {x} and five",
+        "multiply {x} and {y}",
+        "subtract one hundred and {x}",
+        "divide {x} and {y} and two thousand",
+        "add one hundred and five and {x}",
+        "add {x} and {x} and {y}",
+        "add {x} and {y} and {z}",
+        "{op} {x} and {y}",
+        "add {x} and {y} then multiply by {x}",
+        "add {x} hundred and {y}",
+        "add {x}teen and one",
+        "ADD  {x}  AND  nine",
+        "add {x}",
+    ]
+    
+    # Word bindings that are not plain number phrases
+    ODD = ['one hundred', 'one thousand', 'two thousand and five', 'one hundred and', 'and', '',
+           'five then add', 'fourty', 'one thousand twelve', 'zero hundred', 'twelve hundred', 'add']
+    
+    def bindings(self, rng):
+        choice = rng.random()
+        if choice < 0.5:
+            return rng.randrange(10000)
+        if choice < 0.6:
+            return rng.choice([-3, 10000, 123456, 0])
+        if choice < 0.8:
+            return rng.choice(self.ODD)
+        return self.calc.language.number_words.to_words(rng.randrange(10000))
+    
+    def setUp(self):
+        self.calc = WordCalc()
+    
+    def check(self, calc, rounds):
+        rng = random.Random(0)
+        for template in self.TEMPLATES:
+            compiled = calc.compile(template)
+            for _ in range(rounds):
+                bound = {name: self.bindings(rng) for name in compiled.names}
+                if 'op' in bound:
+                    bound['op'] = rng.choice(['add', 'divide', 'plus'])
+                text = template.format(**{name: compiled._binding_text(value) for name, value in bound.items()})
+                expected = calc.evaluate_result(text).to_dict()
+                self.assertEqual(compiled.result(**bound).to_dict(), expected, text)
+                self.assertEqual(compiled(**bound), calc.evaluate(text), text)
+    
+    def test_matches_evaluate(self):
+        self.check(self.calc, 400)
+    
+    def test_matches_evaluate_with_correction_and_cache(self):
+        self.check(WordCalc(cache_size=100, correction_distance=1), 100)
+    
+    def test_fixed_parse(self):
+        self.assertEqual(self.calc.compile("add {x} and five")._fixed, ('add', [None, 5]))
+        self.assertEqual(self.calc.compile("add one hundred and {x}")._fixed, ('add', [100, None]))
+        # "one hundred" followed by "and" could take it into the number
+        self.assertIsNone(self.calc.compile("add one hundred and {x} and two")._fixed)
+        self.assertIsNone(self.calc.compile("add {x} and one thousand and {y}")._fixed)
+        self.assertIsNone(self.calc.compile("add {x} and {y} then multiply by two")._fixed)
+    
+    def test_results_are_not_shared(self):
+        compiled = self.calc.compile("add {x} and five")
+        first = compiled.result(3)
+        first.value = 0
+        self.assertIsNot(compiled.result(3), first)
+        self.assertEqual(compiled.result(3).value, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
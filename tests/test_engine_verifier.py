@@ -0,0 +1,60 @@
+"""
+The phrase engine against the reference engine, on part of EngineVerifier's corpus
+"""
+
+import io
+import unittest
+from contextlib import redirect_stderr
+from itertools import islice
+
+import main
+from classes.EngineVerifier import EngineVerifier
+from classes.LanguagePack import LanguagePack
+from classes.WordCalc import WordCalc
+
+
+class SampledVerifier(EngineVerifier):
+    """EngineVerifier over every STEP-th expression of its corpus"""
+    
+    STEP = 20
+    
+    def expressions(self):
+        return islice(super().expressions(), 0, None, self.STEP)
+
+
+class TestEngineVerifier(unittest.TestCase):
+
+    def test_phrase_engine_matches_reference(self):
+        for code in LanguagePack.available():
+            for workers in (1, 2):
+                with self.subTest(language=code, workers=workers):
+                    verifier = SampledVerifier('phrase', language=code, workers=workers, samples=4000)
+                    report = verifier.run()
+                    self.assertGreater(report['expressions'], 1000)
+                    self.assertEqual(report['divergences'], 0, report['examples'])
+    
+    def test_reports_divergences(self):
+        """A different result is counted and kept as an example"""
+        verifier = EngineVerifier('phrase', workers=1)
+        calc = WordCalc()
+        expressions = ["add four and five", "multiply two and three"]
+        count, divergences = verifier.compare(calc, WordCalc(language='zh'), expressions)
+        self.assertEqual(count, 2)
+        self.assertEqual([expression for expression, _, _ in divergences], expressions)
+        self.assertEqual(divergences[0][1], calc.evaluate_result(expressions[0]).to_dict())
+    
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            EngineVerifier('bogus')
+    
+    def test_command_line_engines(self):
+        """main.py lists the engines itself, so it can check them without importing WordCalc"""
+        self.assertEqual(main.ENGINES, tuple(WordCalc.ENGINES))
+        for option in ('--engine', '--verify-engine'):
+            with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+                main.parse_args([option, 'bogus'])
+            self.assertEqual(getattr(main.parse_args([option, 'phrase']), option[2:].replace('-', '_')), 'phrase')
+
+
+if __name__ == '__main__':
+    unittest.main()
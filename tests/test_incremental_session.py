@@ -0,0 +1,84 @@
+"""
+IncrementalSession against WordCalc.evaluate_result
+
+The session re-lexes incrementally and parses with the Parser; these
+tests check it against whole-text evaluation, as typed and as edited.
+"""
+
+import random
+import unittest
+from itertools import islice
+
+from classes.EngineVerifier import EngineVerifier
+from classes.WordCalc import WordCalc
+
+
+def corpus(language=None, step=150):
+    """Every step-th expression of the engine verifier's corpus"""
+    verifier = EngineVerifier('reference', language=language, workers=1, samples=4000, seed=1)
+    return list(islice(verifier.expressions(), 0, None, step))
+
+
+class TestIncrementalSession(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.expressions = corpus()
+    
+    def assertSameAsEvaluate(self, calc, session, text):
+        expected = calc.evaluate_result(text).to_dict()
+        self.assertEqual(session.state.result.to_dict(), expected, repr(text))
+    
+    def test_whole_expressions(self):
+        for calc in (WordCalc(), WordCalc(correction_distance=1)):
+            session = calc.session()
+            for expression in self.expressions:
+                session.update(expression)
+                self.assertSameAsEvaluate(calc, session, expression)
+    
+    def test_typed_character_by_character(self):
+        calc = WordCalc()
+        for expression in self.expressions[::4]:
+            session = calc.session()
+            for end in range(1, len(expression) + 1):
+                session.update(expression[:end])
+                self.assertSameAsEvaluate(calc, session, expression[:end])
+    
+    def test_edits(self):
+        rng = random.Random(0)
+        calc = WordCalc()
+        session = calc.session()
+        for expression in self.expressions[::2]:
+            # Backspace part of the way, then edit somewhere in the middle
+            session.update(expression)
+            session.backspace(rng.randrange(1, 8))
+            self.assertSameAsEvaluate(calc, session, session.text)
+            position = rng.randrange(len(expression))
+            text = expression[:position] + rng.choice([' and ', ' hundred ', 'x', '']) + expression[position + 1:]
+            session.update(text)
+            self.assertSameAsEvaluate(calc, session, text)
+    
+    def test_other_language(self):
+        calc = WordCalc(language='zh')
+        session = calc.session()
+        for expression in corpus('zh', step=100):
+            session.update(expression)
+            self.assertSameAsEvaluate(calc, session, expression)
+    
+    def test_status(self):
+        session = WordCalc().session()
+        self.assertEqual(session.update("add one hund").status, session.INCOMPLETE)
+        self.assertEqual(session.append("red and five").status, session.COMPLETE)
+        self.assertEqual(session.state.result.value, 105)
+        self.assertEqual(session.update("add one and").status, session.INCOMPLETE)
+        self.assertEqual(session.update("plus one and two").status, session.ERROR)
+        # Unfinished where the Parser fails at the end of the input, anywhere in the grammar
+        for text in ("add", "add one hundred", "add one and two then", "add one and two then multiply by"):
+            self.assertEqual(session.update(text).status, session.INCOMPLETE, text)
+        for text in ("add twelve hundred", "add one and two three", "add one and two then fiv "):
+            self.assertEqual(session.update(text).status, session.ERROR, text)
+        self.assertEqual(session.clear().status, session.EMPTY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Instrumented evaluation: the same results, with each outcome counted once
+"""
+
+import unittest
+from collections import Counter
+
+from classes.ErrorCode import ErrorCode
+from classes.Instrumentation import InMemoryExporter, Instrumentation
+from classes.WordCalc import WordCalc
+from tests.test_result import EXPRESSION_ERRORS
+
+
+EXPRESSIONS = [expression for cases in EXPRESSION_ERRORS.values() for expression, _ in cases]
+EXPRESSIONS += ["add four and five", "add one hundred and thirty and twenty", "add fvie and two"]
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_results_are_unchanged(self):
+        for settings in ({}, {'cache_size': 4}, {'correction_distance': 1}):
+            expected = [result.to_dict() for result in WordCalc(**settings).evaluate_results(EXPRESSIONS)]
+            calc = WordCalc(instrumentation=Instrumentation(), **settings)
+            with self.subTest(settings=settings):
+                self.assertEqual([result.to_dict() for result in calc.evaluate_results(EXPRESSIONS)], expected)
+                self.assertEqual([calc.evaluate_result(expression).to_dict() for expression in EXPRESSIONS],
+                                 expected)
+    
+    def test_errors_are_counted_by_name(self):
+        exporter = InMemoryExporter()
+        calc = WordCalc(instrumentation=Instrumentation(exporter))
+        results = calc.evaluate_results(EXPRESSIONS)
+        names = [result.error_name for result in results]
+        snapshot = calc.instrumentation.snapshot()
+        self.assertEqual(snapshot['evaluations'], len(EXPRESSIONS))
+        self.assertEqual(snapshot['errors'], Counter(name for name in names if name))
+        self.assertEqual(set(snapshot['errors']), {ErrorCode.name(code) for code in EXPRESSION_ERRORS})
+        self.assertEqual([event['error'] for event in exporter.events], names)
+    
+    def test_and_decisions_and_cache_use(self):
+        calc = WordCalc(cache_size=4, instrumentation=Instrumentation())
+        for _ in range(3):
+            calc.evaluate("add one hundred and thirty and twenty")
+        calc.evaluate("multiply two thousand five hundred and three")
+        counters = calc.instrumentation.snapshot()['counters']
+        # The first "and" of each parse is checked; only the 130's is inside its number
+        self.assertEqual((counters['and_checks'], counters['and_within']), (2, 1))
+        self.assertEqual((counters['cache_miss'], counters['cache_hit']), (2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
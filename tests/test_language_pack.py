@@ -0,0 +1,87 @@
+"""
+Language packs: every number through each pack's words and grammar and back
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from classes.LanguagePack import LanguagePack
+from classes.WordCalc import WordCalc
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def keyword(pack, operation):
+    """The pack's keyword for an operation"""
+    return next(word for word, name in pack.operations.items() if name == operation)
+
+
+def spoken(pack, number):
+    """
+    Words for a number (0-9999) that the pack's grammar reads back as it
+    
+    These are the pack's own number words, except in English after
+    "thousand": a bare teen or tens word there ends the number before the
+    thousand (NumberAutomaton.GIVE_BACK), so it needs an "and".
+    """
+    words = pack.number_words.to_words(number)
+    rest = number % 1000
+    if pack.code == 'en' and number >= 1000 and (10 <= rest < 20 or 20 <= rest < 100 and rest % 10 == 0):
+        words = words.replace(' thousand ', f" thousand {pack.and_word} ")
+    return words
+
+
+class TestLanguagePack(unittest.TestCase):
+
+    def test_every_number_round_trips(self):
+        """Each number's words parse back to it, and its words are the result's"""
+        for code in LanguagePack.available():
+            calc = WordCalc(language=code)
+            pack = calc.language
+            to_words = pack.number_words.to_words
+            prefix = keyword(pack, 'add')
+            suffix = f"{pack.and_word} {to_words(0)}"
+            expressions = [f"{prefix} {spoken(pack, number)} {suffix}" for number in range(10000)]
+            with self.subTest(language=code):
+                results = [(result.value, result.words) for result in calc.evaluate_results(expressions)]
+                self.assertEqual(results, [(number, to_words(number)) for number in range(10000)])
+    
+    def test_pinyin_results(self):
+        calc = WordCalc(language='zh')
+        pack = calc.language
+        self.assertEqual(calc.evaluate("jia er bai he liang bai"), 'si bai')
+        self.assertEqual(calc.evaluate("jian wu he shi er"), 'fu qi')
+        self.assertEqual(calc.evaluate("jia yi qian ling wu he shi jiu"), 'yi qian ling er shi si')
+        # Past 9999, four-digit groups with scale words
+        result = calc.evaluate_result("cheng jiu qian jiu bai jiu shi jiu he jiu qian jiu bai jiu shi jiu")
+        self.assertEqual(result.value, 9999 * 9999)
+        self.assertEqual(result.words, "jiu qian jiu bai jiu shi ba wan ling yi")
+        chained = f"jia yi he er {pack.then_word} cheng san"
+        self.assertEqual(calc.evaluate_result(chained).value, 9)
+        self.assertEqual(pack.number_words.to_words_many([0, 10005, -12, 10 ** 8]),
+                         ['ling', 'yi wan ling wu', 'fu shi er', 'yi yi'])
+        self.assertEqual(calc.evaluate_result("jia yi bai he").error_name, 'EXPECTED_NUMBER')
+        self.assertEqual(calc.evaluate_result("jia ling bai he yi").error_name, 'ZERO_HUNDRED')
+    
+    def test_packs_are_loaded_on_first_use(self):
+        script = ("from classes.WordCalc import WordCalc; from classes.LanguagePack import LanguagePack; "
+                  "WordCalc().evaluate('add one and two'); print(*LanguagePack.loaded())")
+        output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout
+        self.assertEqual(output.split(), ['en'])
+    
+    def test_get(self):
+        pack = LanguagePack.get('zh')
+        self.assertIs(LanguagePack.get(pack), pack)
+        self.assertEqual(LanguagePack.get().code, LanguagePack.DEFAULT)
+        with self.assertRaises(ValueError):
+            LanguagePack.get('xx')
+        with self.assertRaises(ValueError):
+            WordCalc(language='xx')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+NumberAutomaton and Parser against the original recursive-descent grammar
+"""
+
+import itertools
+import unittest
+
+from classes.ErrorCode import ErrorCode
+from classes.LanguagePack import LanguagePack
+from classes.NumberAutomaton import NumberAutomaton
+from classes.Parser import Parser
+from classes.WordCalcError import WordCalcError
+from tests.baseline_parser import Parser as BaselineParser
+
+
+def baseline(tokens):
+    """(operation, num1, num2), or the error message of the original parser"""
+    try:
+        return BaselineParser(tokens).parse()
+    except WordCalcError as e:
+        return str(e)
+
+
+class TestNumberAutomaton(unittest.TestCase):
+
+    # Operands that bring the "and" guards into play next to a phrase
+    PARTNERS = ['one hundred', 'two thousand', 'five', 'twenty', 'three hundred and twelve',
+                'four thousand and six', 'ninety nine', 'seven thousand eight hundred and one']
+    
+    # Original errors for the tokens a third operand or a "then" step starts with
+    EXTENDED = ("Unexpected tokens at end: 'and ", "Unexpected tokens at end: 'then ",
+                "Unexpected tokens at end: 'and'", "Unexpected tokens at end: 'then'")
+    
+    def assertSameAsBaseline(self, tokens):
+        """
+        The current Parser must parse tokens as the original did
+        
+        Further operands and "then" steps were trailing tokens to the
+        original grammar, which rejected them; there the first two operands
+        must be the ones the original parsed before them. Anything else
+        must match exactly, value or error message.
+        """
+        expected = baseline(tokens)
+        parser = Parser(tokens)
+        parsed = parser.try_parse()
+        if isinstance(expected, str) and expected.startswith(self.EXTENDED):
+            extra = len(expected.split("'")[1].split())
+            first = (parser.operation, parser.num1, parser.num2)
+            self.assertEqual(first, baseline(tokens[:-extra]), ' '.join(tokens))
+            return
+        actual = parsed if parsed is not None else ErrorCode.message(*parser.error)
+        self.assertEqual(actual, expected, ' '.join(tokens))
+    
+    def test_every_phrase_in_both_positions(self):
+        words = Parser.VOCABULARY.words
+        paths = list(Parser.NUMBER_AUTOMATON.paths())
+        self.assertGreater(len(paths), 39000)
+        for index, (ids, _, _, _) in enumerate(paths):
+            phrase = [words[token_id] for token_id in ids]
+            partner = self.PARTNERS[index % len(self.PARTNERS)].split()
+            self.assertSameAsBaseline(['add', *phrase, 'and', *partner])
+            self.assertSameAsBaseline(['subtract', *partner, 'and', *phrase])
+    
+    def test_every_short_token_sequence(self):
+        alphabet = ['add', 'and', 'zero', 'one', 'five', 'twelve', 'twenty', 'thirty',
+                    'hundred', 'thousand', 'plus']
+        for length in range(1, 5):
+            for tokens in itertools.product(alphabet, repeat=length):
+                self.assertSameAsBaseline(list(tokens))
+        for tail in itertools.product(alphabet, repeat=4):
+            self.assertSameAsBaseline(['multiply', 'one', *tail])
+    
+    def test_path_values_match(self):
+        """paths() reports what match() returns for each path on its own"""
+        automaton = Parser.NUMBER_AUTOMATON
+        for ids, value, accept, _ in automaton.paths():
+            tokens = [Parser.VOCABULARY.words[token_id] for token_id in ids]
+            total, end = automaton.match(tokens, ids, 0, guard=lambda position: True)
+            if accept == NumberAutomaton.ACCEPT:
+                self.assertEqual((total, end), (value, len(ids)), tokens)
+            else:
+                self.assertIsNone(value)
+    
+    def test_other_languages_build(self):
+        for code in LanguagePack.available():
+            pack = LanguagePack.get(code)
+            values = {value for _, value, _, _ in pack.automaton.paths() if value is not None}
+            self.assertEqual(values, set(range(10000)), code)
+
+
+if __name__ == '__main__':
+    unittest.main()
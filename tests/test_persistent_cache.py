@@ -0,0 +1,125 @@
+"""
+PersistentCache across calculators, settings and reopened files
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from classes.PersistentCache import PersistentCache
+from classes.WordCalc import WordCalc
+
+
+EXPRESSIONS = [
+    "add four and five",
+    "divide ten and zero",
+    "add one and two and three then multiply by four",
+    "multiply nine thousand and nine thousand and nine thousand and nine thousand and nine thousand",
+    "plus three and five",
+    "add fvie and two",
+    "subtract fourty and one hundred",
+]
+
+
+class TestPersistentCache(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache.db')
+    
+    def results(self, expressions=EXPRESSIONS, **settings):
+        """to_dict() of each result, from a calculator on the cache file, closed after"""
+        calc = WordCalc(cache_path=self.path, **settings)
+        try:
+            return [calc.evaluate_result(expression).to_dict() for expression in expressions]
+        finally:
+            calc.close()
+    
+    def stored_hits(self, expression):
+        """Use count of an entry as the file has it now"""
+        db = sqlite3.connect(self.path)
+        try:
+            return db.execute("SELECT hits FROM results WHERE key = ?", (expression,)).fetchone()[0]
+        finally:
+            db.close()
+    
+    def stored_cache(self, **options):
+        """Cache on the file holding the first expression's result"""
+        cache = PersistentCache(self.path, **options)
+        cache.put(tuple(EXPRESSIONS[0].split()), WordCalc().evaluate_result(EXPRESSIONS[0]))
+        cache.flush()
+        return cache
+    
+    def test_reopened_file_gives_the_same_results(self):
+        expected = [WordCalc().evaluate_result(expression).to_dict() for expression in EXPRESSIONS]
+        self.assertEqual(self.results(), expected)
+        # Served from disk this time (everything but the value past int64 was stored)
+        calc = WordCalc(cache_path=self.path)
+        self.assertEqual(len(calc.cache), len(EXPRESSIONS) - 1)
+        self.assertEqual([calc.evaluate_result(expression).to_dict() for expression in EXPRESSIONS], expected)
+        self.assertEqual(calc.cache_info().hits, len(EXPRESSIONS) - 1)
+        calc.close()
+    
+    def test_settings_do_not_share_results(self):
+        settings = [{}, {'correction_distance': 1}, {'correction_distance': 2}, {'language': 'zh'}]
+        expected = [[WordCalc(**options).evaluate_result(expression).to_dict() for expression in EXPRESSIONS]
+                    for options in settings]
+        # Each round reads what the earlier ones wrote, with other settings
+        for _ in range(2):
+            for options, results in zip(settings, expected):
+                self.assertEqual(self.results(**options), results, options)
+        self.assertEqual(expected[0][5]['error'], 'EXPECTED_NUMBER')
+        self.assertEqual(expected[1][5]['corrections'], [['fvie', 'five']])
+    
+    def test_other_format_versions_are_refused(self):
+        self.results()
+        db = sqlite3.connect(self.path)
+        db.execute("UPDATE meta SET value = '1' WHERE name = 'format_version'")
+        db.commit()
+        db.close()
+        with self.assertRaises(ValueError):
+            PersistentCache(self.path)
+    
+    def test_unversioned_files_are_refused(self):
+        db = sqlite3.connect(self.path)
+        db.execute("CREATE TABLE results (key TEXT PRIMARY KEY, operation TEXT)")
+        db.execute("INSERT INTO results VALUES ('add four and five', 'add')")
+        db.commit()
+        db.close()
+        with self.assertRaises(ValueError):
+            WordCalc(cache_path=self.path)
+    
+    def test_eviction_keeps_the_most_used(self):
+        cache = PersistentCache(self.path, max_entries=2, flush_every=1)
+        calc = WordCalc()
+        results = {expression: calc.evaluate_result(expression) for expression in EXPRESSIONS[:3]}
+        for expression, result in results.items():
+            cache.put(tuple(expression.split()), result)
+            cache.get(tuple(EXPRESSIONS[0].split()))
+        cache.close()
+        cache = PersistentCache(self.path)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(tuple(EXPRESSIONS[0].split())))
+        cache.close()
+    
+    def test_hit_counts_reach_disk_without_close(self):
+        """A process that only hits still writes its use counts as it goes"""
+        cache = self.stored_cache(flush_interval=0)
+        for _ in range(5):
+            self.assertIsNotNone(cache.get(tuple(EXPRESSIONS[0].split())))
+        # The evaluation that stored it, then the five hits
+        self.assertEqual(self.stored_hits(EXPRESSIONS[0]), 6)
+        cache.close()
+    
+    def test_hit_counts_wait_for_the_flush_interval(self):
+        cache = self.stored_cache(flush_interval=3600)
+        self.assertIsNotNone(cache.get(tuple(EXPRESSIONS[0].split())))
+        self.assertEqual(self.stored_hits(EXPRESSIONS[0]), 1)
+        cache.close()
+        self.assertEqual(self.stored_hits(EXPRESSIONS[0]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
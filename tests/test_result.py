@@ -0,0 +1,88 @@
+"""
+Every ErrorCode as a Result, and as the WordCalcError the raising API gives
+"""
+
+import unittest
+
+from classes.ErrorCode import ErrorCode
+from classes.Interpreter import Interpreter
+from classes.Lexer import Lexer
+from classes.Parser import Parser
+from classes.WordCalc import WordCalc
+from classes.WordCalcError import WordCalcError
+
+
+# Error kind -> (expression, error detail) for every error an expression can give
+EXPRESSION_ERRORS = {
+    ErrorCode.EMPTY_INPUT: [("", None), (" \t ", None)],
+    ErrorCode.INVALID_OPERATION: [("plus three and five", 'plus'), ("add one and two then plus three", 'plus'),
+                                  ("add one and two then", None)],
+    ErrorCode.EXPECTED_NUMBER: [("add fvie and two", 'fvie'), ("add", None), ("add one and", None)],
+    ErrorCode.ZERO_HUNDRED: [("add zero hundred and one", 0)],
+    ErrorCode.ZERO_THOUSAND: [("add zero thousand and one", 0)],
+    ErrorCode.INVALID_HUNDREDS: [("add twelve hundred and one", 12)],
+    ErrorCode.INVALID_THOUSANDS: [("add twenty thousand and one", 20)],
+    ErrorCode.EXPECTED_AND: [("add four five", 'five'), ("add four", None)],
+    ErrorCode.UNEXPECTED_TOKENS: [("add four and five six seven", 'six seven')],
+    ErrorCode.DIVISION_BY_ZERO: [("divide ten and zero", None), ("add one and two then divide by zero", None)],
+}
+
+
+class TestResult(unittest.TestCase):
+
+    def assertError(self, result, code, detail):
+        self.assertFalse(result.ok)
+        self.assertEqual((result.error_code, result.error_detail), (code, detail))
+        self.assertEqual(result.error_name, ErrorCode.name(code))
+        self.assertEqual(result.message, ErrorCode.message(code, detail))
+        self.assertIsNone(result.value)
+        self.assertIsNone(result.words)
+        self.assertEqual(result.to_dict()['error'], ErrorCode.name(code))
+    
+    def test_every_error_code_is_covered(self):
+        covered = set(EXPRESSION_ERRORS) | {ErrorCode.OK, ErrorCode.UNKNOWN_OPERATION, ErrorCode.UNEXPECTED}
+        self.assertEqual(covered, set(ErrorCode.NAMES))
+        self.assertEqual(set(ErrorCode.MESSAGES), set(ErrorCode.NAMES) - {ErrorCode.OK})
+    
+    def test_expression_errors(self):
+        calc = WordCalc()
+        for code, cases in EXPRESSION_ERRORS.items():
+            for expression, detail in cases:
+                with self.subTest(expression=expression):
+                    result = calc.evaluate_result(expression)
+                    self.assertError(result, code, detail)
+                    self.assertEqual(str(result), f"Error: {ErrorCode.message(code, detail)}")
+                    self.assertEqual(calc.evaluate(expression), str(result))
+    
+    def test_raising_api_gives_the_same_errors(self):
+        """Lexer.tokenize, Parser.parse and Interpreter.execute raise what the Result holds"""
+        for code, cases in EXPRESSION_ERRORS.items():
+            for expression, detail in cases:
+                with self.subTest(expression=expression):
+                    with self.assertRaises(WordCalcError) as raised:
+                        parser = Parser(Lexer(expression).tokenize())
+                        parsed = parser.parse()
+                        Interpreter(*parsed, chain=parser.chain).execute()
+                    error = raised.exception
+                    self.assertEqual((error.code, error.detail), (code, detail))
+                    self.assertEqual(str(error), ErrorCode.message(code, detail))
+    
+    def test_errors_past_the_parser(self):
+        calc = WordCalc()
+        self.assertError(calc.result_for_operands('power', (2, 3)), ErrorCode.UNKNOWN_OPERATION, 'power')
+        # An exception inside evaluation is caught and kept as the detail
+        result = calc.result_for_operands('add', ('two', 3))
+        self.assertEqual(result.error_code, ErrorCode.UNEXPECTED)
+        self.assertIsInstance(result.error_detail, TypeError)
+        self.assertEqual(str(result), f"Unexpected error: {result.error_detail}")
+    
+    def test_success(self):
+        result = WordCalc().evaluate_result("add one and two then multiply by four")
+        self.assertTrue(result.ok)
+        self.assertEqual((result.error_code, result.error_name, result.message), (ErrorCode.OK, None, None))
+        self.assertEqual((result.value, result.words, str(result)), (12, 'twelve', 'twelve'))
+        self.assertEqual(result.chain, (('multiply', (4,)),))
+
+
+if __name__ == '__main__':
+    unittest.main()
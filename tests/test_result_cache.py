@@ -0,0 +1,67 @@
+"""
+WordCalc's result cache: normalized keys, LRU eviction, and every caller its own Result
+"""
+
+import unittest
+
+from classes.Instrumentation import Instrumentation
+from classes.ResultCache import ResultCache
+from classes.WordCalc import WordCalc
+
+
+class TestResultCache(unittest.TestCase):
+
+    EXPRESSION = "multiply thirty two and seventeen"
+    
+    def calcs(self):
+        return [WordCalc(cache_size=10), WordCalc(cache_size=10, instrumentation=Instrumentation())]
+    
+    def test_hits_are_copies(self):
+        for calc in self.calcs():
+            first = calc.evaluate_result(self.EXPRESSION)
+            second = calc.evaluate_result(self.EXPRESSION)
+            self.assertIsNot(first, second)
+            self.assertEqual(first.to_dict(), second.to_dict())
+            first.words = 'changed'
+            first.value = 0
+            third = calc.evaluate_result(self.EXPRESSION)
+            self.assertEqual((third.value, third.words), (544, 'five hundred forty four'))
+            self.assertEqual(calc.cache_info().hits, 2)
+    
+    def test_words_as_asked_for(self):
+        for calc in self.calcs():
+            self.assertIsNone(calc.evaluate_result(self.EXPRESSION, words=False).words)
+            self.assertEqual(calc.evaluate_result(self.EXPRESSION).words, 'five hundred forty four')
+            self.assertIsNone(calc.evaluate_result(self.EXPRESSION, words=False).words)
+            # Words made for a hit belong to that caller's copy
+            key = tuple(self.EXPRESSION.split())
+            self.assertIsNone(calc.cache.get(key).words)
+    
+    
+    def test_spellings_of_the_same_tokens_share_an_entry(self):
+        calc = WordCalc(cache_size=10)
+        spellings = (self.EXPRESSION, "  Multiply THIRTY two\tand  seventeen ", "MULTIPLY thirty TWO and SEVENTEEN")
+        for expression in spellings:
+            self.assertEqual(calc.evaluate(expression), 'five hundred forty four')
+        info = calc.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+    
+    def test_least_recently_used_is_evicted(self):
+        cache = ResultCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual(cache.info(), (3, 1, 1, 2, 2))
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 0, 2, 0))
+    
+    def test_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            ResultCache(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
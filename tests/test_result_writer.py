@@ -0,0 +1,154 @@
+"""
+ResultWriter formats, written and read back
+"""
+
+import csv
+import io
+import json
+import unittest
+
+from classes.BatchRunner import BatchRunner
+from classes.Result import Result
+from classes.ResultWriter import ColumnarResultWriter, ResultWriter
+from classes.WordCalc import WordCalc
+
+
+EXPRESSIONS = [
+    "add four and five",
+    "subtract ten and ninety",
+    "divide ten and zero",
+    "plus three and five",
+    "",
+    "add one hundred and five and two",
+    "multiply nine thousand and nine thousand and nine thousand and nine thousand and nine thousand",
+    "multiply two and three",
+    "add one and two then multiply by three",
+    "add one and two then add four and five then subtract six",
+]
+
+
+def expected_rows(results, words):
+    """What every structured format should hold for each result"""
+    rows = []
+    for result in results:
+        row = {
+            'op': ResultWriter.OPERATION_CODES.get(result.operation, ResultWriter.NO_OPERATION),
+            'operands': list(result.operands),
+            'chain': [[ResultWriter.OPERATION_CODES[operation], list(operands)]
+                      for operation, operands in result.chain],
+            'value': result.value,
+            'error': result.error_code,
+        }
+        if words:
+            row['words'] = result.words
+        rows.append(row)
+    return rows
+
+
+def read_jsonl(data, words):
+    return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+
+def read_csv(data, words):
+    rows = []
+    for record in csv.DictReader(io.StringIO(data.decode('utf-8'))):
+        row = {
+            'op': int(record['op']),
+            'operands': [int(operand) for operand in record['operands'].split()],
+            'chain': [[int(op), [int(operand) for operand in operands]]
+                      for op, *operands in (step.split() for step in record['chain'].split(';') if step)],
+            'value': int(record['value']) if record['value'] else None,
+            'error': int(record['error']),
+        }
+        if words:
+            row['words'] = record['words'] or None
+        rows.append(row)
+    return rows
+
+
+def read_binary(data, words):
+    rows = []
+    for block in ColumnarResultWriter.read_blocks(io.BytesIO(data)):
+        big = iter(block['big_values'])
+        operands = iter(block['operands'])
+        step_ops = iter(block['step_op'])
+        step_operand_counts = iter(block['step_operand_count'])
+        step_operands = iter(block['step_operands'])
+        for index in range(len(block['op'])):
+            value = block['value'][index]
+            if block['flags'][index] & ColumnarResultWriter.VALUE_TEXT:
+                value = next(big)
+            row = {
+                'op': block['op'][index],
+                'operands': [next(operands) for _ in range(block['operand_count'][index])],
+                'chain': [[next(step_ops), [next(step_operands) for _ in range(next(step_operand_counts))]]
+                          for _ in range(block['step_count'][index])],
+                'value': value if block['error'][index] == 0 else None,
+                'error': block['error'][index],
+            }
+            if words:
+                row['words'] = block['words'][index] or None
+            rows.append(row)
+    return rows
+
+
+READERS = {'jsonl': read_jsonl, 'csv': read_csv, 'binary': read_binary}
+
+
+class TestResultWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.calc = WordCalc()
+    
+    def write(self, name, results, words=True, block_size=4):
+        file = io.BytesIO()
+        with ResultWriter.for_format(name, file, words=words, block_size=block_size) as writer:
+            writer.write_all(results)
+        return file.getvalue()
+    
+    def test_text(self):
+        results = list(self.calc.evaluate_results(EXPRESSIONS))
+        data = self.write('text', results)
+        self.assertEqual(data.decode('utf-8').split('\n')[:-1], [str(result) for result in results])
+    
+    def test_round_trips(self):
+        for words in (True, False):
+            results = list(self.calc.evaluate_results(EXPRESSIONS, words=words))
+            for name, read in READERS.items():
+                with self.subTest(format=name, words=words):
+                    data = self.write(name, results, words)
+                    self.assertEqual(read(data, words), expected_rows(results, words))
+    
+    def test_chains(self):
+        """Every structured format keeps the "then" steps after the first"""
+        results = list(self.calc.evaluate_results(EXPRESSIONS[-2:]))
+        for name, read in READERS.items():
+            rows = read(self.write(name, results), True)
+            self.assertEqual([row['chain'] for row in rows], [[[2, [3]]], [[0, [4, 5]], [1, [6]]]], name)
+    
+    def test_empty(self):
+        for name, read in READERS.items():
+            self.assertEqual(read(self.write(name, []), True), [])
+    
+    def test_value_past_int64_in_a_batch(self):
+        """A result too large for int64 used to lose the whole binary batch"""
+        results = list(self.calc.evaluate_results(EXPRESSIONS))
+        self.assertGreater(results[6].value, 1 << 63)
+        for workers in (1, 2):
+            file = io.BytesIO()
+            writer = ResultWriter.for_format('binary', file)
+            BatchRunner(workers=workers, chunk_size=3).write(EXPRESSIONS, writer)
+            writer.close()
+            self.assertEqual(read_binary(file.getvalue(), True), expected_rows(results, True))
+    
+    def test_values_at_the_int64_limits(self):
+        values = [(1 << 63) - 1, 1 << 63, -(1 << 63), -(1 << 63) - 1, -(10 ** 40)]
+        results = [Result('subtract', (1, 2), value, None) for value in values]
+        data = self.write('binary', results, words=False, block_size=10)
+        self.assertEqual([row['value'] for row in read_binary(data, False)], values)
+        block, = ColumnarResultWriter.read_blocks(io.BytesIO(data))
+        self.assertEqual(list(block['flags']), [0, 1, 0, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+SpellCorrector's index lookups against a scan of the whole vocabulary
+"""
+
+import random
+import string
+import unittest
+
+from classes.LanguagePack import LanguagePack
+from classes.SpellCorrector import SpellCorrector
+from classes.WordCalc import WordCalc
+
+
+def edits(word):
+    """Every string one deletion, insertion, substitution or adjacent swap away from word"""
+    letters = string.ascii_lowercase
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    found = {left + right[1:] for left, right in splits if right}
+    found |= {left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1}
+    found |= {left + letter + right[1:] for left, right in splits if right for letter in letters}
+    found |= {left + letter + right for left, right in splits for letter in letters}
+    return found
+
+
+def nearest(corrector, word):
+    """What correct() should return, found by measuring every vocabulary word"""
+    if word in corrector.known:
+        return word
+    limit = min(corrector.max_distance, (len(word) - 1) // 2)
+    ranked = [(corrector._distance(word, candidate), rank) for rank, candidate in enumerate(corrector.words)]
+    distance, rank = min(ranked)
+    return corrector.words[rank] if distance <= limit else None
+
+
+class TestSpellCorrector(unittest.TestCase):
+
+    def test_single_edits_match_a_full_scan(self):
+        rng = random.Random(0)
+        for code in LanguagePack.available():
+            corrector = SpellCorrector(LanguagePack.get(code).vocabulary.words[1:], 1)
+            # A sample of every word's edits, some thousands per language
+            typos = rng.sample(sorted({typo for word in corrector.words for typo in edits(word)}), 3000)
+            with self.subTest(language=code):
+                for typo in typos:
+                    self.assertEqual(corrector.correct(typo), nearest(corrector, typo), typo)
+    
+    def test_double_edits_match_a_full_scan(self):
+        rng = random.Random(0)
+        for code in LanguagePack.available():
+            corrector = SpellCorrector(LanguagePack.get(code).vocabulary.words[1:], 2)
+            typos = {rng.choice(sorted(edits(rng.choice(sorted(edits(word))))))
+                     for word in corrector.words for _ in range(25)}
+            with self.subTest(language=code):
+                for typo in sorted(typos):
+                    self.assertEqual(corrector.correct(typo), nearest(corrector, typo), typo)
+    
+    def test_corrections(self):
+        words = LanguagePack.get().vocabulary.words[1:]
+        one, two = SpellCorrector(words, 1), SpellCorrector(words, 2)
+        # Swaps of adjacent letters count as one edit
+        for typo, word in [("fvie", "five"), ("adn", "and"), ("hunderd", "hundred"), ("thousnad", "thousand"),
+                           ("fiv", "five"), ("fivee", "five"), ("fice", "five"), ("mulitply", "multiply")]:
+            self.assertEqual((one.correct(typo), two.correct(typo)), (word, word), typo)
+        # Two edits, including two swaps
+        for typo, word in [("hndrd", "hundred"), ("tohsuand", "thousand"), ("mltply", "multiply"),
+                           ("sveenyt", "seventy")]:
+            self.assertEqual((one.correct(typo), two.correct(typo)), (None, word), typo)
+        # A correction keeps more than half of the word
+        for typo in ("ad", "fo", "xyz"):
+            self.assertIsNone(two.correct(typo), typo)
+    
+    def test_ties_go_to_the_earlier_word(self):
+        self.assertEqual(SpellCorrector(['cat', 'bat']).correct('xat'), 'cat')
+        self.assertEqual(SpellCorrector(['bat', 'cat']).correct('xat'), 'bat')
+    
+    def test_correct_tokens(self):
+        corrector = SpellCorrector(LanguagePack.get().vocabulary.words[1:], 1)
+        tokens = ['add', 'four', 'and', 'five']
+        self.assertIs(corrector.correct_tokens(tokens)[0], tokens)
+        self.assertEqual(corrector.correct_tokens(['add', 'fvie', 'adn', 'xyzzy']),
+                         (['add', 'five', 'and', 'xyzzy'], (('fvie', 'five'), ('adn', 'and'))))
+    
+    def test_in_word_calc(self):
+        result = WordCalc(correction_distance=2).evaluate_result("ad fvie adn hndrd")
+        self.assertEqual(result.corrections, (('fvie', 'five'), ('adn', 'and'), ('hndrd', 'hundred')))
+        self.assertEqual(result.error_detail, 'ad')
+        result = WordCalc(correction_distance=2).evaluate_result("mltply fvie adn thre")
+        self.assertEqual((result.value, result.words), (15, 'fifteen'))
+    
+    def test_distance_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            SpellCorrector(['five'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+VectorCalc against WordCalc and Interpreter, row by row
+"""
+
+import unittest
+from itertools import islice
+
+from classes.EngineVerifier import EngineVerifier
+from classes.ErrorCode import ErrorCode
+from classes.Interpreter import Interpreter
+from classes.LanguagePack import LanguagePack
+from classes.Lexer import Lexer
+from classes.Parser import Parser
+from classes.WordCalc import WordCalc
+
+try:
+    import numpy as np
+    from classes.VectorCalc import VectorCalc
+except ImportError:  # NumPy is optional
+    np = None
+
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# Operand pairs whose results leave int64, or only just stay inside
+EDGES = [
+    (900000000, 900000000), (3037000500, 3037000500), (3037000499, 3037000499),
+    (INT64_MAX, 1), (INT64_MAX, -1), (INT64_MIN, 1), (INT64_MIN, -1), (INT64_MIN, INT64_MIN),
+    (INT64_MAX, INT64_MAX), (INT64_MIN, 2), (-(1 << 32), 1 << 31), (1 << 32, 1 << 31),
+    (INT64_MIN, 0), (0, INT64_MIN), (12345, -9999), (4, 5),
+]
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestVectorCalc(unittest.TestCase):
+
+    def assertRowsEqual(self, vector, operations, num1, num2, expected):
+        """evaluate() must give the expected (value, error, words) per row"""
+        values, errors, words = vector.evaluate(vector.encode_operations(operations), num1, num2)
+        actual = [(values[row], errors[row], words[row]) for row in range(len(operations))]
+        for row, (got, want) in enumerate(zip(actual, expected)):
+            self.assertEqual(got, want, (operations[row], num1[row], num2[row]))
+        self.assertEqual(len(actual), len(expected))
+    
+    def corpus(self, pack):
+        """Every 40th EngineVerifier expression, then some divisions by zero"""
+        verifier = EngineVerifier('reference', language=pack, workers=1, samples=4000)
+        expressions = list(islice(verifier.expressions(), 0, None, 40))
+        divide = next(word for word, operation in pack.operations.items() if operation == 'divide')
+        zero = pack.number_words.to_words(0)
+        expressions += [f"{divide} {pack.number_words.to_words(number)} {pack.and_word} {zero}"
+                        for number in (0, 7, 9999)]
+        return expressions
+    
+    def test_matches_evaluate_result(self):
+        """Each expression that parses to two operands, in every language"""
+        for code in LanguagePack.available():
+            pack = LanguagePack.get(code)
+            calc = WordCalc(language=code)
+            parser = Parser([], pack)
+            rows = []
+            for expression in self.corpus(pack):
+                tokens = Lexer(expression).try_tokenize()
+                parser.reset(tokens or [])
+                parsed = parser.try_parse() if tokens is not None else None
+                # VectorCalc takes what the parser produced: one step, two operands
+                if parsed is not None and len(parsed) == 3 and not parser.chain:
+                    rows.append((*parsed, calc.evaluate_result(expression)))
+            with self.subTest(language=code):
+                self.assertGreater(len(rows), 1000)
+                operations, num1, num2, results = zip(*rows)
+                self.assertEqual(sum(result.error_code == ErrorCode.DIVISION_BY_ZERO for result in results), 3)
+                expected = [(result.value or 0, result.error_code, result.words or '') for result in results]
+                self.assertRowsEqual(VectorCalc(code), operations, num1, num2, expected)
+    
+    def test_results_outside_int64_match_interpreter(self):
+        vector = VectorCalc()
+        for operation in ('add', 'subtract', 'multiply', 'divide', 'modulo'):
+            pairs = EDGES + [(right, left) for left, right in EDGES]
+            expected = []
+            for left, right in pairs:
+                interpreter = Interpreter(operation, left, right)
+                value = interpreter.try_execute()
+                expected.append((0, interpreter.error[0], '') if value is None else
+                                (value, ErrorCode.OK, interpreter.number_to_words(value)))
+            with self.subTest(operation=operation):
+                self.assertRowsEqual(vector, [operation] * len(pairs), *zip(*pairs), expected)
+    
+    def test_int64_results_stay_int64(self):
+        values, errors = VectorCalc().execute([0, 2, 3], [4, 9999, INT64_MIN], [5, 9999, 1])
+        self.assertEqual(values.dtype, np.int64)
+        self.assertEqual(values.tolist(), [9, 99980001, INT64_MIN])
+    
+    def test_unknown_language(self):
+        with self.assertRaises(ValueError):
+            VectorCalc('xx')
+
+
+if __name__ == '__main__':
+    unittest.main()
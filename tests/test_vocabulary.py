@@ -0,0 +1,69 @@
+"""
+Token IDs: streams read back as the tokens they encode, in every language
+"""
+
+import unittest
+from itertools import islice
+
+from classes.EngineVerifier import EngineVerifier
+from classes.LanguagePack import LanguagePack
+from classes.Lexer import Lexer
+from classes.Vocabulary import Vocabulary
+from classes.WordCalc import WordCalc
+
+
+def expressions(pack):
+    """Every 50th EngineVerifier expression, plus some with unknown words"""
+    verifier = EngineVerifier('reference', language=pack, workers=1, samples=2000)
+    operation = next(iter(pack.operations))
+    return list(islice(verifier.expressions(), 0, None, 50)) + [
+        f"{operation} fvie {pack.and_word} two", "what is this", f"{operation} {operation} {operation}"]
+
+
+class TestVocabulary(unittest.TestCase):
+
+    def test_streams_read_back_as_their_tokens(self):
+        for code in LanguagePack.available():
+            vocabulary = LanguagePack.get(code).vocabulary
+            for expression in expressions(LanguagePack.get(code)):
+                tokens = Lexer(expression).tokenize()
+                stream = vocabulary.encode(tokens)
+                with self.subTest(language=code, expression=expression):
+                    self.assertEqual(list(stream), tokens)
+                    self.assertEqual(stream[1:-1], tokens[1:-1])
+                    self.assertEqual(stream[-1], tokens[-1])
+                    self.assertEqual(stream, vocabulary.encode_bytes([token.encode('ascii') for token in tokens]))
+                    self.assertEqual(hash(stream), hash(vocabulary.encode(list(tokens))))
+    
+    def test_ids_carry_the_word_attributes(self):
+        for code in LanguagePack.available():
+            pack = LanguagePack.get(code)
+            vocabulary = pack.vocabulary
+            with self.subTest(language=code):
+                self.assertEqual(vocabulary.words[vocabulary.and_id], pack.and_word)
+                for word, operation in pack.operations.items():
+                    self.assertEqual(vocabulary.operation[vocabulary.ids[word]], operation)
+                for word, value in pack.word_to_num.items():
+                    token_id = vocabulary.ids[word]
+                    self.assertTrue(vocabulary.is_number[token_id])
+                    self.assertEqual(vocabulary.value[token_id], value)
+                self.assertEqual(vocabulary.ids['fvie'], Vocabulary.UNKNOWN)
+                self.assertLessEqual(len(vocabulary), Vocabulary.MAX_ID + 1)
+    
+    def test_streams_evaluate_like_text(self):
+        for code in LanguagePack.available():
+            calc = WordCalc(language=code)
+            texts = expressions(calc.language)
+            streams = [Lexer(text).try_encode(calc.language.vocabulary) for text in texts]
+            with self.subTest(language=code):
+                self.assertEqual([result.to_dict() for result in calc.evaluate_tokens(streams)],
+                                 [calc.evaluate_result(text).to_dict() for text in texts])
+    
+    def test_too_many_words(self):
+        words = {f"w{number}": number for number in range(Vocabulary.MAX_ID)}
+        with self.assertRaises(ValueError):
+            Vocabulary(words, {}, ['add'])
+
+
+if __name__ == '__main__':
+    unittest.main()
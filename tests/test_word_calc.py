@@ -0,0 +1,99 @@
+"""
+WordCalc's batch API against one evaluate() call per expression, on one thread or many
+"""
+
+import random
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from classes.Instrumentation import Instrumentation
+from classes.WordCalc import WordCalc
+
+
+# Errors between successes, so state left over from a failed parse would show
+EXPRESSIONS = [
+    "add four and five",
+    "add one hundred and",
+    "multiply two thousand five hundred and three",
+    "divide ten and zero",
+    "add one hundred and thirty and twenty",
+    "plus three and five",
+    "subtract fifty and one hundred and five",
+    "",
+    "add twelve hundred and one",
+    "add one and two and three then multiply by four",
+    "add one and two then",
+    "multiply nine thousand nine hundred ninety nine and nine thousand nine hundred ninety nine",
+    "ADD   Four  and\tFIVE",
+    "add four and five six",
+]
+
+
+class TestWordCalc(unittest.TestCase):
+
+    def test_batch_api_matches_evaluate(self):
+        for engine in WordCalc.ENGINES:
+            calc = WordCalc(engine=engine)
+            expected = [WordCalc(engine=engine).evaluate(expression) for expression in EXPRESSIONS]
+            with self.subTest(engine=engine):
+                self.assertEqual(list(calc.evaluate_many(EXPRESSIONS * 3)), expected * 3)
+                self.assertEqual(calc.evaluate_list(iter(EXPRESSIONS)), expected)
+                self.assertEqual([str(result) for result in calc.evaluate_results(EXPRESSIONS)], expected)
+    
+    def test_batch_results_match_evaluate_result(self):
+        calc = WordCalc()
+        expected = [calc.evaluate_result(expression).to_dict() for expression in EXPRESSIONS]
+        for words in (True, False):
+            results = [result.to_dict() for result in calc.evaluate_results(EXPRESSIONS, words=words)]
+            if not words:
+                expected = [dict(result, words=None) for result in expected]
+            self.assertEqual(results, expected)
+    
+    def test_evaluate_many_is_lazy(self):
+        def expressions():
+            yield "add four and five"
+            raise AssertionError("read past the first result")
+        self.assertEqual(next(WordCalc().evaluate_many(expressions())), "nine")
+    
+    
+    def test_parallel_keeps_input_order(self):
+        calc = WordCalc()
+        expressions = [f"add {calc.language.number_words.to_words(number)} and {expression}"
+                       for number in range(300) for expression in ("one", "zero", "fvie")]
+        expressions += EXPRESSIONS * 20
+        expected = calc.evaluate_list(expressions)
+        for threads, chunk_size in ((1, 1000), (4, 1), (4, 7), (8, 250)):
+            with self.subTest(threads=threads, chunk_size=chunk_size):
+                self.assertEqual(list(calc.evaluate_parallel(expressions, threads, chunk_size)), expected)
+    
+    def test_shared_calculator_across_threads(self):
+        """One calculator, its cache, corrector and instrumentation used by many threads at once"""
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+        settings = {'cache_size': 8, 'correction_distance': 1}
+        expressions = EXPRESSIONS + ["add fvie and two", "multiply thre and nien"]
+        expected = {expression: WordCalc(**settings).evaluate_result(expression).to_dict()
+                    for expression in expressions}
+        calc = WordCalc(instrumentation=Instrumentation(), **settings)
+        
+        def evaluate(seed):
+            order = random.Random(seed).choices(expressions, k=500)
+            return [(expression, calc.evaluate_result(expression).to_dict()) for expression in order]
+        
+        with ThreadPoolExecutor(8) as pool:
+            outcomes = [outcome for outcomes in pool.map(evaluate, range(16)) for outcome in outcomes]
+        for expression, result in outcomes:
+            self.assertEqual(result, expected[expression], expression)
+        # No lookup lost (empty input never reaches the cache)
+        sequential = WordCalc(**settings)
+        for expression, _ in outcomes:
+            sequential.evaluate_result(expression)
+        info, expected_info = calc.cache_info(), sequential.cache_info()
+        self.assertEqual(info.hits + info.misses, expected_info.hits + expected_info.misses)
+        self.assertEqual(calc.instrumentation.snapshot()['evaluations'], len(outcomes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+WordCalcServer over real sockets on a free local port
+"""
+
+import asyncio
+import unittest
+
+from classes.WordCalc import WordCalc
+from classes.WordCalcServer import WordCalcServer
+
+
+EXPRESSIONS = [
+    "add four and five",
+    "divide ten and zero",
+    "multiply nine thousand and nine thousand",
+    "",
+    "add one and two then multiply by three",
+    "plus three and five",
+    "subtract ten and ninety",
+]
+
+
+class TestWordCalcServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: self.errors.append(context))
+        self.server = None
+    
+    async def asyncTearDown(self):
+        if self.server is not None:
+            await self.server.close()
+        self.assertEqual(self.errors, [])
+    
+    async def start(self, **options):
+        self.server = await WordCalcServer(port=0, **options).start()
+        return self.server
+    
+    async def connect(self):
+        return await asyncio.open_connection('127.0.0.1', self.server.port)
+    
+    async def test_pipelined_lines_are_answered_in_order(self):
+        await self.start(max_batch=3)
+        expected = WordCalc().evaluate_list(EXPRESSIONS * 50)
+        reader, writer = await self.connect()
+        writer.write(''.join(f"{expression}\r\n" for expression in EXPRESSIONS * 50).encode('utf-8'))
+        writer.write_eof()
+        data = await asyncio.wait_for(reader.read(), 10)
+        self.assertEqual(data.decode('utf-8').split('\n'), expected + [''])
+        writer.close()
+    
+    async def test_line_too_long(self):
+        await self.start(max_line_length=64)
+        reader, writer = await self.connect()
+        writer.write(b"add four and five\n" + b"add " + b"one " * 40 + b"\nadd one and two\n")
+        lines = (await asyncio.wait_for(reader.read(), 10)).decode('utf-8').split('\n')
+        self.assertEqual(lines, ["nine", "Error: Line exceeds 64 bytes", ""])
+        writer.close()
+    
+    async def test_too_many_connections(self):
+        await self.start(max_connections=1)
+        first_reader, first_writer = await self.connect()
+        # Answered, so the first connection is being served
+        first_writer.write(b"add four and five\n")
+        self.assertEqual(await asyncio.wait_for(first_reader.readline(), 10), b"nine\n")
+        
+        reader, writer = await self.connect()
+        self.assertEqual(await asyncio.wait_for(reader.read(), 10), b"Error: Too many connections\n")
+        writer.close()
+        
+        first_writer.write(b"add one and two\n")
+        self.assertEqual(await asyncio.wait_for(first_reader.readline(), 10), b"three\n")
+        first_writer.close()
+    
+    async def test_close_with_clients_connected(self):
+        server = await self.start()
+        clients = [await self.connect() for _ in range(2)]
+        for reader, writer in clients:
+            writer.write(b"add four and five\n")
+            self.assertEqual(await asyncio.wait_for(reader.readline(), 10), b"nine\n")
+        # One more client with an unfinished line
+        reader, writer = await self.connect()
+        writer.write(b"add four")
+        clients.append((reader, writer))
+        await asyncio.sleep(0.05)
+        self.assertEqual(server.connections, 3)
+        
+        await asyncio.wait_for(server.close(), 10)
+        self.assertEqual(server.connections, 0)
+        for reader, writer in clients:
+            self.assertEqual(await asyncio.wait_for(reader.read(), 10), b"")
+            writer.close()
+        with self.assertRaises(ConnectionError):
+            await self.connect()
+
+
+if __name__ == '__main__':
+    unittest.main()